@@ -0,0 +1,101 @@
+"""Cold-start cost of lazy route loading, per route.
+
+Each sample runs `handler()` for one route in a fresh interpreter. It is run
+twice: once as deployed, with resources imported on first dispatch, and once
+with every route module imported up front, the way index.py star-imported
+the controllers before. It reports import and first-request time, and which
+heavy dependencies were loaded by the end of the request.
+
+    pip install mongomock moto
+    python bench/cold_start.py                 # every route
+    python bench/cold_start.py posts login --samples 10
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY = ['pymongo', 'boto3', 'openai', 'passlib', 'PIL', 'pymysql']
+
+
+def child(route: str, eager: bool) -> None:
+    import routes
+    start = time.perf_counter()
+    import index
+    if eager:
+        from helpers.lazyResource import load_resource
+        for resource, _, _ in index.api.resources:
+            load_resource(resource.target)
+    imported = time.perf_counter()
+
+    # Stand-ins are installed after the import is timed; they pull in
+    # pymongo and mongomock, which the lazy path must not be charged for
+    routes.install_standins()
+    with routes.aws_mock():
+        tokens = routes.seed()
+        if route == 'nlogin':
+            routes.invoke(index.handler, routes.build_event('nuser', 0, tokens))
+        event = routes.build_event(route, 1, tokens)
+        first = time.perf_counter()
+        routes.invoke(index.handler, event)
+        done = time.perf_counter()
+    print(json.dumps({'import_ms': (imported - start) * 1000,
+                      'first_request_ms': (done - first) * 1000}))
+
+
+def sample(route: str, eager: bool, samples: int) -> dict:
+    imports, firsts = [], []
+    for _ in range(samples):
+        args = [sys.executable, __file__, '--child', route] + (['--eager'] if eager else [])
+        output = subprocess.run(args, capture_output=True, text=True, check=True)
+        timing = json.loads(output.stdout.strip().splitlines()[-1])
+        imports.append(timing['import_ms'])
+        firsts.append(timing['first_request_ms'])
+    return {'import_ms': statistics.median(imports),
+            'first_request_ms': statistics.median(firsts)}
+
+
+def import_only(eager: bool) -> list[str]:
+    """Heavy dependencies loaded by importing index alone."""
+    code = ('import sys, index\n'
+            + ('from helpers.lazyResource import load_resource\n'
+               '[load_resource(r.target) for r, _, _ in index.api.resources]\n' if eager else '')
+            + f'print(",".join(m for m in {HEAVY!r} if m in sys.modules))')
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(
+        [os.path.join(os.path.dirname(HERE), 'src'), os.environ.get('PYTHONPATH', '')])}
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True, env=env)
+    return [m for m in output.stdout.strip().splitlines()[-1].split(',') if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('routes', nargs='*', help='subset of routes (default: all)')
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.eager)
+        return 0
+
+    from routes import ROUTES
+    names = args.routes or list(ROUTES)
+    print(f"import index loads: lazy {import_only(False) or 'none'}, eager {import_only(True)}")
+    print(f"{'route':<17} {'lazy import':>12} {'first req':>10} {'total':>8} | "
+          f"{'eager import':>12} {'first req':>10} {'total':>8}")
+    for route in names:
+        lazy, eager = sample(route, False, args.samples), sample(route, True, args.samples)
+        print(f"{route:<17} " + ' | '.join(
+            f"{r['import_ms']:>10.1f}ms {r['first_request_ms']:>8.1f}ms "
+            f"{r['import_ms'] + r['first_request_ms']:>6.1f}ms" for r in (lazy, eager)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
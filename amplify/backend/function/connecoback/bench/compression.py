@@ -0,0 +1,59 @@
+"""Bytes saved and CPU cost per response size, to tune COMPRESS_MIN_BYTES.
+
+    pip install brotli          # optional; only gzip is measured without it
+    python bench/compression.py
+"""
+import os
+import sys
+import time
+import random
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+WORDS = ['walk', 'river', 'coffee', 'dinner', 'movie', 'rain', 'park', 'sunset', 'beach', 'book']
+
+
+def post(rng: random.Random, i: int) -> dict:
+    return {'_id': f'65f0c0ffee{i:014x}', 'type': rng.choice(['note', 'photo']),
+            'date': f'2025-01-{i % 28 + 1:02d}T00:00:00',
+            'content': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))),
+            'caption': rng.choice(WORDS), 'image_url': f'https://conneco.s3.amazonaws.com/{i}.jpg',
+            'user_name': rng.choice(['alex', 'sam']), 'user_id': f'65f0c0ffee{i % 2:014x}',
+            'created_at': f'2025-01-{i % 28 + 1:02d}T{i % 24:02d}:00:00',
+            'updated_at': f'2025-01-{i % 28 + 1:02d}T{i % 24:02d}:00:00'}
+
+
+def main() -> int:
+    from helpers.encoder import dumps
+    from helpers.stubClient import SAMPLE_RECIPE
+    from helpers.compression import compress, brotli, GZIP_LEVEL, BROTLI_QUALITY
+
+    rng = random.Random(7)
+    bodies = {
+        f'feed {n} posts': dumps({'success': True,
+                                  'data': {'posts': [post(rng, i) for i in range(n)]}})
+        for n in (1, 3, 20, 100)
+    }
+    bodies.update({f'recipes x{n}': dumps({'success': True, 'data': [SAMPLE_RECIPE] * n})
+                   for n in (1, 5)})
+    codecs = [('gzip', GZIP_LEVEL)] + ([('br', BROTLI_QUALITY)] if brotli else [])
+
+    for label, body in sorted(bodies.items(), key=lambda item: len(item[1])):
+        line = f'{label:<16} {len(body):>8} B'
+        for encoding, level in codecs:
+            runs = max(20, 200_000 // len(body))
+            start = time.perf_counter()
+            for _ in range(runs):
+                compressed = compress(body, encoding)
+            cost = (time.perf_counter() - start) / runs * 1e6
+            saved = 1 - len(compressed) / len(body)
+            line += f' | {encoding}-{level}: {len(compressed):>7} B ({saved:>4.0%} saved) {cost:>7.1f} us'
+        print(line)
+    if not brotli:
+        print('brotli not installed; only gzip is offered')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Login lookup latency as the user count grows.
+
+Fills a users collection and the credential digest collection to each size,
+then times the digest lookup login uses against the legacy password query
+it replaced. Needs a local mongod for meaningful numbers; without
+MONGODB_URI it falls back to mongomock, which has no indexes and so only
+checks that the benchmark runs.
+
+    MONGODB_URI=mongodb://localhost:27017 python bench/credential_lookup.py
+    python bench/credential_lookup.py --sizes 1000,10000
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+os.environ.setdefault('CREDENTIAL_LOOKUP_SECRET', 'bench-lookup-secret')
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LOOKUPS = 200
+BATCH = 10_000
+
+
+def fill(users, credentials, start: int, stop: int) -> None:
+    from bson import ObjectId
+    from db.users import password_lookup_key
+    for offset in range(start, stop, BATCH):
+        batch_users, batch_keys = [], []
+        for i in range(offset, min(offset + BATCH, stop)):
+            user_id = ObjectId()
+            batch_users.append({'_id': user_id, 'name': f'user {i}', 'password': f'password-{i}'})
+            batch_keys.append({'_id': password_lookup_key(f'password-{i}'), 'user_id': user_id})
+        users.insert_many(batch_users, ordered=False)
+        credentials.insert_many(batch_keys, ordered=False)
+
+
+def time_lookups(lookup, size: int) -> dict:
+    samples = []
+    for n in range(LOOKUPS):
+        password = f'password-{(n * 7919) % size}'
+        start = time.perf_counter()
+        assert lookup(password) is not None
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {'p50': statistics.median(samples), 'p95': samples[int(len(samples) * 0.95)]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)))
+    parser.add_argument('--no-legacy', action='store_true',
+                        help='skip the password-query baseline (slow on big sizes)')
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    import db.client as client
+    if not os.getenv('MONGODB_URI'):
+        import mongomock
+        print('MONGODB_URI not set: using mongomock, which has no indexes')
+        client._client = mongomock.MongoClient()
+    db = client.get_client()['credential_bench']
+    db.drop_collection('users')
+    db.drop_collection('credential_lookup')
+    users, credentials = db['users'], db['credential_lookup']
+
+    from db.users import password_lookup_key
+
+    def by_digest(password):
+        entry = credentials.find_one({'_id': password_lookup_key(password)})
+        return users.find_one({'_id': entry['user_id']})
+
+    def by_password(password):
+        return users.find_one({'password': password})
+
+    filled = 0
+    try:
+        for size in sizes:
+            fill(users, credentials, filled, size)
+            filled = size
+            line = f'{size:>9} users  digest ' + '  '.join(
+                f'{k} {v:7.3f} ms' for k, v in time_lookups(by_digest, size).items())
+            if not args.no_legacy:
+                line += '  |  legacy ' + '  '.join(
+                    f'{k} {v:8.3f} ms' for k, v in time_lookups(by_password, size).items())
+            print(line, flush=True)
+    finally:
+        client.get_client().drop_database('credential_bench')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
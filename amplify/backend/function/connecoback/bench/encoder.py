@@ -0,0 +1,60 @@
+"""CPU and peak memory of encoding a 500-post feed page.
+
+Compares the single-pass helpers.encoder.dumps with the old approach of
+converting the whole document tree first and then encoding the copy.
+
+    python bench/encoder.py
+"""
+import os
+import sys
+import json
+import time
+import tracemalloc
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+
+def copy_then_encode(data) -> bytes:
+    from bson import ObjectId
+
+    # The previous path: convert the whole tree, then encode the copy
+    def convert(value):
+        if isinstance(value, dict):
+            return {key: convert(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        if isinstance(value, (ObjectId, datetime)):
+            return str(value)
+        return value
+    return json.dumps(convert(data)).encode()
+
+
+def main() -> int:
+    from bson import ObjectId
+    from helpers.encoder import dumps
+
+    now = datetime.now()
+    page = {'success': True, 'error': '', 'data': {'posts': [{
+        '_id': ObjectId(), 'user_id': ObjectId(), 'type': 'mixed', 'user_name': 'Sam',
+        'content': 'x' * 200, 'caption': 'A caption', 'image_url': 'https://example.com/i.jpg',
+        'date': now, 'created_at': now, 'updated_at': now
+    } for _ in range(500)], 'limit': 500}}
+
+    for name, encode in (('copy+encode', copy_then_encode), ('single pass', dumps)):
+        runs = 50
+        start = time.process_time()
+        for _ in range(runs):
+            encode(page)
+        cpu_ms = (time.process_time() - start) / runs * 1000
+        tracemalloc.start()
+        encode(page)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        print(f"{name}: {cpu_ms:.2f} ms CPU, {peak_kb:.0f} KiB peak per 500-post page")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
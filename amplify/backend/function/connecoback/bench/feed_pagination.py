@@ -0,0 +1,94 @@
+"""Feed page latency, offset (skip/limit) against keyset cursors.
+
+Fills one couple's feed with --posts posts, ensures the feed index and times
+page 1 and page --deep-page both ways, plus the count offset pages used to
+run on every request. Needs a local mongod for meaningful numbers; without
+MONGODB_URI it falls back to mongomock, which has no indexes and is too slow
+for 1M posts, so pass a smaller --posts there.
+
+    MONGODB_URI=mongodb://localhost:27017 python bench/feed_pagination.py
+    python bench/feed_pagination.py --posts 20000 --deep-page 500
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+PAGE_SIZE = 20
+BATCH = 10_000
+
+
+def timed(run, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--deep-page', type=int, default=5_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from bson import ObjectId
+    from pymongo import ASCENDING, DESCENDING
+    import db.client as client
+    from helpers.pagination import encode_cursor, decode_cursor, seek_query, seek_sort
+
+    if not os.getenv('MONGODB_URI'):
+        import mongomock
+        print('MONGODB_URI not set: using mongomock, which has no indexes')
+        client._client = mongomock.MongoClient()
+    db = client.get_client()['feed_bench']
+    db.drop_collection('posts')
+    posts = db['posts']
+    # Same key as the registry's user_date_id index
+    posts.create_index([('user_id', ASCENDING), ('date', DESCENDING), ('_id', DESCENDING)])
+
+    user, partner = ObjectId(), ObjectId()
+    start = datetime(2020, 1, 1)
+    for offset in range(0, args.posts, BATCH):
+        posts.insert_many([{
+            'user_id': user if i % 2 else partner, 'type': 'note',
+            'date': start + timedelta(minutes=i), 'content': f'post {i}'
+        } for i in range(offset, min(offset + BATCH, args.posts))], ordered=False)
+
+    query = {'$or': [{'user_id': user}, {'user_id': partner}]}
+    sort = seek_sort('date', -1)
+
+    def offset_page(page: int) -> list:
+        return list(posts.find(query).sort(sort).skip((page - 1) * PAGE_SIZE).limit(PAGE_SIZE))
+
+    def seek_page(cursor: dict) -> list:
+        page_query = seek_query(query, cursor) if cursor else query
+        return list(posts.find(page_query).sort(sort).limit(PAGE_SIZE + 1))
+
+    # The cursor a client would hold after paging down to deep_page - 1
+    deep = args.deep_page
+    previous = offset_page(deep - 1)[-1]
+    cursor = decode_cursor(encode_cursor(previous, 'date', -1), {'date'})
+    assert seek_page(cursor)[:PAGE_SIZE] == offset_page(deep)
+
+    try:
+        print(f'{args.posts} posts, {PAGE_SIZE} per page (median of {args.repeat})')
+        print(f'  offset page 1      {timed(lambda: offset_page(1), args.repeat):9.2f} ms')
+        print(f'  offset page {deep:<6} {timed(lambda: offset_page(deep), args.repeat):9.2f} ms')
+        print(f'  count_documents    {timed(lambda: posts.count_documents(query), args.repeat):9.2f} ms')
+        print(f'  cursor page 1      {timed(lambda: seek_page(None), args.repeat):9.2f} ms')
+        print(f'  cursor page {deep:<6} {timed(lambda: seek_page(cursor), args.repeat):9.2f} ms')
+    finally:
+        client.get_client().drop_database('feed_bench')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
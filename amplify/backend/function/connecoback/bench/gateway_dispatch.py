@@ -0,0 +1,76 @@
+"""Per-event overhead of the native API Gateway dispatch against awsgi.
+
+A public route isolates the plumbing; a JWT route shows it in context.
+
+    python bench/gateway_dispatch.py
+"""
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+
+def build_app():
+    """A resource that touches no DB, behind the same JWT and CORS setup."""
+    from flask import Flask
+    from flask_cors import CORS
+    from flask_restful import Api, Resource
+    from flask_jwt_extended import JWTManager, jwt_required
+
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'x' * 32
+    api = Api(app)
+    JWTManager(app)
+    CORS(app, supports_credentials=True)
+
+    class Echo(Resource):
+        @jwt_required()
+        def post(self):
+            return {'success': True, 'data': {'items': list(range(50))}}, 200
+
+    class Ping(Resource):
+        def get(self):
+            return {'success': True}, 200
+
+    api.add_resource(Echo, '/con/echo')
+    api.add_resource(Ping, '/con/ping')
+    return app
+
+
+def main() -> int:
+    import awsgi
+    from flask_jwt_extended import create_access_token
+    from helpers.gatewayDispatch import dispatch
+
+    app = build_app()
+    with app.app_context():
+        token = create_access_token(identity='bench')
+    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json',
+               'Origin': 'https://example.com', 'Host': 'localhost'}
+    v1 = {'httpMethod': 'POST', 'path': '/con/echo', 'headers': headers,
+          'queryStringParameters': None, 'body': '{"a": 1}', 'isBase64Encoded': False}
+    v2 = {'version': '2.0', 'rawPath': '/con/echo', 'rawQueryString': '', 'headers': headers,
+          'requestContext': {'http': {'method': 'POST'}}, 'body': '{"a": 1}',
+          'isBase64Encoded': False}
+    ping = {'httpMethod': 'GET', 'path': '/con/ping', 'headers': {'Host': 'localhost'},
+            'queryStringParameters': {'a': '1'}, 'body': None, 'isBase64Encoded': False}
+
+    iterations = 5000
+    for label, run in [('awsgi v1 public', lambda: awsgi.response(app, ping, None)),
+                       ('native v1 public', lambda: dispatch(app, ping, None)),
+                       ('awsgi v1 jwt', lambda: awsgi.response(app, v1, None)),
+                       ('native v1 jwt', lambda: dispatch(app, v1, None)),
+                       ('native v2 jwt', lambda: dispatch(app, v2, None))]:
+        run()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed / iterations * 1e6:.0f} us/event")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Variant generation time and decoded size per image, under moto.
+
+    pip install moto
+    python bench/image_variants.py [images...]   # default: generated fixtures
+"""
+import io
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+for key, value in {
+    'AWS_ACCESS_KEY_ID': 'bench',
+    'AWS_SECRET_ACCESS_KEY': 'bench',
+    'AWS_DEFAULT_REGION': 'us-east-1'
+}.items():
+    os.environ.setdefault(key, value)
+
+
+def main() -> int:
+    from moto import mock_aws
+    from PIL import Image
+    from helpers.imageVariants import get_s3, handle_s3_event, s3_event, open_image
+
+    fixtures = {}
+    for path in sys.argv[1:]:
+        with open(path, 'rb') as f:
+            fixtures[os.path.basename(path)] = f.read()
+    if not fixtures:
+        for name, size, mode, fmt in [('photo.jpg', (6000, 4000), 'RGB', 'JPEG'),
+                                      ('logo.png', (1200, 800), 'RGBA', 'PNG'),
+                                      ('small.jpg', (200, 150), 'RGB', 'JPEG')]:
+            out = io.BytesIO()
+            Image.linear_gradient('L').resize(size).convert(mode).save(out, fmt)
+            fixtures[name] = out.getvalue()
+
+    with mock_aws():
+        s3 = get_s3()
+        s3.create_bucket(Bucket='conneco')
+        for name, data in fixtures.items():
+            s3.put_object(Bucket='conneco', Key=name, Body=data)
+            start = time.perf_counter()
+            counts = handle_s3_event(s3_event('conneco', name), record=lambda *args: 0)
+            elapsed = (time.perf_counter() - start) * 1000
+            if not counts['processed']:
+                print(f'{name}: skipped')
+                continue
+            # What draft() decodes bounds the pixel memory for this image
+            with Image.open(io.BytesIO(data)) as original:
+                size = original.size
+            decoded = open_image(io.BytesIO(data)).size
+            print(f'{name}: {len(data) / 1024:.0f} KiB, {size[0]}x{size[1]} decoded at '
+                  f'{decoded[0]}x{decoded[1]}, {elapsed:.0f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Meal plan latency, sequential against PLAN_CONCURRENCY parallel slices.
+
+Runs offline against the stub client with a fixed per-call latency.
+
+    python bench/meal_planner.py
+"""
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+for key, value in {
+    'OSS_CLIENT': 'stub',
+    'STUB_LLM_LATENCY_MS': '500',
+    'RECIPE_CACHE_STORE': 'memory'
+}.items():
+    os.environ.setdefault(key, value)
+
+
+def main() -> int:
+    from models.meal import Preferences
+    from helpers.mealPlanner import MealPlanner, PLAN_CONCURRENCY
+
+    prefs = Preferences(
+        cookingTime="30 minutes",
+        dietaryRestrictions=["vegetarian"],
+        duration=3,
+        goal="weight loss",
+        groceries=[],
+        mealTypes=["breakfast", "lunch", "dinner"],
+        servings=2,
+        skillLevel="beginner"
+    )
+    for concurrency in [1, PLAN_CONCURRENCY]:
+        prefs.goal = f"weight loss {concurrency}"
+        start = time.perf_counter()
+        result = MealPlanner(prefs, concurrency=concurrency).plan()
+        elapsed = time.perf_counter() - start
+        print(f"concurrency={concurrency}: {elapsed:.2f}s, "
+              f"{len(result['failed'])} failed, {result['duplicates_removed']} duplicates removed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Calibrates PASSWORD_ROUNDS for a target verify time.
+
+Run it on the Lambda's memory size, not a laptop: the result is the largest
+rounds per scheme whose median verify fits the target.
+
+    python bench/passwords.py [target_ms]      # default 50
+"""
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+
+def main() -> int:
+    from helpers.passwords import build_context, calibrate, verify_time_ms
+
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    for scheme in ('pbkdf2_sha256', 'pbkdf2_sha512', 'bcrypt'):
+        try:
+            default_ms = verify_time_ms(build_context(scheme, 0))
+            rounds = calibrate(scheme, target_ms)
+            tuned_ms = verify_time_ms(build_context(scheme, rounds))
+        except Exception as e:
+            print(f"{scheme}: unavailable ({e})")
+            continue
+        print(f"{scheme}: default verify {default_ms:.1f} ms; "
+              f"PASSWORD_ROUNDS={rounds} verifies in {tuned_ms:.1f} ms (target {target_ms} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
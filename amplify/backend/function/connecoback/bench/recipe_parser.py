@@ -0,0 +1,30 @@
+"""Parse and re-serialize time for a five-recipe model response.
+
+    python bench/recipe_parser.py
+"""
+import os
+import sys
+import json
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+
+def main() -> int:
+    from helpers.recipeParser import parse_recipes
+    from helpers.stubClient import SAMPLE_RECIPE
+
+    payload = json.dumps([SAMPLE_RECIPE] * 5, indent=4)
+    runs = 2000
+    start = time.perf_counter()
+    for _ in range(runs):
+        recipes, _ = parse_recipes(payload)
+        json.dumps([recipe.to_dict() for recipe in recipes])
+    elapsed = (time.perf_counter() - start) / runs * 1e6
+    print(f"parse+serialize, 5 recipes ({len(payload)} bytes): {elapsed:.1f} us")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
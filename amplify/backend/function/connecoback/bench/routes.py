@@ -0,0 +1,413 @@
+"""Offline latency/allocation benchmark for every /con route.
+
+Drives ``index.handler`` with synthetic API Gateway events. mongomock (or a
+local mongod when MONGODB_URI is set), moto and the stub LLM client stand in
+for the real services. It reports p50/p95/p99, throughput and allocations per
+route for warm runs, and timings for cold starts in fresh interpreters. It
+then compares the results with a stored baseline.
+
+    pip install mongomock moto
+    python bench/routes.py --update-baseline     # record a baseline
+    python bench/routes.py                       # compare, exit 1 on regression
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import subprocess
+import statistics
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), 'src')
+BASELINE = os.path.join(HERE, 'baseline.json')
+sys.path.insert(0, SRC)
+
+# Offline stand-ins; set before any app module reads its config
+for key, value in {
+    'OSS_CLIENT': 'stub',
+    'STUB_LLM_LATENCY_MS': '0',
+    'RECIPE_CACHE_STORE': 'memory',
+    'FEED_CACHE_BACKEND': 'memory',
+    'METRICS_ENABLED': '0',
+    'EVENT_LOG_SAMPLE_RATE': '0',
+    'AWS_ACCESS_KEY_ID': 'bench',
+    'AWS_SECRET_ACCESS_KEY': 'bench',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'CREDENTIAL_LOOKUP_SECRET': 'bench-lookup-secret'
+}.items():
+    os.environ.setdefault(key, value)
+
+PASSWORD = 'bench-password'
+WARM_ITERATIONS = int(os.getenv('BENCH_ITERATIONS', '200'))
+COLD_SAMPLES = int(os.getenv('BENCH_COLD_SAMPLES', '5'))
+# A route regresses when p95 grows by more than this share of the baseline...
+THRESHOLD = float(os.getenv('BENCH_THRESHOLD', '0.25'))
+# ...and by more than this many ms, so sub-millisecond noise never fails
+MIN_DELTA_MS = float(os.getenv('BENCH_MIN_DELTA_MS', '0.5'))
+
+
+class FakeSchoolDatabase:
+    """In-memory stand-in for the MySQL-backed SchoolDatabase."""
+    rows: dict[int, dict] = {}
+
+    def get_schools(self, filters=None, limit=None, offset=None, search_name=None):
+        schools = list(self.rows.values())
+        if search_name:
+            schools = [s for s in schools if search_name.lower() in s['name'].lower()]
+        for key, value in (filters or {}).items():
+            if key not in ('limit', 'offset', 'search_name'):
+                schools = [s for s in schools if str(s.get(key)) == value]
+        start = offset or 0
+        return schools[start:start + limit] if limit else schools[start:]
+
+    def create_school(self, **data):
+        school_id = len(self.rows) + 1
+        self.rows[school_id] = {**data, 'id': school_id}
+
+    def update_school(self, school_id, **data):
+        self.rows.setdefault(int(school_id), {}).update(data)
+
+    def close(self):
+        pass
+
+
+def get_user_collection():
+    """Where the stand-in shared.db.users keeps its users."""
+    import db.client as client
+    return client.get_collection('conneco', 'users')
+
+
+def install_standins() -> None:
+    """Point the shared data layer at the offline stand-ins before any route
+    module binds those names."""
+    import mongomock
+    import shared.db.users as shared_users
+    import shared.db.schools as shared_schools
+    import db.client as client
+
+    if not os.getenv('MONGODB_URI'):
+        client._client = mongomock.MongoClient()
+
+    def get_posts_collection():
+        return client.get_collection('conneco', 'posts')
+
+    def get_user_by_id(user_id):
+        from bson import ObjectId
+        return get_user_collection().find_one({'_id': ObjectId(user_id)})
+
+    def get_user_by_password(password):
+        return None
+
+    def create_user(name, password):
+        user = {'name': name, 'created_at': time.time()}
+        get_user_collection().insert_one(user)
+        return user
+
+    shared_users.get_posts_collection = get_posts_collection
+    shared_users.get_user_by_id = get_user_by_id
+    shared_users.get_user_by_password = get_user_by_password
+    shared_users.create_user = create_user
+    shared_schools.SchoolDatabase = FakeSchoolDatabase
+
+    FakeSchoolDatabase.rows = {
+        i: {'id': i, 'name': f'{word} High School {i}', 'city': 'Pune'}
+        for i, word in enumerate(itertools.islice(
+            itertools.cycle(['Oak', 'River', 'Hill', 'Lake', 'Mount']), 2000), start=1)
+    }
+
+
+def aws_mock():
+    try:
+        from moto import mock_aws
+    except ImportError:
+        from moto import mock_s3 as mock_aws
+    return mock_aws()
+
+
+def seed() -> dict:
+    """Creates the bench user and posts; returns their auth headers."""
+    from index import app
+    from db.indexes import ensure_indexes
+    from db.users import set_credential_key
+    from shared.db.users import get_posts_collection
+    from helpers.identity import user_claims
+    from flask_jwt_extended import create_access_token, create_refresh_token
+    from datetime import datetime, timedelta
+
+    # mongomock ignores partial filters, so its unique indexes would reject
+    # every user without a credential digest; they only matter on a real mongod
+    if os.getenv('MONGODB_URI'):
+        ensure_indexes()
+    users = get_user_collection()
+    user = users.find_one({'name': 'bench'})
+    if user is None:
+        user = {'name': 'bench', 'partner': None}
+        users.insert_one(user)
+        partner = {'name': 'bench-partner', 'partner': user['_id']}
+        users.insert_one(partner)
+        users.update_one({'_id': user['_id']}, {'$set': {'partner': partner['_id']}})
+        user['partner'] = partner['_id']
+        set_credential_key(user['_id'], PASSWORD)
+        now = datetime(2025, 1, 1)
+        get_posts_collection().insert_many([{
+            'date': now - timedelta(days=i), 'type': 'note',
+            'content': f'post {i} ' + 'went for a walk by the river and had coffee after. ' * 4,
+            'caption': f'caption {i}', 'image_url': f'https://conneco.s3.amazonaws.com/{i}.jpg',
+            'user_id': user['_id'] if i % 2 else partner['_id'],
+            'user_name': 'bench', 'created_at': now, 'updated_at': now
+        } for i in range(500)])
+
+    with app.app_context():
+        identity, claims = str(user['_id']), user_claims(user)
+        access = create_access_token(identity=identity, additional_claims=claims)
+        refresh = create_refresh_token(identity=identity, additional_claims=claims)
+    return {'access': {'Authorization': f'Bearer {access}'},
+            'refresh': {'Authorization': f'Bearer {refresh}'}}
+
+
+PREFERENCES = {
+    'cookingTime': '30 minutes', 'dietaryRestrictions': ['vegetarian'], 'duration': 1,
+    'goal': 'weight loss', 'groceries': [], 'mealTypes': ['dinner'], 'servings': 2,
+    'skillLevel': 'beginner'
+}
+SCHOOLS_CSV = 'name,city\n' + ''.join(f'Imported School {i},Pune\n' for i in range(200))
+
+# name -> (method, path, query, body, auth); bodies may use {n} for a per-call counter
+ROUTES = {
+    'login': ('POST', '/con/login', None, {'password': PASSWORD}, None),
+    'signup': ('POST', '/con/signup', None, {'name': 'bench-{n}', 'password': 'signup-{n}'}, None),
+    'refresh': ('POST', '/con/refresh', None, {}, 'refresh'),
+    'create': ('POST', '/con/create', None,
+               {'type': 'note', 'date': '2025-01-01', 'content': 'hello'}, 'access'),
+    'posts_bulk': ('POST', '/con/bulkposts', None,
+                   {'posts': [{'type': 'note', 'date': '2025-01-01', 'content': f'bulk {i}'}
+                              for i in range(20)]}, 'access'),
+    'posts': ('GET', '/con/posts', {'page': '5', 'size': '20'}, None, 'access'),
+    # Past the cached pages, so both read and serialize a full 100-post page
+    'posts_100': ('GET', '/con/posts', {'page': '4', 'size': '100'}, None, 'access'),
+    'posts_100_fields': ('GET', '/con/posts', {'page': '4', 'size': '100',
+                                               'fields': 'date,type,image_url'}, None, 'access'),
+    'upload': ('POST', '/con/upload', None, {'filename': 'a.jpg', 'filetype': 'image/jpeg'}, None),
+    'schools': ('GET', '/con/schools', {'search_name': 'river', 'limit': '10'}, None, None),
+    'schools_import': ('POST', '/con/schoolimport', {'format': 'csv'}, SCHOOLS_CSV, None),
+    'nmeals': ('POST', '/con/nmeals', None, {'preferences': PREFERENCES}, None),
+    'nuser': ('POST', '/con/nuser', None,
+              {'name': 'bench', 'email': 'bench-{n}@example.com', 'password': PASSWORD}, None),
+    'nlogin': ('POST', '/con/nlogin', None, {'email': 'bench-0@example.com', 'password': PASSWORD}, None)
+}
+
+
+def fill(value, n: int):
+    if isinstance(value, str):
+        return value.replace('{n}', str(n))
+    if isinstance(value, dict):
+        return {key: fill(item, n) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill(item, n) for item in value]
+    return value
+
+
+def build_event(route: str, n: int, tokens: dict) -> dict:
+    method, path, query, body, auth = ROUTES[route]
+    headers = {'Host': 'localhost', 'Content-Type': 'application/json'}
+    if isinstance(body, str):
+        headers['Content-Type'] = 'text/csv'
+    if auth:
+        headers.update(tokens[auth])
+    if body is not None and not isinstance(body, str):
+        body = json.dumps(fill(body, n))
+    return {
+        'httpMethod': method,
+        'path': path,
+        'headers': headers,
+        'queryStringParameters': query,
+        'body': body,
+        'isBase64Encoded': False,
+        'requestContext': {'requestId': f'bench-{n}'}
+    }
+
+
+def invoke(handler, event: dict) -> dict:
+    response = handler(event, None)
+    if int(response['statusCode']) >= 500:
+        raise RuntimeError(f"{event['path']} returned {response['statusCode']}: {response['body'][:200]}")
+    return response
+
+
+def percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 3)
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99),
+            'mean': round(statistics.fmean(ordered), 3)}
+
+
+def run_warm(routes: list[str], iterations: int) -> dict:
+    from index import handler
+    tokens = seed()
+    # nlogin needs its user to exist before it is timed
+    invoke(handler, build_event('nuser', 0, tokens))
+
+    results = {}
+    counter = itertools.count(1)
+    for route in routes:
+        invoke(handler, build_event(route, next(counter), tokens))
+        samples = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            event = build_event(route, next(counter), tokens)
+            start = time.perf_counter()
+            response = invoke(handler, event)
+            samples.append((time.perf_counter() - start) * 1000)
+        elapsed = time.perf_counter() - started
+
+        # Separate pass: tracing allocations distorts the timings above
+        tracemalloc.start()
+        peaks, blocks = [], []
+        for _ in range(min(iterations, 20)):
+            event = build_event(route, next(counter), tokens)
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            invoke(handler, event)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            after = tracemalloc.take_snapshot()
+            blocks.append(sum(max(stat.count_diff, 0)
+                              for stat in after.compare_to(before, 'filename')))
+        tracemalloc.stop()
+
+        results[route] = {
+            **percentiles(samples),
+            'rps': round(iterations / elapsed, 1),
+            'response_bytes': len(response['body']),
+            'alloc_peak_kb': round(statistics.median(peaks) / 1024, 1),
+            'alloc_retained_blocks': int(statistics.median(blocks))
+        }
+    return results
+
+
+def run_cold_child(route: str) -> None:
+    """One fresh-interpreter request: import time plus the first dispatch."""
+    start = time.perf_counter()
+    from index import handler
+    imported = time.perf_counter()
+    # After the timer: the stand-ins load mongomock and pymongo, which the
+    # deployed import doesn't pay for. index binds none of the names they
+    # replace; route modules are only imported on first dispatch.
+    install_standins()
+    with aws_mock():
+        tokens = seed()
+        if route == 'nlogin':
+            invoke(handler, build_event('nuser', 0, tokens))
+        event = build_event(route, 1, tokens)
+        first = time.perf_counter()
+        invoke(handler, event)
+        done = time.perf_counter()
+    print(json.dumps({'import_ms': (imported - start) * 1000,
+                      'first_request_ms': (done - first) * 1000}))
+
+
+def run_cold(routes: list[str], samples: int) -> dict:
+    results = {}
+    for route in routes:
+        imports, firsts = [], []
+        for _ in range(samples):
+            output = subprocess.run(
+                [sys.executable, __file__, '--cold-child', route],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            timing = json.loads(output)
+            imports.append(timing['import_ms'])
+            firsts.append(timing['first_request_ms'])
+        totals = [i + f for i, f in zip(imports, firsts)]
+        results[route] = {
+            **percentiles(totals),
+            'import_ms': round(statistics.median(imports), 3),
+            'first_request_ms': round(statistics.median(firsts), 3)
+        }
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for mode in ('warm', 'cold'):
+        for route, stats in current.get(mode, {}).items():
+            before = baseline.get(mode, {}).get(route)
+            if not before:
+                continue
+            delta = stats['p95'] - before['p95']
+            if delta > MIN_DELTA_MS and stats['p95'] > before['p95'] * (1 + threshold):
+                regressions.append(
+                    f"{mode} {route}: p95 {before['p95']:.2f} -> {stats['p95']:.2f} ms")
+    return regressions
+
+
+def report(results: dict, baseline: dict) -> None:
+    for mode in ('warm', 'cold'):
+        if mode not in results:
+            continue
+        print(f'\n{mode}')
+        for route, stats in results[mode].items():
+            before = baseline.get(mode, {}).get(route, {}).get('p95')
+            change = f" ({(stats['p95'] / before - 1) * 100:+.0f}% p95)" if before else ''
+            extra = (f"{stats['rps']:>8} rps  {stats['response_bytes']:>7} B  "
+                     f"{stats['alloc_peak_kb']:>8} KiB peak"
+                     if mode == 'warm' else f"import {stats['import_ms']:.1f} ms")
+            print(f"  {route:<17} p50 {stats['p50']:>8.2f}  p95 {stats['p95']:>8.2f}  "
+                  f"p99 {stats['p99']:>8.2f} ms  {extra}{change}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('routes', nargs='*', help='subset of routes (default: all)')
+    parser.add_argument('--iterations', type=int, default=WARM_ITERATIONS)
+    parser.add_argument('--cold-samples', type=int, default=COLD_SAMPLES)
+    parser.add_argument('--no-cold', action='store_true')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--cold-child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_child:
+        run_cold_child(args.cold_child)
+        return 0
+
+    routes = args.routes or list(ROUTES)
+    unknown = set(routes) - set(ROUTES)
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+
+    install_standins()
+    with aws_mock():
+        results = {'warm': run_warm(routes, args.iterations)}
+    if not args.no_cold:
+        results['cold'] = run_cold(routes, args.cold_samples)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    if args.update_baseline:
+        # Merge so a subset run only replaces the routes it measured
+        for mode, stats in results.items():
+            baseline.setdefault(mode, {}).update(stats)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f'\nbaseline written to {args.baseline}')
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f'REGRESSION {line}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Build time and top-10 prefix search latency of the school name index.
+
+    python bench/school_index.py
+"""
+import os
+import sys
+import time
+import random
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+
+def main() -> int:
+    from helpers.schoolIndex import SchoolIndex
+
+    words = ['springfield', 'central', 'lincoln', 'riverside', 'oak', 'hill', 'valley',
+             'st', 'marys', 'public', 'international', 'academy', 'high', 'primary']
+    rng = random.Random(7)
+    schools = [{'id': i, 'name': ' '.join(rng.choice(words) for _ in range(3)) + ' School'}
+               for i in range(100_000)]
+
+    start = time.perf_counter()
+    school_index = SchoolIndex(lambda: schools)
+    school_index.ensure_loaded()
+    print(f"build over {len(schools)} names: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    queries = ['spr', 'high sch', 'oak', 'international academy', 'zzz']
+    runs = 2000
+    start = time.perf_counter()
+    for _ in range(runs):
+        for query in queries:
+            school_index.search(query, limit=10)
+    elapsed = (time.perf_counter() - start) / (runs * len(queries)) * 1e6
+    print(f"top-10 prefix search: {elapsed:.1f} us per query")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
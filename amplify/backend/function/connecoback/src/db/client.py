@@ -0,0 +1,165 @@
+import os
+import time
+import threading
+from pymongo import MongoClient, monitoring
+from shared.db.base import Database
+from pymongo.collection import Collection
+import helpers.metrics as metrics
+
+MONGODB_URI = os.getenv('MONGODB_URI')
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '10'))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '1'))
+# pymongo has no max connection lifetime; idle time is the age limit it offers
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(
+    os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000'))
+# Check-outs slower than this are counted as having waited for a connection
+MONGO_WAIT_THRESHOLD_MS = float(os.getenv('MONGO_WAIT_THRESHOLD_MS', '1'))
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.counts = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'checkout_failures': 0,
+            'waits': 0,
+            'wait_ms': 0.0,
+            'cleared': 0
+        }
+
+    def _incr(self, key: str, value: float = 1) -> None:
+        with self._lock:
+            self.counts[key] += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
+
+    def connection_created(self, event) -> None:
+        self._incr('created')
+
+    def connection_closed(self, event) -> None:
+        self._incr('closed')
+
+    def connection_check_out_started(self, event) -> None:
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        started = getattr(self._local, 'started', None)
+        elapsed = (time.perf_counter() - started) * 1000 if started else 0.0
+        with self._lock:
+            self.counts['checkouts'] += 1
+            if elapsed > MONGO_WAIT_THRESHOLD_MS:
+                self.counts['waits'] += 1
+                self.counts['wait_ms'] += elapsed
+
+    def connection_check_out_failed(self, event) -> None:
+        self._incr('checkout_failures')
+
+    def pool_cleared(self, event) -> None:
+        self._incr('cleared')
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_checked_in(self, event) -> None:
+        pass
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Attributes Mongo round trips to whichever request issued them."""
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        self._record(event)
+
+    def failed(self, event) -> None:
+        self._record(event)
+
+    def _record(self, event) -> None:
+        request = metrics.current()
+        if request is None:
+            return
+        request.add('MongoCommands')
+        request.add('MongoTime', event.duration_micros / 1000)
+
+
+POOL_STATS = PoolStats()
+# Registered globally so the stats also cover the shared Database() client
+monitoring.register(POOL_STATS)
+# Here rather than in helpers.metrics, so routes that never touch Mongo
+# don't import pymongo on a cold start
+monitoring.register(CommandMetrics())
+
+_lock = threading.Lock()
+_client: MongoClient = None
+# Which path built the client: 'MONGODB_URI', 'shared', or 'shared-untuned'
+CLIENT_SOURCE: str = None
+_collections: dict[tuple[str, str], Collection] = {}
+
+
+def get_client() -> MongoClient:
+    """One client per container, reused across warm invocations."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _create_client()
+    return _client
+
+
+def pool_options() -> dict:
+    return {
+        'maxPoolSize': MONGO_MAX_POOL_SIZE,
+        'minPoolSize': MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': MONGO_MAX_IDLE_TIME_MS,
+        'waitQueueTimeoutMS': MONGO_WAIT_QUEUE_TIMEOUT_MS
+    }
+
+
+def _create_client() -> MongoClient:
+    """From MONGODB_URI when set, else from the shared Database() client's own
+    URI and options. Either way the MONGO_* pool settings apply."""
+    global CLIENT_SOURCE
+    if MONGODB_URI:
+        CLIENT_SOURCE = 'MONGODB_URI'
+        return MongoClient(MONGODB_URI, **pool_options())
+
+    shared = Database().client
+    # pymongo's own copy-with-overrides; it rebuilds the client from the
+    # arguments the shared module passed, so host and credentials carry over
+    duplicate = getattr(shared, '_duplicate', None) if isinstance(shared, MongoClient) else None
+    if duplicate is None:
+        CLIENT_SOURCE = 'shared-untuned'
+        print(f'WARNING: {type(shared).__name__} cannot be rebuilt; MONGO_* pool '
+              f'settings are NOT applied, set MONGODB_URI to tune the pool')
+        return shared
+    CLIENT_SOURCE = 'shared'
+    return duplicate(**pool_options())
+
+
+def get_collection(db_name: str, collection_name: str) -> Collection:
+    key = (db_name, collection_name)
+    collection = _collections.get(key)
+    if collection is None:
+        collection = _collections[key] = get_client()[db_name][collection_name]
+    return collection
+
+
+def get_pool_stats() -> dict:
+    return {**POOL_STATS.snapshot(), 'source': CLIENT_SOURCE}
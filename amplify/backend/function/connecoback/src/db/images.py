@@ -0,0 +1,97 @@
+import re
+from typing import Optional
+from datetime import datetime, timezone
+from urllib.parse import urlparse, unquote, quote
+from db.client import get_collection
+from pymongo.collection import Collection
+from shared.db.users import get_posts_collection, get_user_by_id
+import helpers.feedCache as feed_cache
+
+# bucket.s3.amazonaws.com, bucket.s3.<region>.amazonaws.com and bucket.s3-<region>...
+VIRTUAL_HOST = re.compile(r'^(?P<bucket>.+)\.s3[.-](?:[a-z0-9-]+\.)?amazonaws\.com$')
+
+
+def get_variant_collection() -> Collection:
+    return get_collection('nutribot', 'image_variants')
+
+
+def object_ref(image_url: str) -> Optional[str]:
+    """`bucket/key` for an S3 object URL, whichever host style it uses."""
+    if not image_url:
+        return None
+    url = urlparse(image_url)
+    if not url.netloc:
+        return None
+    match = VIRTUAL_HOST.match(url.netloc)
+    path = unquote(url.path).lstrip('/')
+    if match:
+        return f"{match.group('bucket')}/{path}"
+    if url.netloc.startswith('s3.') or url.netloc.startswith('s3-'):
+        return path or None
+    return None
+
+
+def object_urls(bucket: str, key: str, region: str) -> list[str]:
+    """URL spellings a client may have stored as a post's image_url."""
+    urls = []
+    for path in dict.fromkeys([key, quote(key)]):
+        urls += [
+            f'https://{bucket}.s3.amazonaws.com/{path}',
+            f'https://{bucket}.s3.{region}.amazonaws.com/{path}',
+            f'https://s3.{region}.amazonaws.com/{bucket}/{path}'
+        ]
+    return urls
+
+
+def record_variants(bucket: str, key: str, region: str, variants: dict) -> int:
+    """Store variants for an original and stamp them on posts already using it.
+
+    Written before the posts are updated, so a post created from here on
+    finds them in attach_variants.
+    """
+    now = datetime.now(timezone.utc)
+    get_variant_collection().update_one(
+        {'_id': f'{bucket}/{key}'},
+        {'$set': {'variants': variants, 'updated_at': now}},
+        upsert=True
+    )
+    posts_collection = get_posts_collection()
+    query = {'image_url': {'$in': object_urls(bucket, key, region)}}
+    # updated_at moves the feed ETag, so clients refetch the new sizes
+    result = posts_collection.update_many(
+        query, {'$set': {'image_variants': variants, 'updated_at': now}})
+    if result.modified_count:
+        invalidate_feeds(posts_collection.distinct('user_id', query))
+    return result.modified_count
+
+
+def invalidate_feeds(user_ids: list) -> None:
+    """Drop the cached feed pages of every couple these users belong to."""
+    couples = {}
+    for user_id in user_ids:
+        user = get_user_by_id(str(user_id))
+        partner_id = user.get('partner') if user else None
+        couples.setdefault(feed_cache.couple_key(user_id, partner_id), (user_id, partner_id))
+    for user_id, partner_id in couples.values():
+        feed_cache.invalidate(user_id, partner_id)
+
+
+def attach_variants(posts: list[dict]) -> None:
+    """Copy already generated variants onto posts about to be inserted.
+
+    One lookup for the whole batch, and only when a post has an S3 image.
+    Variants recorded after it are stamped by record_variants once the
+    posts exist. The only miss is an upload whose variants are recorded in
+    the moment between this lookup and the insert.
+    """
+    refs = {}
+    for post in posts:
+        ref = object_ref(post.get('image_url'))
+        if ref:
+            refs.setdefault(ref, []).append(post)
+    if not refs:
+        return
+
+    for found in get_variant_collection().find({'_id': {'$in': list(refs)}}):
+        for post in refs[found['_id']]:
+            post['image_variants'] = found['variants']
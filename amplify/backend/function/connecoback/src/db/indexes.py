@@ -0,0 +1,127 @@
+"""
+Declares the indexes every collection needs, creates them idempotently, and
+checks that the hot queries are served by them.
+
+    python -m db.indexes            # create missing indexes
+    python -m db.indexes --explain  # also explain each hot query; exits 1 on
+                                    # a COLLSCAN or in-memory SORT
+
+Schools live in MySQL (shared.db.schools) and are not covered here.
+"""
+import sys
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.collection import Collection
+from db.client import get_collection
+from db.users import get_credential_collection
+from nutri.db.users import get_user_collection as get_nutri_user_collection
+from shared.db.users import get_posts_collection
+
+
+def _unique_string(field: str, name: str) -> IndexModel:
+    return IndexModel([(field, ASCENDING)], name=name, unique=True,
+                      partialFilterExpression={field: {'$type': 'string'}})
+
+
+def _expiry() -> IndexModel:
+    return IndexModel([('expires_at', ASCENDING)], name='expires_at_ttl',
+                      expireAfterSeconds=0)
+
+
+# name -> (collection getter, indexes)
+INDEXES = {
+    # Digests are the _id; the TTL only removes abandoned signup reservations
+    'nutribot.credential_lookup': (get_credential_collection, [_expiry()]),
+    'nutridb.users': (get_nutri_user_collection, [
+        _unique_string('phone', 'phone_unique'),
+        _unique_string('email', 'email_unique')
+    ]),
+    'posts': (get_posts_collection, [
+        IndexModel([('user_id', ASCENDING), ('date', DESCENDING), ('_id', DESCENDING)],
+                   name='user_date_id'),
+        # Covers the feed ETag's count/newest-updated_at aggregation
+        IndexModel([('user_id', ASCENDING), ('updated_at', DESCENDING)],
+                   name='user_updated_at'),
+        # Image variants are stamped on posts by their original's URL
+        IndexModel([('image_url', ASCENDING)], name='image_url', sparse=True)
+    ]),
+    'nutribot.feed_cache': (lambda: get_collection('nutribot', 'feed_cache'), [_expiry()]),
+    'nutridb.recipe_cache': (lambda: get_collection('nutridb', 'recipe_cache'), [_expiry()])
+}
+
+
+def _feed_query() -> dict:
+    return {'$or': [{'user_id': ObjectId()}, {'user_id': ObjectId()}]}
+
+
+# name -> (collection getter, filter, sort)
+HOT_QUERIES = {
+    'login by credential': (get_credential_collection, lambda: {'_id': 'x' * 64}, None),
+    'nutri user by phone': (get_nutri_user_collection, lambda: {'phone': '0000000000'}, None),
+    'nutri user by email': (get_nutri_user_collection, lambda: {'email': 'a@b.c'}, None),
+    'posts by image url': (get_posts_collection, lambda: {'image_url': {'$in': ['https://x/y.jpg']}}, None),
+    'couple feed first page': (get_posts_collection, _feed_query,
+                               [('date', DESCENDING), ('_id', DESCENDING)]),
+    'couple feed seek page': (get_posts_collection, lambda: {'$and': [_feed_query(), {'$or': [
+        {'date': {'$lt': ObjectId().generation_time}},
+        {'date': ObjectId().generation_time, '_id': {'$lt': ObjectId()}}
+    ]}]}, [('date', DESCENDING), ('_id', DESCENDING)])
+}
+
+
+def ensure_indexes() -> dict:
+    created = {}
+    for name, (get_target, indexes) in INDEXES.items():
+        created[name] = get_target().create_indexes(indexes)
+    return created
+
+
+def plan_stages(plan: dict) -> list[str]:
+    stages = [plan['stage']] if 'stage' in plan else []
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            stages += plan_stages(plan[key])
+    for child in plan.get('inputStages', []):
+        stages += plan_stages(child)
+    return stages
+
+
+def explain_stages(collection: Collection, query: dict, sort: list = None) -> list[str]:
+    cursor = collection.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    explain = cursor.limit(21).explain()
+    return plan_stages(explain['queryPlanner']['winningPlan'])
+
+
+class UnindexedQuery(Exception):
+    pass
+
+
+def assert_indexed(collection: Collection, query: dict, sort: list = None) -> list[str]:
+    """Raise UnindexedQuery when the winning plan scans the collection or
+    sorts in memory; returns the plan's stages otherwise."""
+    stages = explain_stages(collection, query, sort)
+    bad = {'COLLSCAN', 'SORT'} & set(stages)
+    if bad:
+        raise UnindexedQuery(f"{collection.full_name}: {', '.join(sorted(bad))} in {stages}")
+    return stages
+
+
+def check_hot_queries() -> dict:
+    failures = {}
+    for name, (get_target, build_query, sort) in HOT_QUERIES.items():
+        try:
+            assert_indexed(get_target(), build_query(), sort)
+        except UnindexedQuery as e:
+            failures[name] = str(e)
+    return failures
+
+
+if __name__ == "__main__":
+    print(ensure_indexes())
+    if '--explain' in sys.argv:
+        failures = check_hot_queries()
+        for name, failure in failures.items():
+            print(f"{name}: {failure}")
+        sys.exit(1 if failures else 0)
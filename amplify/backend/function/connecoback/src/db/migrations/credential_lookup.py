@@ -0,0 +1,57 @@
+"""
+Stamps existing users with their credential lookup digest. Users are owned
+by shared.db.users, so the database and collection it keeps them in are
+passed explicitly rather than assumed. Safe to re-run; digests that already
+exist are skipped. Users whose stored password is already a passlib hash
+can't be backfilled here and are stamped on their next successful login.
+
+    python -m db.migrations.credential_lookup <db> <collection>
+"""
+import sys
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from db.client import get_collection
+from db.users import get_credential_collection, password_lookup_key
+
+BATCH_SIZE = 1000
+DUPLICATE_KEY = 11000
+
+
+def _flush(batch: list) -> tuple:
+    try:
+        result = get_credential_collection().bulk_write(batch, ordered=False)
+        return result.inserted_count, 0
+    except BulkWriteError as e:
+        # Already stamped, or users sharing a password; the latter keep
+        # resolving through the legacy lookup until one of them changes it.
+        errors = e.details['writeErrors']
+        conflicts = sum(1 for error in errors if error['code'] == DUPLICATE_KEY)
+        if conflicts != len(errors):
+            raise
+        return e.details['nInserted'], conflicts
+
+
+def backfill(db_name: str, collection_name: str) -> dict:
+    users_collection = get_collection(db_name, collection_name)
+    query = {'password': {'$type': 'string', '$not': {'$regex': r'^\$'}}}
+    cursor = users_collection.find(query, {'password': 1})
+
+    stamped, skipped, batch = 0, 0, []
+    for user in cursor:
+        key = password_lookup_key(user['password'])
+        batch.append(InsertOne({'_id': key, 'user_id': user['_id']}))
+        if len(batch) >= BATCH_SIZE:
+            inserted, conflicts = _flush(batch)
+            stamped, skipped, batch = stamped + inserted, skipped + conflicts, []
+    if batch:
+        inserted, conflicts = _flush(batch)
+        stamped, skipped = stamped + inserted, skipped + conflicts
+
+    return {'stamped': stamped, 'skipped': skipped,
+            'digests': get_credential_collection().count_documents({'user_id': {'$exists': True}})}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    print(backfill(sys.argv[1], sys.argv[2]))
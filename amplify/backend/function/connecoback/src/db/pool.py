@@ -0,0 +1,165 @@
+import time
+import threading
+import traceback
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ObjectPool:
+    """Process-wide pool of reusable connections (or connection owners).
+
+    Idle entries are evicted once they exceed `max_idle` seconds or `max_age`
+    seconds since creation, and are health-checked before being handed out
+    once they have sat idle for `check_after` seconds.
+    """
+
+    def __init__(self, factory: Callable[[], object], max_size: int = 4, max_idle: float = 300,
+                 max_age: float = 3600, wait_timeout: float = 5,
+                 health_check: Optional[Callable[[object], bool]] = None,
+                 close: Optional[Callable[[object], None]] = None,
+                 check_after: float = 0, discard_on: tuple = ()) -> None:
+        self.factory = factory
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_age = max_age
+        self.wait_timeout = wait_timeout
+        self.health_check = health_check
+        self.close = close
+        self.check_after = check_after
+        self.discard_on = discard_on
+        self._cond = threading.Condition()
+        # (item, created_at, idle_since)
+        self._idle: list[tuple[object, float, float]] = []
+        self._created_at: dict[int, float] = {}
+        self._in_use = 0
+        self.counts = {
+            'created': 0,
+            'reused': 0,
+            'borrowed': 0,
+            'waits': 0,
+            'evicted_idle': 0,
+            'evicted_age': 0,
+            'health_failures': 0,
+            'discarded': 0
+        }
+
+    def _dispose(self, item: object, reason: str) -> None:
+        """Count and forget `item` under the lock; close it with `_close` after."""
+        self.counts[reason] += 1
+        self._created_at.pop(id(item), None)
+
+    def _close(self, items: list) -> None:
+        if not self.close:
+            return
+        for item in items:
+            try:
+                self.close(item)
+            except Exception:
+                traceback.print_exc()
+
+    def _take_idle(self, expired: list) -> tuple[Optional[object], float]:
+        """The most recently released live entry and how long it sat idle."""
+        now = time.monotonic()
+        while self._idle:
+            item, created_at, idle_since = self._idle.pop()
+            if now - created_at > self.max_age:
+                self._dispose(item, 'evicted_age')
+            elif now - idle_since > self.max_idle:
+                self._dispose(item, 'evicted_idle')
+            else:
+                return item, now - idle_since
+            expired.append(item)
+        return None, 0
+
+    def _reserve(self, deadline: float) -> tuple[Optional[object], float]:
+        """Claim a slot; returns an idle item and its idle seconds, or None when the
+        caller must create one.
+
+        Only bookkeeping happens under the lock. Connecting, pinging and
+        closing are left to the caller so a slow one stalls no other borrower.
+        """
+        expired = []
+        try:
+            with self._cond:
+                while True:
+                    item, idle = self._take_idle(expired)
+                    if item is not None or self._in_use < self.max_size:
+                        self._in_use += 1
+                        return item, idle
+                    self.counts['waits'] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        raise PoolTimeout('No pooled connection available')
+        finally:
+            self._close(expired)
+
+    def _unreserve(self) -> None:
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def acquire(self) -> object:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            item, idle = self._reserve(deadline)
+            if item is None:
+                try:
+                    item = self.factory()
+                except BaseException:
+                    self._unreserve()
+                    raise
+                with self._cond:
+                    self.counts['created'] += 1
+                    self.counts['borrowed'] += 1
+                    self._created_at[id(item)] = time.monotonic()
+                return item
+
+            try:
+                healthy = (not self.health_check or idle < self.check_after
+                           or self.health_check(item))
+            except Exception:
+                traceback.print_exc()
+                healthy = False
+            if healthy:
+                with self._cond:
+                    self.counts['reused'] += 1
+                    self.counts['borrowed'] += 1
+                return item
+            with self._cond:
+                self._dispose(item, 'health_failures')
+            self._unreserve()
+            self._close([item])
+
+    def release(self, item: object, discard: bool = False) -> None:
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._dispose(item, 'discarded')
+            else:
+                created_at = self._created_at.get(id(item), time.monotonic())
+                self._idle.append((item, created_at, time.monotonic()))
+            self._cond.notify()
+        if discard:
+            self._close([item])
+
+    @contextmanager
+    def borrow(self) -> Iterator[object]:
+        item = self.acquire()
+        try:
+            yield item
+        except self.discard_on:
+            self.release(item, discard=True)
+            raise
+        except BaseException:
+            self.release(item)
+            raise
+        else:
+            self.release(item)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self.counts, 'in_use': self._in_use, 'idle': len(self._idle)}
@@ -0,0 +1,62 @@
+import os
+from typing import Optional
+import pymysql
+from db.pool import ObjectPool
+from shared.db.schools import SchoolDatabase
+
+SCHOOL_POOL_SIZE = int(os.getenv('SCHOOL_POOL_SIZE', '2'))
+SCHOOL_POOL_MAX_IDLE = float(os.getenv('SCHOOL_POOL_MAX_IDLE', '300'))
+SCHOOL_POOL_MAX_AGE = float(os.getenv('SCHOOL_POOL_MAX_AGE', '3600'))
+# Instances idle for at least this long are pinged before reuse
+SCHOOL_POOL_CHECK_AFTER = float(os.getenv('SCHOOL_POOL_CHECK_AFTER', '30'))
+
+# Pools SchoolDatabase instances, not raw connections. shared.db.schools isn't
+# pinned by this repo, so its connection is found by type rather than by name:
+# the ping and close below use it when the instance exposes a PyMySQL
+# connection, and otherwise fall back to the instance's own ping/close if it
+# has them. Prepared-statement caching is not done here: PyMySQL interpolates
+# parameters client-side, and the queries belong to the shared module.
+_CONNECTION_ATTRS = ('connection', 'conn', '_connection', '_conn', 'db')
+
+
+def _connection(db: SchoolDatabase) -> Optional[pymysql.connections.Connection]:
+    for name in _CONNECTION_ATTRS:
+        conn = getattr(db, name, None)
+        if isinstance(conn, pymysql.connections.Connection):
+            return conn
+    return None
+
+
+def ping(db: SchoolDatabase) -> bool:
+    """One round trip to MySQL; a dropped connection fails the check."""
+    conn = _connection(db)
+    if conn is not None:
+        conn.ping(reconnect=False)
+    elif callable(getattr(db, 'ping', None)):
+        db.ping()
+    return True
+
+
+def close(db: SchoolDatabase) -> None:
+    if callable(getattr(db, 'close', None)):
+        db.close()
+        return
+    conn = _connection(db)
+    if conn is not None and conn.open:
+        conn.close()
+
+
+school_pool = ObjectPool(
+    SchoolDatabase,
+    max_size=SCHOOL_POOL_SIZE,
+    max_idle=SCHOOL_POOL_MAX_IDLE,
+    max_age=SCHOOL_POOL_MAX_AGE,
+    health_check=ping,
+    close=close,
+    check_after=SCHOOL_POOL_CHECK_AFTER,
+    discard_on=(pymysql.err.OperationalError, pymysql.err.InterfaceError)
+)
+
+
+def get_pool_stats() -> dict:
+    return school_pool.stats()
@@ -1,10 +1,69 @@
-from shared.db.base import Database
+import os
+import hmac
+import hashlib
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from db.client import get_collection
 from pymongo.collection import Collection
+from shared.db.users import get_user_by_id
 
 
-def get_user_collection() -> Collection:
-    client = Database().client
+# Keyed so a leaked lookup collection can't be reversed with a rainbow table.
+# Must not be shared with any other secret; rotating it orphans every digest,
+# which are then re-stamped through the legacy lookup on each user's next login.
+CREDENTIAL_LOOKUP_SECRET = os.getenv('CREDENTIAL_LOOKUP_SECRET')
+# Fall back to the password scan for users not stamped yet.
+CREDENTIAL_LEGACY_LOOKUP = os.getenv('CREDENTIAL_LEGACY_LOOKUP', '1') == '1'
+# A signup that dies between reserving its digest and creating the user
+# releases the digest after this long (TTL index on expires_at)
+CREDENTIAL_RESERVATION_TTL = int(os.getenv('CREDENTIAL_RESERVATION_TTL', '60'))
 
-    db = client['nutribot']
-    users_collection = db["users"]
-    return users_collection
+
+def get_credential_collection() -> Collection:
+    """digest -> user_id. Users themselves are only read through shared.db.users,
+    so this works whichever collection that module keeps them in."""
+    return get_collection('nutribot', 'credential_lookup')
+
+
+def password_lookup_key(password: str) -> str:
+    if not CREDENTIAL_LOOKUP_SECRET:
+        raise RuntimeError('CREDENTIAL_LOOKUP_SECRET is not set')
+    return hmac.new(
+        CREDENTIAL_LOOKUP_SECRET.encode(), password.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def get_user_by_credential(password: str) -> Optional[dict]:
+    entry = get_credential_collection().find_one({'_id': password_lookup_key(password)})
+    if not entry or not entry.get('user_id'):
+        return None
+    return get_user_by_id(str(entry['user_id']))
+
+
+def reserve_credential(password: str) -> str:
+    """Claims the digest for a signup in progress; raises DuplicateKeyError
+    when another user (or a concurrent signup) already holds it."""
+    key = password_lookup_key(password)
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=CREDENTIAL_RESERVATION_TTL)
+    get_credential_collection().insert_one({'_id': key, 'expires_at': expires_at})
+    return key
+
+
+def release_credential(key: str) -> None:
+    get_credential_collection().delete_one({'_id': key, 'user_id': {'$exists': False}})
+
+
+def confirm_credential(key: str, user_id: str) -> None:
+    """Binds a reserved digest to the user the signup created."""
+    get_credential_collection().update_one(
+        {'_id': key},
+        {'$set': {'user_id': ObjectId(user_id)}, '$unset': {'expires_at': ''}}
+    )
+
+
+def set_credential_key(user_id: str, password: str) -> None:
+    """Stamps a user found through the legacy lookup; raises DuplicateKeyError
+    when the digest already belongs to someone else."""
+    get_credential_collection().insert_one(
+        {'_id': password_lookup_key(password), 'user_id': ObjectId(user_id)})
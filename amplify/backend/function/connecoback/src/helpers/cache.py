@@ -0,0 +1,114 @@
+import time
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pymongo.collection import Collection
+
+
+class Cache(ABC):
+    """Common counters for the cache backends below."""
+
+    def __init__(self) -> None:
+        self._stats_lock = threading.Lock()
+        self.counts = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _incr(self, key: str) -> None:
+        with self._stats_lock:
+            self.counts[key] += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            counts = dict(self.counts)
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_rate'] = round(counts['hits'] / lookups, 4) if lookups else 0.0
+        return counts
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class LRUCache(Cache):
+    """In-process LRU with optional per-entry TTL in seconds."""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[int] = None) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data: OrderedDict[str, tuple] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._incr('hits')
+                    return value
+                del self._data[key]
+        self._incr('misses')
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._incr('evictions')
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class MongoCache(Cache):
+    """Cache shared across containers, stored in a Mongo collection.
+
+    Expired entries are ignored on read and removed by the collection's TTL
+    index (declared in db.indexes); evictions count those expired reads.
+    """
+
+    def __init__(self, collection: Collection, ttl: Optional[int] = None) -> None:
+        super().__init__()
+        self.collection = collection
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.collection.find_one({'_id': key})
+        if entry is not None:
+            expires_at = entry.get('expires_at')
+            if expires_at is not None and expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at is None or expires_at > datetime.now(timezone.utc):
+                self._incr('hits')
+                return entry['value']
+            self._incr('evictions')
+        self._incr('misses')
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl) if ttl else None
+        self.collection.replace_one(
+            {'_id': key},
+            {'value': value, 'expires_at': expires_at},
+            upsert=True
+        )
+
+    def delete(self, key: str) -> None:
+        self.collection.delete_one({'_id': key})
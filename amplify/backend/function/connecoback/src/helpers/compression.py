@@ -0,0 +1,69 @@
+import os
+import gzip
+from flask import request, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Off by default: compressed bodies go back base64 encoded, and the apicon
+# REST API has no binary media types to decode them, so clients would get
+# base64 text labelled gzip. Enable only behind an API that decodes them.
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', '0') == '1'
+# Below this many bytes the header overhead and CPU outweigh the saving
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '4'))
+# Already compressed formats; recompressing them only burns CPU
+SKIP_MIMETYPES = {'application/zip', 'application/gzip', 'application/x-gzip',
+                  'application/pdf', 'application/octet-stream'}
+SKIP_PREFIXES = ('image/', 'video/', 'audio/', 'font/')
+
+
+def encodings() -> list[str]:
+    return ['br', 'gzip'] if brotli else ['gzip']
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output, and so any ETag over it, deterministic
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def should_compress(response: Response) -> bool:
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype not in SKIP_MIMETYPES and not mimetype.startswith(SKIP_PREFIXES)
+
+
+def compress_response(response: Response) -> Response:
+    """Encode the body with the client's preferred supported encoding."""
+    if not COMPRESSION_ENABLED or not should_compress(response):
+        return response
+    # Whatever happens below, the body depends on Accept-Encoding
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(encodings())
+    if not encoding:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    # The encoded bytes differ from the identity body the strong tag names
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
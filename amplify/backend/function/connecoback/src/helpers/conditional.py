@@ -0,0 +1,58 @@
+import hashlib
+import threading
+from flask import request, Response
+import helpers.metrics as metrics
+from helpers.encoder import dumps
+
+_lock = threading.Lock()
+_counts: dict[str, dict[str, int]] = {}
+
+
+def make_etag(*parts) -> str:
+    """Strong validator over `parts`; they must encode the same way in every container."""
+    return hashlib.blake2b(dumps(list(parts)), digest_size=12).hexdigest()
+
+
+def body_etag(data) -> str:
+    """Fallback validator for responses with no cheaper version to key on."""
+    return make_etag(data)
+
+
+def _record(conditional: bool, not_modified: bool) -> None:
+    with _lock:
+        counts = _counts.setdefault(
+            request.path, {'requests': 0, 'conditional': 0, 'not_modified': 0})
+        counts['requests'] += 1
+        counts['conditional'] += int(conditional)
+        counts['not_modified'] += int(not_modified)
+    request_metrics = metrics.current()
+    if request_metrics is not None:
+        request_metrics.add('ConditionalRequests', int(conditional))
+        request_metrics.add('NotModified', int(not_modified))
+
+
+def is_fresh(etag: str) -> bool:
+    """True when the client's If-None-Match already names `etag`."""
+    conditional = bool(request.if_none_match)
+    fresh = conditional and request.if_none_match.contains_weak(etag)
+    _record(conditional, fresh)
+    return fresh
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def etag_headers(etag: str) -> dict:
+    return {'ETag': f'"{etag}"'}
+
+
+def stats() -> dict:
+    """Per-route conditional GET counts; `hit_rate` is 304s over all requests."""
+    with _lock:
+        return {
+            route: {**counts, 'hit_rate': round(counts['not_modified'] / counts['requests'], 4)}
+            for route, counts in _counts.items()
+        }
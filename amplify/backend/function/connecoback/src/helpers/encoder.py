@@ -0,0 +1,48 @@
+import sys
+import json
+import decimal
+from uuid import UUID
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def default(value):
+    """Encodes the BSON and Python types a Mongo document can contain."""
+    # No BSON values can exist until bson is loaded, and importing it here
+    # would add it to every cold start
+    bson = sys.modules.get('bson')
+    if bson and isinstance(value, bson.ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        # str(), not isoformat(): clients parse the space-separated form
+        # Common.jsonify has always returned
+        return str(value)
+    if bson and isinstance(value, bson.Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (decimal.Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return str(value)
+
+
+if orjson:
+    def dumps(data) -> bytes:
+        """Serialize straight to bytes in one pass, with no converted copy of
+        the document tree."""
+        return orjson.dumps(data, default=default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+else:
+    _encoder = json.JSONEncoder(default=default, separators=(',', ':'),
+                                ensure_ascii=False)
+
+    def dumps(data) -> bytes:
+        """Serialize straight to bytes in one pass, with no converted copy of
+        the document tree."""
+        return _encoder.encode(data).encode('utf-8')
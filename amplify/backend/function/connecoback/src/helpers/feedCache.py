@@ -0,0 +1,89 @@
+import os
+import uuid
+import threading
+from typing import Optional
+from db.client import get_collection
+from helpers.cache import Cache, LRUCache, MongoCache
+
+# 'mongo' is shared by every container, so a post invalidates the couple's
+# feed everywhere. 'memory' is per container: other containers keep serving
+# their cached pages for up to FEED_CACHE_TTL after a write.
+FEED_CACHE_BACKEND = os.getenv('FEED_CACHE_BACKEND', 'mongo')
+FEED_CACHE_PAGES = int(os.getenv('FEED_CACHE_PAGES', '3'))
+FEED_CACHE_SIZE = int(os.getenv('FEED_CACHE_SIZE', '2048'))
+FEED_CACHE_TTL = int(os.getenv('FEED_CACHE_TTL', '300'))
+
+_cache: Cache = None
+_lock = threading.Lock()
+# Page lookups only; the backend's own counters also see generation reads
+_counts = {'hits': 0, 'misses': 0}
+
+
+def get_cache() -> Cache:
+    global _cache
+    if _cache is None:
+        if FEED_CACHE_BACKEND == 'mongo':
+            _cache = MongoCache(get_collection(
+                'nutribot', 'feed_cache'), ttl=FEED_CACHE_TTL)
+        else:
+            _cache = LRUCache(max_size=FEED_CACHE_SIZE, ttl=FEED_CACHE_TTL)
+    return _cache
+
+
+def set_cache(cache: Cache) -> None:
+    """Swap the backend, e.g. for a MongoCache over mongomock in tests."""
+    global _cache
+    _cache = cache
+
+
+def couple_key(user_id, partner_id) -> str:
+    return ':'.join(sorted([str(user_id), str(partner_id or '')]))
+
+
+def _generation(couple: str) -> str:
+    # Pages are keyed by the couple's current generation, so a single write
+    # of a new generation invalidates every cached page and sort order. A
+    # generation that was evicted is replaced rather than reset, so stale
+    # pages can never match again.
+    cache = get_cache()
+    generation = cache.get(f'feedgen:{couple}')
+    if generation is None:
+        generation = invalidate_couple(couple)
+    return generation
+
+
+def invalidate_couple(couple: str) -> str:
+    generation = uuid.uuid4().hex
+    get_cache().set(f'feedgen:{couple}', generation, ttl=0)
+    return generation
+
+
+def invalidate(user_id, partner_id) -> None:
+    invalidate_couple(couple_key(user_id, partner_id))
+
+
+def page_key(user_id, partner_id, variant: str) -> str:
+    """Resolve the key before reading the feed, so a post written while the
+    page is being built invalidates it instead of being cached over."""
+    couple = couple_key(user_id, partner_id)
+    return f'feed:{couple}:{_generation(couple)}:{variant}'
+
+
+def get_page(key: str) -> Optional[dict]:
+    data = get_cache().get(key)
+    with _lock:
+        _counts['hits' if data is not None else 'misses'] += 1
+    return data
+
+
+def set_page(key: str, data: dict) -> None:
+    get_cache().set(key, data)
+
+
+def stats() -> dict:
+    with _lock:
+        counts = dict(_counts)
+    lookups = counts['hits'] + counts['misses']
+    counts['hit_rate'] = round(counts['hits'] / lookups, 4) if lookups else 0.0
+    counts['evictions'] = get_cache().stats()['evictions']
+    return counts
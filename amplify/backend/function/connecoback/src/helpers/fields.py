@@ -0,0 +1,33 @@
+from typing import Optional
+
+
+def parse_fields(raw: Optional[str], allowed: set[str]) -> tuple[Optional[list[str]], Optional[str]]:
+    """Parse a `fields=a,b` query value.
+
+    Returns (None, None) when absent, (fields, None) with the names sorted
+    so equal selections share cache keys, and (None, error) on names
+    outside `allowed`.
+    """
+    if raw is None:
+        return None, None
+    fields = sorted({name.strip() for name in raw.split(',') if name.strip()})
+    if not fields:
+        return None, 'fields must name at least one field'
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        return None, f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}"
+    return fields, None
+
+
+def projection(fields: Optional[list[str]], *required: str) -> Optional[dict]:
+    """Mongo projection for `fields` plus the keys the caller needs itself."""
+    if fields is None:
+        return None
+    return {name: 1 for name in [*fields, *required]}
+
+
+def select(rows: list[dict], fields: Optional[list[str]]) -> list[dict]:
+    """Column filtering for rows that were already read in full."""
+    if fields is None:
+        return rows
+    return [{name: row[name] for name in fields if name in row} for row in rows]
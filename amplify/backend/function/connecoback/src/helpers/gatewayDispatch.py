@@ -0,0 +1,154 @@
+import io
+import sys
+import awsgi
+from base64 import b64decode, b64encode
+from urllib.parse import urlencode
+from flask import Flask, Response
+
+# Bodies of these types go back as text; anything else is base64 encoded
+TEXT_MIMETYPES = {'application/json', 'application/x-ndjson', 'application/javascript',
+                  'application/xml'}
+
+
+def is_supported(event: dict) -> bool:
+    """API Gateway REST (v1) and HTTP API (v2) proxy events; ELB and the rest go to awsgi."""
+    context = event.get('requestContext') or {}
+    if 'elb' in context:
+        return False
+    if event.get('version') == '2.0':
+        return 'http' in context and 'rawPath' in event
+    return 'httpMethod' in event and 'path' in event
+
+
+def build_environ(event: dict, context) -> dict:
+    """The WSGI environ awsgi would build, straight from the event fields."""
+    v2 = event.get('version') == '2.0'
+    if v2:
+        method = event['requestContext']['http']['method']
+        path = event['rawPath']
+        query = event.get('rawQueryString', '')
+    else:
+        method = event['httpMethod']
+        path = event['path']
+        multi = event.get('multiValueQueryStringParameters')
+        query = urlencode(multi, doseq=True) if multi else urlencode(
+            event.get('queryStringParameters') or {})
+
+    body = event.get('body') or b''
+    if event.get('isBase64Encoded'):
+        body = b64decode(body)
+    elif isinstance(body, str):
+        body = body.encode('utf-8')
+
+    environ = {
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'lambda',
+        'SERVER_PORT': '443',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'https',
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+        'awsgi.event': event,
+        'awsgi.context': context
+    }
+    headers = event.get('headers') or {}
+    if v2 and event.get('cookies'):
+        headers = {**headers, 'cookie': '; '.join(event['cookies'])}
+    for key, value in headers.items():
+        key = key.upper().replace('-', '_')
+        if key == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif key == 'HOST':
+            environ['SERVER_NAME'] = value
+        elif key == 'X_FORWARDED_FOR':
+            environ['REMOTE_ADDR'] = value.split(',')[0].strip()
+        elif key == 'X_FORWARDED_PROTO':
+            environ['wsgi.url_scheme'] = value
+        elif key == 'X_FORWARDED_PORT':
+            environ['SERVER_PORT'] = value
+        environ['HTTP_' + key] = value
+    return environ
+
+
+def is_text(response: Response) -> bool:
+    if 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in TEXT_MIMETYPES
+
+
+def build_result(response: Response, v2: bool) -> dict:
+    body = response.get_data()
+    text = is_text(response)
+    headers, cookies = {}, []
+    for key, value in response.headers.items():
+        if key.lower() == 'set-cookie':
+            cookies.append(value)
+        else:
+            headers[key] = value
+
+    result = {
+        'statusCode': response.status_code,
+        'headers': headers,
+        'body': body.decode('utf-8') if text else b64encode(body).decode('ascii'),
+        'isBase64Encoded': not text
+    }
+    if cookies:
+        if v2:
+            result['cookies'] = cookies
+        else:
+            result['multiValueHeaders'] = {'Set-Cookie': cookies}
+    return result
+
+
+class _EncodedBody:
+    """awsgi base64s by Content-Type only and utf-8 decodes everything else,
+    which fails on gzip/br bodies; encoded bodies must go out as base64."""
+
+    def use_binary_response(self, headers, body):
+        return 'Content-Encoding' in headers or super().use_binary_response(headers, body)
+
+
+class _GatewayStartResponse(_EncodedBody, awsgi.StartResponse_GW):
+    pass
+
+
+class _ELBStartResponse(_EncodedBody, awsgi.StartResponse_ELB):
+    pass
+
+
+def awsgi_response(app: Flask, event: dict, context) -> dict:
+    """`awsgi.response`, with encoded bodies returned as base64."""
+    elb = 'elb' in (event.get('requestContext') or {})
+    start_response = (_ELBStartResponse if elb else _GatewayStartResponse)()
+    output = app(awsgi.environ(event, context), start_response)
+    return start_response.response(output)
+
+
+def dispatch(app: Flask, event: dict, context) -> dict | None:
+    """Run one API Gateway event through Flask without the WSGI round trip.
+
+    Before/after-request hooks (CORS, the shared Handler), JWT decorators and
+    Flask-RESTful dispatch all still run; only the environ/start_response
+    plumbing and awsgi's body re-encoding are skipped. Returns None for
+    events this path doesn't handle so the caller can fall back to awsgi.
+    """
+    if not is_supported(event):
+        return None
+    environ = build_environ(event, context)
+    with app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            response = app.make_response(app.handle_exception(e))
+        # Consumed inside the context so streamed views can still read the request
+        return build_result(response, event.get('version') == '2.0')
@@ -0,0 +1,66 @@
+import os
+import threading
+from typing import Optional
+from flask import request
+from helpers.cache import LRUCache
+from shared.db.users import get_user_by_id
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+# Bump when the claim layout changes; older tokens then fall back to the DB
+CLAIMS_VERSION = 1
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '1024'))
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '60'))
+
+_user_cache = LRUCache(max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+_lock = threading.Lock()
+_counts: dict[str, dict[str, int]] = {}
+
+
+def user_claims(user: dict) -> dict:
+    """Profile claims embedded in tokens minted for `user`."""
+    partner = user.get('partner')
+    return {
+        'cv': CLAIMS_VERSION,
+        'name': user['name'],
+        'partner': str(partner) if partner else None
+    }
+
+
+def _record(source: str) -> None:
+    with _lock:
+        counts = _counts.setdefault(
+            request.path, {'claims': 0, 'cache': 0, 'db': 0})
+        counts[source] += 1
+
+
+def current_user(use_claims: bool = True) -> Optional[dict]:
+    """The caller's `_id`, `name` and `partner`, read from the token claims
+    when they're current, then a short-lived cache, then the DB."""
+    user_id = get_jwt_identity()
+    if use_claims:
+        claims = get_jwt()
+        if claims.get('cv') == CLAIMS_VERSION:
+            _record('claims')
+            return {'_id': user_id, 'name': claims['name'], 'partner': claims['partner']}
+
+    user = _user_cache.get(user_id)
+    if user is not None:
+        _record('cache')
+        return user
+
+    _record('db')
+    user = get_user_by_id(user_id)
+    if not user:
+        return None
+    user = {'_id': user_id, 'name': user['name'], 'partner': user.get('partner')}
+    _user_cache.set(user_id, user)
+    return user
+
+
+def stats() -> dict:
+    """Per-route lookup sources; `avoided` counts requests that skipped the DB."""
+    with _lock:
+        return {
+            route: {**counts, 'avoided': counts['claims'] + counts['cache']}
+            for route, counts in _counts.items()
+        }
@@ -0,0 +1,166 @@
+import io
+import os
+import math
+import shutil
+import tempfile
+import traceback
+from typing import Callable
+from urllib.parse import unquote_plus, quote
+import boto3
+from PIL import Image, ImageOps, UnidentifiedImageError
+from shared.configs import CONFIG as config
+
+# name -> longest edge in pixels, largest first; each is resized from the last
+VARIANTS = [('full', 2048), ('feed', 1080), ('thumb', 320)]
+IMAGE_FORMATS = os.getenv('IMAGE_FORMATS', 'webp,jpeg').split(',')
+# Variants go to their own bucket so writing them can't fire the upload
+# bucket's notification again; unset, they land under VARIANT_PREFIX beside
+# the original, which is only safe without a trigger (local runs, tests)
+VARIANT_BUCKET = os.getenv('IMAGE_VARIANT_BUCKET', '')
+VARIANT_PREFIX = os.getenv('IMAGE_VARIANT_PREFIX', 'variants/')
+# Originals above either limit are skipped rather than decoded
+MAX_IMAGE_BYTES = int(os.getenv('MAX_IMAGE_BYTES', str(50 * 1024 * 1024)))
+MAX_IMAGE_PIXELS = int(os.getenv('MAX_IMAGE_PIXELS', str(60_000_000)))
+# Downloads spill from memory to /tmp past this size
+SPOOL_BYTES = int(os.getenv('IMAGE_SPOOL_BYTES', str(8 * 1024 * 1024)))
+WEBP_QUALITY = int(os.getenv('WEBP_QUALITY', '80'))
+JPEG_QUALITY = int(os.getenv('JPEG_QUALITY', '82'))
+
+CONTENT_TYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+_s3 = None
+
+
+def get_s3():
+    global _s3
+    if _s3 is None:
+        _s3 = boto3.client(
+            's3', region_name=config.REGION,
+            aws_access_key_id=config.ACCESS_KEY,
+            aws_secret_access_key=config.SECRET_ACCESS_KEY
+        )
+    return _s3
+
+
+def variant_key(key: str, name: str, fmt: str) -> str:
+    stem = key.rsplit('.', 1)[0]
+    return f'{VARIANT_PREFIX}{stem}/{name}.{EXTENSIONS[fmt]}'
+
+
+def variant_bucket(bucket: str) -> str:
+    return VARIANT_BUCKET or bucket
+
+
+def object_url(bucket: str, key: str) -> str:
+    return f'https://{bucket}.s3.amazonaws.com/{quote(key)}'
+
+
+def open_image(source) -> Image.Image:
+    """Header-only open; the pixel data is decoded later at draft scale."""
+    image = Image.open(source)
+    width, height = image.size
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ValueError(f'{width}x{height} exceeds MAX_IMAGE_PIXELS')
+    # JPEGs decode straight to the smallest DCT scale that still covers the
+    # largest variant, so a 48 MP photo never exists at full size in memory
+    scale = min(VARIANTS[0][1] / max(width, height), 1)
+    image.draft('RGB', (math.ceil(width * scale), math.ceil(height * scale)))
+    return ImageOps.exif_transpose(image)
+
+
+def encode(image: Image.Image, fmt: str) -> bytes:
+    out = io.BytesIO()
+    if fmt == 'webp':
+        image.save(out, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        if image.mode != 'RGB':
+            flat = Image.new('RGB', image.size, 'white')
+            flat.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+            image = flat
+        image.save(out, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def render(source) -> dict[str, tuple[int, int, dict[str, bytes]]]:
+    """name -> (width, height, {format: encoded bytes}) for every variant."""
+    image = open_image(source)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.getbands() else 'RGB')
+    rendered = {}
+    for name, edge in VARIANTS:
+        # In place and never upscaling: one pixel buffer, shrinking each step
+        image.thumbnail((edge, edge), Image.LANCZOS)
+        rendered[name] = (image.width, image.height,
+                          {fmt: encode(image, fmt) for fmt in IMAGE_FORMATS})
+    return rendered
+
+
+def process_object(bucket: str, key: str) -> dict | None:
+    """Render and upload every variant of one original; returns their URLs."""
+    s3 = get_s3()
+    obj = s3.get_object(Bucket=bucket, Key=key)
+    if obj['ContentLength'] > MAX_IMAGE_BYTES:
+        print(f'Skipping {key}: {obj["ContentLength"]} bytes exceeds MAX_IMAGE_BYTES')
+        return None
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+        shutil.copyfileobj(obj['Body'], spool, 1024 * 1024)
+        spool.seek(0)
+        rendered = render(spool)
+
+    target_bucket = variant_bucket(bucket)
+    variants = {}
+    for name, (width, height, encoded) in rendered.items():
+        variant = {'width': width, 'height': height}
+        for fmt, data in encoded.items():
+            target = variant_key(key, name, fmt)
+            s3.put_object(Bucket=target_bucket, Key=target, Body=data,
+                          ContentType=CONTENT_TYPES[fmt],
+                          CacheControl='public, max-age=31536000, immutable')
+            variant[fmt] = object_url(target_bucket, target)
+        variants[name] = variant
+    return variants
+
+
+def handle_s3_event(event: dict, record: Callable = None) -> dict:
+    """Entry point for S3 ObjectCreated notifications."""
+    if record is None:
+        from db.images import record_variants as record
+    counts = {'processed': 0, 'skipped': 0, 'failed': 0, 'posts_updated': 0}
+    for entry in event.get('Records', []):
+        if not entry.get('eventName', '').startswith('ObjectCreated'):
+            counts['skipped'] += 1
+            continue
+        bucket = entry['s3']['bucket']['name']
+        key = unquote_plus(entry['s3']['object']['key'])
+        # Our own outputs, in case their bucket is ever wired to us as well
+        if bucket == VARIANT_BUCKET or key.startswith(VARIANT_PREFIX):
+            counts['skipped'] += 1
+            continue
+        try:
+            variants = process_object(bucket, key)
+        except (UnidentifiedImageError, Image.DecompressionBombError, ValueError) as e:
+            print(f'Skipping {key}: {e}')
+            counts['skipped'] += 1
+            continue
+        except Exception:
+            traceback.print_exc()
+            counts['failed'] += 1
+            continue
+        if variants is None:
+            counts['skipped'] += 1
+            continue
+        region = entry.get('awsRegion') or config.REGION
+        counts['posts_updated'] += record(bucket, key, region, variants)
+        counts['processed'] += 1
+    print(counts)
+    return counts
+
+
+def s3_event(bucket: str, key: str) -> dict:
+    return {'Records': [{
+        'eventSource': 'aws:s3', 'eventName': 'ObjectCreated:Put', 'awsRegion': 'us-east-1',
+        's3': {'bucket': {'name': bucket}, 'object': {'key': key}}
+    }]}
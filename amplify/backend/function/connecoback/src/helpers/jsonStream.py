@@ -0,0 +1,52 @@
+import json
+from typing import Iterator, Optional
+
+
+class JSONItemStream:
+    """Incrementally splits streamed JSON text into complete items.
+
+    Emits each object of a top-level array as soon as its closing brace
+    arrives; a top-level object is emitted whole once it closes. Text
+    outside the JSON value (code fences, prose) is ignored. An item that
+    closes but doesn't parse is emitted as None, so callers can count it
+    as rejected and keep going.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.item_depth = None
+        self.buffer: list[str] = []
+
+    def feed(self, text: str) -> Iterator[Optional[dict]]:
+        for char in text:
+            if self.item_depth is not None:
+                self.buffer.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = self.depth > 0
+            elif char in '[{':
+                self.depth += 1
+                if char == '{' and self.item_depth is None and self.depth <= 2:
+                    self.item_depth = self.depth
+                    self.buffer = [char]
+            elif char in ']}':
+                if self.depth == self.item_depth and char == '}':
+                    item = ''.join(self.buffer)
+                    self.item_depth, self.buffer = None, []
+                    try:
+                        parsed = json.loads(item)
+                    except ValueError:
+                        parsed = None
+                    yield parsed
+                self.depth = max(self.depth - 1, 0)
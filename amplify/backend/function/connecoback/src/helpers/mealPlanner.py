@@ -0,0 +1,92 @@
+import os
+import traceback
+import contextvars
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from models.meal import Preferences
+from helpers.recipeParser import parse_recipes
+from helpers.recipesGenerator import Generator
+
+PLAN_CONCURRENCY = int(os.getenv('PLAN_CONCURRENCY', '4'))
+PLAN_RETRIES = int(os.getenv('PLAN_RETRIES', '2'))
+# Each slice is one model call; more than this can't finish inside the
+# function's 25 s timeout at PLAN_CONCURRENCY
+MAX_PLAN_SLICES = int(os.getenv('MAX_PLAN_SLICES', '12'))
+
+
+def recipe_identity(recipe: dict) -> str:
+    return ' '.join(str(recipe.get('title', '')).lower().split())
+
+
+class MealPlanner:
+    """Generates a multi-day plan as one concurrent request per (day, meal type)."""
+
+    def __init__(self, prefs: Preferences, concurrency: int = PLAN_CONCURRENCY, retries: int = PLAN_RETRIES) -> None:
+        self.prefs = prefs
+        self.concurrency = max(concurrency, 1)
+        self.retries = retries
+
+    def slice_count(self) -> int:
+        return max(self.prefs.duration, 1) * max(len(self.prefs.mealTypes or []), 1)
+
+    def slices(self) -> list[tuple[int, str]]:
+        meal_types = self.prefs.mealTypes or ['any meal']
+        return [(day, meal_type)
+                for day in range(1, max(self.prefs.duration, 1) + 1)
+                for meal_type in meal_types]
+
+    def generate_slice(self, day: int, meal_type: str, use_cache: bool = True) -> list[dict]:
+        prefs = dataclasses.replace(
+            self.prefs, duration=1, mealTypes=[meal_type])
+        focus = f"Only {meal_type} recipes for day {day} of a {self.prefs.duration} day plan."
+        recipes, _ = parse_recipes(Generator(prefs, focus=focus).generate_recipes(use_cache))
+        if not recipes:
+            raise ValueError('No valid recipes generated')
+        return [recipe.to_dict() for recipe in recipes]
+
+    def run_slice(self, plan_slice: tuple[int, str]) -> dict:
+        day, meal_type = plan_slice
+        error = None
+        # Failures only retry this slice; the rest of the plan stands. Retries
+        # go to the model, since the cache would hand back the same answer.
+        for attempt in range(self.retries + 1):
+            try:
+                recipes = self.generate_slice(day, meal_type, use_cache=attempt == 0)
+                return {'day': day, 'meal_type': meal_type, 'recipes': recipes}
+            except Exception as e:
+                traceback.print_exc()
+                error = str(e)
+        return {'day': day, 'meal_type': meal_type, 'recipes': [], 'error': error}
+
+    def plan(self) -> dict:
+        slices = self.slices()
+        workers = min(self.concurrency, len(slices))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each worker gets a copy of the request context so its model and
+            # Mongo calls are still attributed to this request's metrics
+            futures = [pool.submit(contextvars.copy_context().run, self.run_slice, plan_slice)
+                       for plan_slice in slices]
+            results = [future.result() for future in futures]
+
+        days: dict[int, dict] = {}
+        failed, seen, duplicates = [], set(), 0
+        for result in results:
+            meals = days.setdefault(result['day'], {})
+            if 'error' in result:
+                failed.append({'day': result['day'], 'meal_type': result['meal_type'],
+                               'error': result['error']})
+            unique = []
+            for recipe in result['recipes']:
+                identity = recipe_identity(recipe)
+                if identity in seen:
+                    duplicates += 1
+                    continue
+                seen.add(identity)
+                unique.append(recipe)
+            meals[result['meal_type']] = unique
+
+        return {
+            'days': [{'day': day, 'meals': meals} for day, meals in sorted(days.items())],
+            'failed': failed,
+            'duplicates_removed': duplicates
+        }
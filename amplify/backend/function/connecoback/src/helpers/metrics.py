@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import time
+import random
+import threading
+import contextvars
+from contextlib import contextmanager
+
+METRICS_NAMESPACE = os.getenv('METRICS_NAMESPACE', 'Conneco')
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+# Share of invocations whose event summary is logged; 0 turns it off
+EVENT_LOG_SAMPLE_RATE = float(os.getenv('EVENT_LOG_SAMPLE_RATE', '0.01'))
+REDACTED_HEADERS = {'authorization', 'cookie', 'x-api-key'}
+
+METRICS = [
+    ('Latency', 'Milliseconds'),
+    ('ColdStart', 'Count'),
+    ('ImportTime', 'Milliseconds'),
+    ('MongoCommands', 'Count'),
+    ('MongoTime', 'Milliseconds'),
+    ('LLMCalls', 'Count'),
+    ('LLMTime', 'Milliseconds'),
+    ('LLMBytes', 'Bytes'),
+    ('ResponseBytes', 'Bytes'),
+    ('ConditionalRequests', 'Count'),
+    ('NotModified', 'Count'),
+    ('RecipesRejected', 'Count'),
+    ('StreamErrors', 'Count')
+]
+
+_cold_start = True
+_current: contextvars.ContextVar = contextvars.ContextVar(
+    'request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self, cold_start: bool = False, invoked: bool = False) -> None:
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        # Set when the Lambda handler owns the request and emits after awsgi
+        self.invoked = invoked
+        self.route = None
+        self.method = None
+        self.status = None
+        self.values = {name: 0 for name, _ in METRICS}
+        self.values['ColdStart'] = int(cold_start)
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.values[name] += value
+
+    def finish(self) -> dict:
+        self.values['Latency'] = (time.perf_counter() - self.started) * 1000
+        return {name: round(value, 3) for name, value in self.values.items()}
+
+
+def begin(invoked: bool = False) -> RequestMetrics:
+    global _cold_start
+    metrics = RequestMetrics(cold_start=_cold_start, invoked=invoked)
+    _cold_start = False
+    _current.set(metrics)
+    return metrics
+
+
+def current() -> RequestMetrics | None:
+    return _current.get()
+
+
+def end() -> None:
+    _current.set(None)
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add to one of METRICS for the current request, if there is one."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add(name, value)
+
+
+def record_response(response) -> None:
+    """Called from after_request, once the route and final body are known."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    from flask import request
+    metrics.route = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.method = request.method
+    metrics.status = response.status_code
+    # Streamed bodies have no length until they are consumed
+    if not response.is_streamed:
+        metrics.values['ResponseBytes'] = response.calculate_content_length() or 0
+
+
+@contextmanager
+def llm_call():
+    """Time one model call; the body records the response size via the yielded list."""
+    started = time.perf_counter()
+    sizes = []
+    try:
+        yield sizes
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.add('LLMCalls')
+            metrics.add('LLMTime', (time.perf_counter() - started) * 1000)
+            metrics.add('LLMBytes', sum(sizes))
+
+
+def emf_record(metrics: RequestMetrics) -> dict:
+    values = metrics.finish()
+    return {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Route'], ['Route', 'Method']],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, unit in METRICS]
+            }]
+        },
+        'Route': metrics.route or 'unmatched',
+        'Method': metrics.method or '',
+        'StatusCode': metrics.status,
+        **values
+    }
+
+
+def emit(metrics: RequestMetrics | None = None) -> dict | None:
+    metrics = metrics or _current.get()
+    if metrics is None or not METRICS_ENABLED:
+        return None
+    record = emf_record(metrics)
+    # One line per request; the Lambda log agent extracts EMF from stdout
+    sys.stdout.write(json.dumps(record, separators=(',', ':')) + '\n')
+    return record
+
+
+def summarize_event(event: dict) -> dict:
+    """What the old full event dump was used for, without tokens or bodies."""
+    context = event.get('requestContext') or {}
+    http = context.get('http') or {}
+    headers = event.get('headers') or {}
+    return {
+        'requestId': context.get('requestId'),
+        'method': event.get('httpMethod') or http.get('method'),
+        'path': event.get('path') or event.get('rawPath'),
+        'query': sorted((event.get('queryStringParameters') or {}).keys()),
+        'headers': {key: '[redacted]' if key.lower() in REDACTED_HEADERS else value
+                    for key, value in headers.items()},
+        'bodyBytes': len(event.get('body') or ''),
+        'base64': bool(event.get('isBase64Encoded'))
+    }
+
+
+def log_event(event: dict) -> None:
+    if EVENT_LOG_SAMPLE_RATE and random.random() < EVENT_LOG_SAMPLE_RATE:
+        print(json.dumps({'event': summarize_event(event)}, default=str))
@@ -0,0 +1,49 @@
+import base64
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId, json_util
+
+# What a cursor's sort value may be; anything else, e.g. an operator dict,
+# would be spliced into the keyset query
+CURSOR_VALUE_TYPES = (str, int, float, datetime, type(None))
+
+
+def encode_cursor(doc: dict, sort_field: str, sort_order: int) -> str:
+    """Opaque token pointing just past `doc` in (sort_field, _id) order."""
+    payload = json_util.dumps({
+        'f': sort_field,
+        'o': sort_order,
+        'v': doc.get(sort_field),
+        'id': doc['_id']
+    })
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(token: str, sort_fields: set) -> Optional[dict]:
+    """The cursor in `token`, or None when it is malformed or tampered with."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor = json_util.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        return None
+    if not isinstance(cursor, dict) or set(cursor) != {'f', 'o', 'v', 'id'}:
+        return None
+    if cursor['f'] not in sort_fields or type(cursor['o']) is not int or cursor['o'] not in (1, -1):
+        return None
+    if not isinstance(cursor['v'], CURSOR_VALUE_TYPES) or not isinstance(cursor['id'], ObjectId):
+        return None
+    return cursor
+
+
+def seek_query(query: dict, cursor: dict) -> dict:
+    """Restrict `query` to documents after `cursor` in (field, _id) order."""
+    op = '$lt' if cursor['o'] == -1 else '$gt'
+    field, value = cursor['f'], cursor['v']
+    return {'$and': [query, {'$or': [
+        {field: {op: value}},
+        {field: value, '_id': {op: cursor['id']}}
+    ]}]}
+
+
+def seek_sort(sort_field: str, sort_order: int) -> list:
+    return [(sort_field, sort_order), ('_id', sort_order)]
@@ -0,0 +1,62 @@
+import os
+import math
+import time
+from passlib.context import CryptContext
+
+# Hashes from any of these schemes still verify; anything that doesn't match
+# the current scheme and rounds is rehashed on the next successful login.
+PASSWORD_SCHEME = os.getenv('PASSWORD_SCHEME', 'pbkdf2_sha256')
+PASSWORD_ROUNDS = int(os.getenv('PASSWORD_ROUNDS', '0'))
+KNOWN_SCHEMES = ['pbkdf2_sha256', 'pbkdf2_sha512', 'bcrypt', 'argon2']
+# Schemes whose rounds are a log2 cost rather than an iteration count
+LOG_ROUNDS_SCHEMES = {'bcrypt'}
+
+
+def build_context(scheme: str = PASSWORD_SCHEME, rounds: int = PASSWORD_ROUNDS) -> CryptContext:
+    options = {}
+    if rounds:
+        # Pin rounds exactly, so both stronger and weaker hashes are updated
+        for option in ('default_rounds', 'min_rounds', 'max_rounds'):
+            options[f'{scheme}__{option}'] = rounds
+    schemes = [scheme] + [name for name in KNOWN_SCHEMES if name != scheme]
+    return CryptContext(schemes=schemes, default=scheme, deprecated='auto', **options)
+
+
+PASSWORDS = build_context()
+
+
+def hash_password(password: str) -> str:
+    return PASSWORDS.hash(password)
+
+
+def verify_password(password: str, stored_hash: str) -> tuple[bool, str | None]:
+    """Whether `password` matches, and a replacement hash when the stored one
+    predates the current policy."""
+    return PASSWORDS.verify_and_update(password, stored_hash)
+
+
+def verify_time_ms(context: CryptContext, samples: int = 5) -> float:
+    stored_hash = context.hash('calibration-password')
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify('calibration-password', stored_hash)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate(scheme: str, target_ms: float, probe_rounds: int = None) -> int:
+    """Largest rounds for `scheme` whose median verify time fits `target_ms`
+    on this machine. Run it on the Lambda's memory size, not a laptop."""
+    handler = build_context(scheme).handler(scheme)
+    rounds = probe_rounds or handler.default_rounds
+    elapsed = verify_time_ms(build_context(scheme, rounds))
+    if scheme in LOG_ROUNDS_SCHEMES:
+        rounds = rounds + math.floor(math.log2(target_ms / elapsed))
+    else:
+        rounds = int(rounds * target_ms / elapsed)
+    rounds = max(min(rounds, handler.max_rounds), handler.min_rounds)
+
+    while rounds > handler.min_rounds and verify_time_ms(build_context(scheme, rounds)) > target_ms:
+        rounds = rounds - 1 if scheme in LOG_ROUNDS_SCHEMES else int(rounds * 0.9)
+    return rounds
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import traceback
+from typing import Callable, Optional
+from models.meal import Preferences
+from db.client import get_collection
+from helpers.cache import Cache, LRUCache, MongoCache
+
+# Entries are served as-is while fresh, served and refreshed in the background
+# while stale, and regenerated inline once past the stale window.
+RECIPE_CACHE_TTL = int(os.getenv('RECIPE_CACHE_TTL', str(24 * 3600)))
+RECIPE_CACHE_STALE = int(os.getenv('RECIPE_CACHE_STALE', str(7 * 24 * 3600)))
+RECIPE_CACHE_SIZE = int(os.getenv('RECIPE_CACHE_SIZE', '256'))
+# `mongo` shares entries across containers; `memory` keeps everything local
+RECIPE_CACHE_STORE = os.getenv('RECIPE_CACHE_STORE', 'mongo')
+
+_memory = LRUCache(max_size=RECIPE_CACHE_SIZE)
+_store: Cache = None
+_lock = threading.Lock()
+_refreshing: set[str] = set()
+_counts = {
+    'memory_hits': 0,
+    'store_hits': 0,
+    'stale_hits': 0,
+    'misses': 0,
+    'refreshes': 0,
+    'refresh_failures': 0,
+    'rejected': 0
+}
+
+
+def get_store() -> Cache:
+    global _store
+    if _store is None and RECIPE_CACHE_STORE == 'memory':
+        _store = LRUCache(max_size=RECIPE_CACHE_SIZE)
+    elif _store is None:
+        _store = MongoCache(get_collection('nutridb', 'recipe_cache'),
+                            ttl=RECIPE_CACHE_TTL + RECIPE_CACHE_STALE)
+    return _store
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return ' '.join(value.lower().split())
+    if isinstance(value, (list, tuple, set)):
+        return sorted({_normalize(item) for item in value if item is not None}, key=str)
+    return value
+
+
+def cache_key(prefs: Preferences, version: str) -> str:
+    """Hash of the normalized preferences, so reordered lists or different
+    casing share an entry; `version` covers the prompt and model."""
+    normalized = {name: _normalize(value)
+                  for name, value in sorted(prefs.__dict__.items())}
+    payload = json.dumps({'v': version, 'p': normalized},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _incr(key: str) -> None:
+    with _lock:
+        _counts[key] += 1
+
+
+def _lookup(key: str) -> tuple[Optional[dict], str]:
+    entry = _memory.get(key)
+    if entry is not None:
+        return entry, 'memory_hits'
+    entry = get_store().get(key)
+    if entry is not None:
+        _memory.set(key, entry)
+    return entry, 'store_hits'
+
+
+def _usable(recipes: Optional[str]) -> bool:
+    """Only output that yields a recipe is cached; a malformed or truncated
+    completion would otherwise be served for the whole stale window."""
+    # Imported here: recipeParser imports recipesGenerator, which imports us
+    from helpers.recipeParser import parse_recipes
+    if not recipes:
+        return False
+    if not parse_recipes(recipes)[0]:
+        _incr('rejected')
+        return False
+    return True
+
+
+def _save(key: str, recipes: str) -> dict:
+    entry = {'recipes': recipes, 'created_at': time.time()}
+    _memory.set(key, entry)
+    get_store().set(key, entry)
+    return entry
+
+
+def _refresh(key: str, generate: Callable[[], Optional[str]]) -> None:
+    try:
+        recipes = generate()
+        if _usable(recipes):
+            _save(key, recipes)
+            _incr('refreshes')
+        else:
+            _incr('refresh_failures')
+    except Exception:
+        _incr('refresh_failures')
+        traceback.print_exc()
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def _refresh_in_background(key: str, generate: Callable[[], Optional[str]]) -> None:
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    # Lambda freezes the container after the response, so the refresh may
+    # only finish on the next warm invocation; the stale entry covers it.
+    threading.Thread(target=_refresh, args=(key, generate), daemon=True).start()
+
+
+def get_or_generate(prefs: Preferences, version: str, generate: Callable[[], Optional[str]]) -> Optional[str]:
+    key = cache_key(prefs, version)
+    entry, tier = _lookup(key)
+    if entry is not None:
+        age = time.time() - entry['created_at']
+        if age < RECIPE_CACHE_TTL:
+            _incr(tier)
+            return entry['recipes']
+        if age < RECIPE_CACHE_TTL + RECIPE_CACHE_STALE:
+            _incr(tier)
+            _incr('stale_hits')
+            _refresh_in_background(key, generate)
+            return entry['recipes']
+
+    _incr('misses')
+    recipes = generate()
+    if _usable(recipes):
+        _save(key, recipes)
+    return recipes
+
+
+def peek(prefs: Preferences, version: str) -> Optional[str]:
+    """Cached recipes within the stale window, without regenerating."""
+    key = cache_key(prefs, version)
+    entry, tier = _lookup(key)
+    if entry is not None and time.time() - entry['created_at'] < RECIPE_CACHE_TTL + RECIPE_CACHE_STALE:
+        _incr(tier)
+        return entry['recipes']
+    _incr('misses')
+    return None
+
+
+def put(prefs: Preferences, version: str, recipes: Optional[str]) -> None:
+    if _usable(recipes):
+        _save(cache_key(prefs, version), recipes)
+
+
+def stats() -> dict:
+    with _lock:
+        counts = dict(_counts)
+    hits = counts['memory_hits'] + counts['store_hits']
+    lookups = hits + counts['misses']
+    counts['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+    return counts
@@ -0,0 +1,95 @@
+import re
+import json
+from models.meal import Recipe
+from helpers.jsonStream import JSONItemStream
+from helpers.recipesGenerator import RECIPES_SCHEMA
+
+try:
+    import orjson
+
+    def loads(text: str):
+        return orjson.loads(text)
+except ImportError:
+    loads = json.loads
+
+JSON_TYPES = {
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+    'array': list,
+    'object': dict
+}
+FENCE = re.compile(r'^\s*```[a-zA-Z]*\s*|\s*```\s*$')
+TRAILING_COMMA = re.compile(r',\s*([\]}])')
+
+
+def validate(value, schema: dict, path: str = '$') -> list[str]:
+    """Errors for `value` against the subset of JSON Schema RECIPES_SCHEMA uses."""
+    expected = JSON_TYPES.get(schema.get('type'))
+    if expected and (not isinstance(value, expected) or (expected is int and isinstance(value, bool))):
+        return [f"{path}: expected {schema['type']}"]
+
+    errors = []
+    if isinstance(value, dict):
+        for name in schema.get('required', []):
+            if name not in value:
+                errors.append(f"{path}.{name}: required")
+        for name, sub_schema in schema.get('properties', {}).items():
+            if value.get(name) is not None:
+                errors += validate(value[name], sub_schema, f"{path}.{name}")
+    elif isinstance(value, list) and 'items' in schema:
+        for index, item in enumerate(value):
+            errors += validate(item, schema['items'], f"{path}[{index}]")
+    return errors
+
+
+def repair(text: str) -> str:
+    """Best-effort fix for the usual LLM slips: code fences, prose around the
+    JSON and trailing commas."""
+    text = FENCE.sub('', text.strip())
+    starts = [i for i in (text.find('['), text.find('{')) if i != -1]
+    if starts:
+        text = text[min(starts):]
+    end = max(text.rfind(']'), text.rfind('}'))
+    if end != -1:
+        text = text[:end + 1]
+    return TRAILING_COMMA.sub(r'\1', text)
+
+
+def _decode(text: str) -> list:
+    for candidate in (text, repair(text)):
+        try:
+            data = loads(candidate)
+            break
+        except ValueError:
+            continue
+    else:
+        # Truncated output: keep every recipe that closed before the cut
+        return list(JSONItemStream().feed(repair(text)))
+
+    if isinstance(data, dict):
+        data = data.get('recipes', [data])
+    return data if isinstance(data, list) else []
+
+
+def to_recipe(item) -> Recipe | None:
+    if isinstance(item, dict) and isinstance(item.get('ingredients'), list):
+        # Older prompts asked for plain ingredient strings
+        item['ingredients'] = [{'name': ingredient} if isinstance(ingredient, str) else ingredient
+                               for ingredient in item['ingredients']]
+    if validate(item, RECIPES_SCHEMA['items']):
+        return None
+    return Recipe.from_dict(item)
+
+
+def parse_recipes(text: str) -> tuple[list[Recipe], int]:
+    """Typed recipes from raw model output, plus how many were rejected."""
+    recipes, rejected = [], 0
+    for item in _decode(text or ''):
+        recipe = to_recipe(item)
+        if recipe is None:
+            rejected += 1
+        else:
+            recipes.append(recipe)
+    return recipes, rejected
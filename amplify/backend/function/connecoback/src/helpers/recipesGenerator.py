@@ -1,122 +1,144 @@
+import os
+from typing import Iterator
 from models.meal import Preferences
+import helpers.metrics as metrics
+import helpers.recipeCache as recipe_cache
+from helpers.stubClient import StubOSSClient
 from shared.helpers.openai import OSS_Client
 from shared.models.constants import nutribot_system_prompt
 
+RECIPE_MODEL = "meituan/longcat-flash-chat:free"
+# Bump whenever the prompt or response format changes to retire cached recipes
+PROMPT_VERSION = 2
+# `stub` serves the offline sample recipes, `live` calls the model
+OSS_CLIENT = os.getenv('OSS_CLIENT', 'stub')
+
+RECIPES_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": "The title of the recipe"},
+            "description": {"type": "string", "description": "A short summary of the dish"},
+            "ingredients": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string", "description": "The ingredient"},
+                        "quantity": {"type": "string", "description": "How much of it to use"}
+                    },
+                    "required": ["name"]
+                },
+                "description": "A list of ingredients needed for the recipe",
+            },
+            "cook_time": {"type": "string", "description": "The total cook time"},
+            "instructions": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Step-by-step instructions for preparing the recipe",
+            },
+            "servings": {"type": "integer", "description": "The number of servings the recipe makes"},
+            "nutritional_info": {
+                "type": "object",
+                "properties": {
+                    "calories": {"type": "integer", "description": "The number of calories per serving"},
+                    "protein": {"type": "integer", "description": "The amount of protein per serving (in grams)"},
+                    "fat": {"type": "integer", "description": "The amount of fat per serving (in grams)"},
+                    "carbohydrates": {"type": "integer", "description": "The amount of carbohydrates per serving (in grams)"}
+                }
+            },
+            "meal_type": {"type": "string", "description": "The type of meal (e.g., breakfast, lunch, dinner, snack)"},
+            "cuisine": {"type": "string", "description": "The cuisine type (e.g., Italian, Chinese, Mexican)"},
+            "dietary_considerations": {"type": "array", "items": {"type": "string"}, "description": "Any dietary considerations (e.g., vegan, gluten-free)"}
+        },
+        "required": ["title", "ingredients", "instructions"]
+    }
+}
+
 
 class Generator:
-    def __init__(self, prefs: Preferences):
+    def __init__(self, prefs: Preferences, focus: str = ''):
         self.prefs = prefs
-        self.oss_client = OSS_Client().client
+        # Narrows the prompt to one slice of a meal plan, e.g. a single day
+        self.focus = focus
+        if OSS_CLIENT == 'live':
+            self.oss_client = OSS_Client().client
+        else:
+            self.oss_client = StubOSSClient().client
+
+    def generate_recipes(self, use_cache: bool = True) -> str | None:
+        if use_cache:
+            return recipe_cache.get_or_generate(self.prefs, self.version(), self.complete)
+        # Skips the lookup only; a usable result still replaces the entry
+        recipes = self.complete()
+        recipe_cache.put(self.prefs, self.version(), recipes)
+        return recipes
 
-    def generate_recipes(self) -> str | None:
+    def stream_recipes(self) -> Iterator[str]:
+        """Yield completion text as it arrives; cached recipes come whole."""
+        cached = recipe_cache.peek(self.prefs, self.version())
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.stream_completion():
+            chunks.append(chunk)
+            yield chunk
+        recipe_cache.put(self.prefs, self.version(), ''.join(chunks))
+
+    def version(self) -> str:
+        # The client kind keeps stub output from being served once live
+        return f'{OSS_CLIENT}:{RECIPE_MODEL}:{PROMPT_VERSION}:{self.focus}'
+
+    def messages(self) -> list:
         prefs = str(self.prefs.__dict__)
-        # completion = self.oss_client.chat.completions.create(
-        #     extra_body={},
-        #     model="meituan/longcat-flash-chat:free",
-        #     messages=[
-        #         {
-        #             "role": "system",
-        #             "content": nutribot_system_prompt,
-        #         },
-        #         {
-        #             "role": "user",
-        #             "content": "Generate 5 recipes based on these preferences: " + prefs,
-        #         }
-        #     ],
-        #     response_format={
-        #         "type": "json_schema",
-        #         "json_schema": {
-        #             "name": "recipes",
-        #             "schema": {
-        #                 "type": "array",
-        #                 "items": {
-        #                     "type": "object",
-        #                     "properties": {
-        #                         "title": {"type": "string", "description": "The title of the recipe"},
-        #                         "ingredients": {
-        #                             "type": "array",
-        #                             "items": {"type": "string"},
-        #                             "description": "A list of ingredients needed for the recipe",
-        #                         },
-        #                         "cook_time": {"type": "string", "description": "The total cook time"},
-        #                         "instructions": {
-        #                             "type": "array",
-        #                             "items": {"type": "string"},
-        #                             "description": "Step-by-step instructions for preparing the recipe",
-        #                         },
-        #                         "servings": {"type": "integer", "description": "The number of servings the recipe makes"},
-        #                         "nutritional_info": {
-        #                             "type": "object",
-        #                             "properties": {
-        #                                 "calories": {"type": "integer", "description": "The number of calories per serving"},
-        #                                 "protein": {"type": "integer", "description": "The amount of protein per serving (in grams)"},
-        #                                 "fat": {"type": "integer", "description": "The amount of fat per serving (in grams)"},
-        #                                 "carbohydrates": {"type": "integer", "description": "The amount of carbohydrates per serving (in grams)"}
-        #                             }
-        #                         },
-        #                         "meal_type": {"type": "string", "description": "The type of meal (e.g., breakfast, lunch, dinner, snack)"},
-        #                         "cuisine": {"type": "string", "description": "The cuisine type (e.g., Italian, Chinese, Mexican)"},
-        #                         "dietary_considerations": {"type": "array", "items": {"type": "string"}, "description": "Any dietary considerations (e.g., vegan, gluten-free)"}
-        #                     }
-        #                 }
-        #             }
-        #         }
-        #     }
-        # )
-        # print(completion.choices[0].message.content)
-        # return completion.choices[0].message.content
-        return """
-{
-    "title": "Quick Vegan Chickpea Curry",
-    "description": "A simple and flavorful chickpea curry perfect for a quick weeknight meal. It's packed with protein and vegetables, and naturally vegan and dairy-free.",
-    "ingredients": [
-        {
-            "name": "Chickpeas",
-            "quantity": "1 (15-ounce) can"
-        },
-        {
-            "name": "Diced Tomatoes",
-            "quantity": "1 (14.5-ounce) can"
-        },
-        {
-            "name": "Coconut Milk",
-            "quantity": "1/2 cup"
-        },
-        {
-            "name": "Onion",
-            "quantity": "1 medium, chopped"
-        },
-        {
-            "name": "Garlic",
-            "quantity": "2 cloves, minced"
-        },
-        {
-            "name": "Ginger",
-            "quantity": "1 tsp, grated"
-        },
-        {
-            "name": "Curry Powder",
-            "quantity": "1 tbsp"
-        },
-        {
-            "name": "Spinach",
-            "quantity": "5 oz"
-        }
-    ],
-    "instructions": [
-        "Heat a tablespoon of oil in a large pan over medium heat.",
-        "Add the chopped onion and cook until softened, about 5 minutes.",
-        "Add the minced garlic and grated ginger and cook for another minute.",
-        "Stir in the curry powder and cook for 30 seconds.",
-        "Add the diced tomatoes and chickpeas and bring to a simmer.",
-        "Pour in the coconut milk and stir to combine.",
-        "Let the curry simmer for 10-15 minutes to allow the flavors to meld.",
-        "Stir in the spinach and cook until wilted, about 2-3 minutes.",
-        "Season with salt and pepper to taste.",
-        "Serve hot with rice or naan bread."
-    ]
-}
-        """
+        prompt = "Generate 5 recipes based on these preferences: " + prefs
+        if self.focus:
+            prompt += ". " + self.focus
+        return [
+            {
+                "role": "system",
+                "content": nutribot_system_prompt,
+            },
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
+
+    def complete(self) -> str | None:
+        with metrics.llm_call() as sizes:
+            completion = self.oss_client.chat.completions.create(
+                extra_body={},
+                model=RECIPE_MODEL,
+                messages=self.messages(),
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "recipes",
+                        "schema": RECIPES_SCHEMA
+                    }
+                }
+            )
+            content = completion.choices[0].message.content
+            sizes.append(len(content or ''))
+        return content
+
+    def stream_completion(self) -> Iterator[str]:
+        # Timed until the last chunk, so this includes time spent writing them out
+        with metrics.llm_call() as sizes:
+            stream = self.oss_client.chat.completions.create(
+                extra_body={},
+                model=RECIPE_MODEL,
+                messages=self.messages(),
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    sizes.append(len(chunk.choices[0].delta.content))
+                    yield chunk.choices[0].delta.content
 
 
 if __name__ == "__main__":
@@ -125,6 +147,7 @@ if __name__ == "__main__":
         dietaryRestrictions=["vegetarian", "gluten-free"],
         duration=7,
         goal="weight loss",
+        groceries=[],
         mealTypes=["breakfast", "lunch", "dinner"],
         servings=2,
         skillLevel="beginner"
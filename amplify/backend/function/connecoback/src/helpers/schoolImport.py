@@ -0,0 +1,88 @@
+import io
+import csv
+import json
+import time
+from typing import IO, Iterator
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+# Only the first few row errors are returned; the rest are just counted
+MAX_REPORTED_ERRORS = 100
+
+
+def read_csv(stream: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items()
+                                if key and value not in (None, '')}
+
+
+def read_ndjson(stream: IO[bytes]) -> Iterator[tuple[int, dict]]:
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig')
+    for line_num, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = e
+        yield line_num, row
+
+
+class SchoolImport:
+    """Upserts a stream of school rows in fixed-size batches.
+
+    Memory stays bounded by one batch plus the capped error list, however
+    large the upload is.
+    """
+
+    def __init__(self, pool, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.pool = pool
+        self.batch_size = min(max(batch_size, 1), MAX_BATCH_SIZE)
+        self.counts = {'rows': 0, 'created': 0, 'updated': 0, 'failed': 0}
+        self.errors: list[dict] = []
+
+    def fail(self, line: int, error: str) -> None:
+        self.counts['failed'] += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': error})
+
+    def write_batch(self, batch: list[tuple[int, dict]]) -> None:
+        # One borrowed connection per batch
+        with self.pool.borrow() as db:
+            for line, row in batch:
+                try:
+                    school_id = row.get('id')
+                    if school_id:
+                        db.update_school(school_id, **row)
+                        self.counts['updated'] += 1
+                    else:
+                        db.create_school(**row)
+                        self.counts['created'] += 1
+                except Exception as e:
+                    self.fail(line, str(e))
+
+    def run(self, rows: Iterator[tuple[int, dict]]) -> dict:
+        start = time.perf_counter()
+        batch = []
+        for line, row in rows:
+            self.counts['rows'] += 1
+            if not isinstance(row, dict):
+                self.fail(line, f'Invalid row: {row}')
+                continue
+            batch.append((line, row))
+            if len(batch) >= self.batch_size:
+                self.write_batch(batch)
+                batch = []
+        if batch:
+            self.write_batch(batch)
+
+        elapsed = time.perf_counter() - start
+        return {
+            **self.counts,
+            'errors': self.errors,
+            'batch_size': self.batch_size,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': round(self.counts['rows'] / elapsed, 1) if elapsed else None
+        }
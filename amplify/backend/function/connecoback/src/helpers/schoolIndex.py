@@ -0,0 +1,93 @@
+import os
+import re
+import time
+import bisect
+import hashlib
+import threading
+import unicodedata
+from typing import Callable, Optional
+from helpers.encoder import dumps
+
+# Other containers pick up writes after this many seconds
+SCHOOL_INDEX_TTL = int(os.getenv('SCHOOL_INDEX_TTL', '300'))
+NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(name: str) -> str:
+    name = unicodedata.normalize('NFKD', name or '')
+    name = name.encode('ascii', 'ignore').decode().lower()
+    return NON_WORD.sub(' ', name).strip()
+
+
+class SchoolIndex:
+    """Sorted-array prefix index over school names.
+
+    Every word start of a normalized name is a key, so "high" finds
+    "Springfield High School". Lookups are a bisect plus a short scan.
+    """
+
+    def __init__(self, loader: Callable[[], list[dict]], ttl: int = SCHOOL_INDEX_TTL) -> None:
+        self.loader = loader
+        self.ttl = ttl
+        self.version = 0
+        self._lock = threading.Lock()
+        self._loaded_version = None
+        self._loaded_at = 0.0
+        # (keys, rows, schools, digest), replaced whole so a search running
+        # alongside a rebuild never pairs new keys with old rows
+        self._snapshot: tuple[list[str], list[int], list[dict], str] = ([], [], [], '')
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the loaded rows, identical across containers."""
+        return self._snapshot[3]
+
+    def invalidate(self) -> None:
+        """Called after a write; the next search rebuilds the index."""
+        with self._lock:
+            self.version += 1
+
+    def _stale(self) -> bool:
+        return (self._loaded_version != self.version
+                or time.monotonic() - self._loaded_at > self.ttl)
+
+    def build(self, schools: list[dict]) -> None:
+        entries = []
+        for row, school in enumerate(schools):
+            words = normalize(school.get('name')).split()
+            for start in range(len(words)):
+                entries.append((' '.join(words[start:]), row))
+        entries.sort()
+        keys = [key for key, _ in entries]
+        rows = [row for _, row in entries]
+        digest = hashlib.blake2b(dumps(schools), digest_size=12).hexdigest()
+        self._snapshot = (keys, rows, schools, digest)
+
+    def ensure_loaded(self) -> None:
+        if not self._stale():
+            return
+        with self._lock:
+            if not self._stale():
+                return
+            version = self.version
+            self.build(self.loader())
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def search(self, prefix: str, limit: Optional[int] = None, offset: int = 0) -> list[dict]:
+        """Schools with a word starting with `prefix`; every match when `limit` is None."""
+        self.ensure_loaded()
+        prefix = normalize(prefix)
+        keys, rows, schools, _ = self._snapshot
+        matches, seen = [], set()
+        index = bisect.bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix):
+            row = rows[index]
+            if row not in seen:
+                seen.add(row)
+                if len(seen) > offset:
+                    matches.append(schools[row])
+                    if limit is not None and len(matches) >= limit:
+                        break
+            index += 1
+        return matches
@@ -0,0 +1,111 @@
+import os
+import copy
+import json
+import time
+import hashlib
+from types import SimpleNamespace
+from typing import Iterator
+
+# Per-completion latency in ms, spread across tokens when streaming
+STUB_LLM_LATENCY_MS = float(os.getenv('STUB_LLM_LATENCY_MS', '0'))
+
+SAMPLE_RECIPE = json.loads("""
+{
+    "title": "Quick Vegan Chickpea Curry",
+    "description": "A simple and flavorful chickpea curry perfect for a quick weeknight meal. It's packed with protein and vegetables, and naturally vegan and dairy-free.",
+    "ingredients": [
+        {
+            "name": "Chickpeas",
+            "quantity": "1 (15-ounce) can"
+        },
+        {
+            "name": "Diced Tomatoes",
+            "quantity": "1 (14.5-ounce) can"
+        },
+        {
+            "name": "Coconut Milk",
+            "quantity": "1/2 cup"
+        },
+        {
+            "name": "Onion",
+            "quantity": "1 medium, chopped"
+        },
+        {
+            "name": "Garlic",
+            "quantity": "2 cloves, minced"
+        },
+        {
+            "name": "Ginger",
+            "quantity": "1 tsp, grated"
+        },
+        {
+            "name": "Curry Powder",
+            "quantity": "1 tbsp"
+        },
+        {
+            "name": "Spinach",
+            "quantity": "5 oz"
+        }
+    ],
+    "instructions": [
+        "Heat a tablespoon of oil in a large pan over medium heat.",
+        "Add the chopped onion and cook until softened, about 5 minutes.",
+        "Add the minced garlic and grated ginger and cook for another minute.",
+        "Stir in the curry powder and cook for 30 seconds.",
+        "Add the diced tomatoes and chickpeas and bring to a simmer.",
+        "Pour in the coconut milk and stir to combine.",
+        "Let the curry simmer for 10-15 minutes to allow the flavors to meld.",
+        "Stir in the spinach and cook until wilted, about 2-3 minutes.",
+        "Season with salt and pepper to taste.",
+        "Serve hot with rice or naan bread."
+    ]
+}
+""")
+
+SAMPLE_TITLES = [
+    "Quick Vegan Chickpea Curry",
+    "Spinach and Chickpea Stew",
+    "Coconut Tomato Dal",
+    "Ginger Garlic Chickpea Bowl",
+    "Weeknight Vegetable Curry",
+    "Curried Spinach Rice"
+]
+
+
+class StubCompletions:
+    def __init__(self, latency_ms: float) -> None:
+        self.latency_ms = latency_ms
+
+    def content(self, messages: list) -> str:
+        # Deterministic per prompt, so cache keys and dedup behave repeatably
+        prompt = json.dumps(messages, sort_keys=True)
+        digest = int(hashlib.sha256(prompt.encode()).hexdigest(), 16)
+        recipe = copy.deepcopy(SAMPLE_RECIPE)
+        recipe['title'] = SAMPLE_TITLES[digest % len(SAMPLE_TITLES)]
+        return json.dumps([recipe], indent=4)
+
+    def create(self, messages: list, stream: bool = False, **kwargs):
+        content = self.content(messages)
+        if stream:
+            return self.stream(content)
+        time.sleep(self.latency_ms / 1000)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def stream(self, content: str) -> Iterator[SimpleNamespace]:
+        tokens = [content[i:i + 8] for i in range(0, len(content), 8)]
+        delay = self.latency_ms / 1000 / max(len(tokens), 1)
+        for token in tokens:
+            time.sleep(delay)
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class StubOSSClient:
+    """Offline stand-in for OSS_Client with a fixed, configurable latency."""
+
+    def __init__(self, latency_ms: float = None) -> None:
+        latency_ms = STUB_LLM_LATENCY_MS if latency_ms is None else latency_ms
+        completions = StubCompletions(latency_ms)
+        self.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=completions))
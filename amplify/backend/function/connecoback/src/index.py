@@ -1,14 +1,19 @@
 
+import os
 from shared.uniservices.after_request import Handler
 from shared.configs import CONFIG as config
+from helpers.lazyResource import lazy_resource
 from flask_jwt_extended import JWTManager
-from nutri.services.controller import *
-from flask import Flask, Response
-from services.controller import *
+from flask import Flask, Response, make_response
+from helpers.encoder import dumps
+from helpers.gatewayDispatch import dispatch, awsgi_response
+from helpers.compression import compress_response
+import helpers.metrics as metrics
 from flask_restful import Api
 from flask_cors import CORS
-import awsgi
 
+# Opt-in: serve API Gateway v1/v2 events without the awsgi WSGI round trip
+FAST_DISPATCH = os.getenv('FAST_DISPATCH', '0') == '1'
 
 app = Flask(__name__)
 app.config['JWT_SECRET_KEY'] = config.JWT_SECRET_KEY
@@ -20,33 +25,82 @@ JWTManager(app)
 CORS(app, supports_credentials=True)
 
 
+# Resources are imported on first dispatch to keep cold starts small
 # Auth Routes
-api.add_resource(AuthLoginService, '/con/login')
-api.add_resource(AuthSignupService, '/con/signup')
-api.add_resource(AuthRefreshService, '/con/refresh')
+api.add_resource(lazy_resource('services.src.auth:AuthLoginService', ['POST']), '/con/login')
+api.add_resource(lazy_resource('services.src.auth:AuthSignupService', ['POST']), '/con/signup')
+api.add_resource(lazy_resource('services.src.auth:AuthRefreshService', ['POST']), '/con/refresh')
 
 # Posts Routes
-api.add_resource(PostCreateService, '/con/create')
-api.add_resource(PostUserPostsService, '/con/posts')
-api.add_resource(UploadService, '/con/upload')
+api.add_resource(lazy_resource('services.src.posts:PostCreateService', ['POST']), '/con/create')
+# API Gateway only proxies single-segment /con/{con} paths
+api.add_resource(lazy_resource('services.src.posts:PostBulkCreateService', ['POST']), '/con/bulkposts')
+api.add_resource(lazy_resource('services.src.posts:PostUserPostsService', ['GET']), '/con/posts')
+api.add_resource(lazy_resource('services.src.upload:UploadService', ['POST']), '/con/upload')
 
 # Schools Routes
-api.add_resource(SchoolsService, '/con/schools')
+api.add_resource(lazy_resource('services.src.schools:SchoolsService', ['GET', 'POST']), '/con/schools')
+api.add_resource(lazy_resource('services.src.schools:SchoolImportService', ['POST']), '/con/schoolimport')
 
 # Nutri Routes
-api.add_resource(Meals, '/con/nmeals')
-api.add_resource(UserService, '/con/nuser')
-api.add_resource(UserLoginService, '/con/nlogin')
+api.add_resource(lazy_resource('services.src.meals:Meals', ['POST']), '/con/nmeals')
+api.add_resource(lazy_resource('nutri.services.src.user:UserService', ['POST']), '/con/nuser')
+api.add_resource(lazy_resource('nutri.services.src.user:UserLoginService', ['POST']), '/con/nlogin')
+
+
+@api.representation('application/json')
+def output_json(data, code: int, headers: dict = None) -> Response:
+    response = make_response(dumps(data), code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
+
+
+@app.before_request
+def start_request_metrics() -> None:
+    # Under app.run there is no Lambda handler to open the request
+    if metrics.current() is None:
+        metrics.begin()
 
 
 @app.after_request
 def handle_after_request(response: Response) -> Response:
-    return Handler(response).handle_after_request()
+    response = Handler(response).handle_after_request()
+    # Compressed last, so the metrics see the bytes actually sent
+    response = compress_response(response)
+    metrics.record_response(response)
+    request_metrics = metrics.current()
+    if request_metrics is not None and not request_metrics.invoked:
+        if response.is_streamed:
+            # The body, and the model call behind it, runs after this hook
+            response.call_on_close(lambda: finish_request_metrics(request_metrics))
+        else:
+            finish_request_metrics(request_metrics)
+    return response
+
+
+def finish_request_metrics(request_metrics) -> None:
+    metrics.emit(request_metrics)
+    metrics.end()
 
 
 def handler(event, context) -> dict:
-    print(event)
-    return awsgi.response(app, event, context)
+    request_metrics = metrics.begin(invoked=True)
+    metrics.log_event(event)
+    try:
+        if event.get('Records') and event['Records'][0].get('eventSource') == 'aws:s3':
+            # Uploaded originals; Pillow is only imported for these events
+            from helpers.imageVariants import handle_s3_event
+            request_metrics.route = 'aws:s3'
+            return handle_s3_event(event)
+        if FAST_DISPATCH:
+            response = dispatch(app, event, context)
+            if response is not None:
+                return response
+        return awsgi_response(app, event, context)
+    finally:
+        metrics.emit(request_metrics)
+        metrics.end()
 
 
 if __name__ == '__main__':
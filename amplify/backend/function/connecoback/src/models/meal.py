@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from typing import Optional
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -11,3 +12,90 @@ class Preferences:
     skillLevel: str
     cookingTime: str
     dietaryRestrictions: list
+
+
+@dataclass(slots=True)
+class Ingredient:
+    name: str
+    quantity: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data) -> 'Ingredient':
+        if isinstance(data, str):
+            return cls(name=data)
+        return cls(name=data['name'], quantity=data.get('quantity'))
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'quantity': self.quantity}
+
+
+@dataclass(slots=True)
+class NutritionInfo:
+    calories: Optional[int] = None
+    protein: Optional[int] = None
+    fat: Optional[int] = None
+    carbohydrates: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'NutritionInfo':
+        return cls(
+            calories=data.get('calories'),
+            protein=data.get('protein'),
+            fat=data.get('fat'),
+            carbohydrates=data.get('carbohydrates')
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'calories': self.calories,
+            'protein': self.protein,
+            'fat': self.fat,
+            'carbohydrates': self.carbohydrates
+        }
+
+
+@dataclass(slots=True)
+class Recipe:
+    title: str
+    ingredients: list[Ingredient] = field(default_factory=list)
+    instructions: list[str] = field(default_factory=list)
+    description: Optional[str] = None
+    cook_time: Optional[str] = None
+    servings: Optional[int] = None
+    nutritional_info: Optional[NutritionInfo] = None
+    meal_type: Optional[str] = None
+    cuisine: Optional[str] = None
+    dietary_considerations: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Recipe':
+        nutrition = data.get('nutritional_info')
+        return cls(
+            title=data['title'],
+            ingredients=[Ingredient.from_dict(item)
+                         for item in data.get('ingredients') or []],
+            instructions=list(data.get('instructions') or []),
+            description=data.get('description'),
+            cook_time=data.get('cook_time'),
+            servings=data.get('servings'),
+            nutritional_info=NutritionInfo.from_dict(
+                nutrition) if nutrition else None,
+            meal_type=data.get('meal_type'),
+            cuisine=data.get('cuisine'),
+            dietary_considerations=list(
+                data.get('dietary_considerations') or [])
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'title': self.title,
+            'description': self.description,
+            'ingredients': [item.to_dict() for item in self.ingredients],
+            'instructions': self.instructions,
+            'cook_time': self.cook_time,
+            'servings': self.servings,
+            'nutritional_info': self.nutritional_info.to_dict() if self.nutritional_info else None,
+            'meal_type': self.meal_type,
+            'cuisine': self.cuisine,
+            'dietary_considerations': self.dietary_considerations
+        }
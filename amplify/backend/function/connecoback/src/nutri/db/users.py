@@ -1,9 +1,5 @@
 from pymongo.collection import Collection
-from shared.db.base import Database
+from db.client import get_collection
 
 def get_user_collection() -> Collection:
-    client = Database().client
-
-    db = client['nutridb']
-    users_collection = db["users"]
-    return users_collection
\ No newline at end of file
+    return get_collection('nutridb', 'users')
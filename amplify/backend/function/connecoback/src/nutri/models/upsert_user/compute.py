@@ -1,9 +1,10 @@
 import dataclasses
 from bson import ObjectId
 from datetime import datetime
-from typing import Union, Tuple
-from passlib.hash import pbkdf2_sha256
+from pymongo import ReturnDocument
 from shared.models.common import Common
+from pymongo.errors import DuplicateKeyError
+from helpers.passwords import hash_password
 from nutri.db.users import get_user_collection
 from nutri.models.interfaces import User as Input, Output
 from flask_jwt_extended import create_access_token, create_refresh_token
@@ -25,80 +26,67 @@ class Compute:
             query['_id'] = ObjectId(self.input._id)
         return query
 
-    def defaults(self, user_data: dict) -> dict:
-        user_data.pop('_id', None)
-        return user_data
-
     def pop_immutable_fields(self, user_data: dict) -> dict:
-        fields = ['createdDate']
+        fields = ['_id', 'createdDate', 'password']
         for field in fields:
             user_data.pop(field, None)
         return user_data
 
-    def prep_data(self, user_data: dict, prev_user: dict = None) -> dict:
-        if prev_user:
-            user_data = self.pop_immutable_fields(user_data)
-            user_data = Common.merge_dicts(user_data, prev_user)
-        else:
-            user_data = self.defaults(user_data)
-
-        date_fields = ['createdDate']
-        for field in date_fields:
-            if user_data.get(field) and not isinstance(user_data[field], datetime):
-                user_data[field] = Common.string_to_date(user_data, field)
-
-        object_fields = ['_id']
-        for field in object_fields:
-            if user_data.get(field) and not isinstance(user_data[field], ObjectId):
-                user_data[field] = ObjectId(user_data[field])
+    def prep_update(self, user_data: dict, new_id: ObjectId) -> dict:
+        created_date = user_data.get('createdDate')
+        if created_date and not isinstance(created_date, datetime):
+            created_date = Common.string_to_date(user_data, 'createdDate')
 
+        set_fields = Common.filter_none_values(
+            self.pop_immutable_fields(user_data))
         if self.input.password:
-            hashed_pass = pbkdf2_sha256.hash(self.input.password)
-            user_data['password'] = hashed_pass
-
-        user_data = Common.filter_none_values(user_data)
-        return user_data
-
-    def validate_phone(self) -> Union[dict, None]:
-        user = self.users_collection.find_one(self.query)
-        return user if user else None
-
-    def update_user(self, user_data: dict, prev_user: dict) -> str:
-        self.users_collection.update_one(self.query, {'$set': user_data})
-
-        return 'Successfully updated user'
-
-    def insert_user(self, user_data: dict) -> Tuple[str, dict]:
-        user_data['_id'] = self.users_collection.insert_one(
-            user_data).inserted_id
-
-        message = 'Successfully created user'
-        return message, user_data
+            set_fields['password'] = hash_password(self.input.password)
+
+        set_on_insert = {'createdDate': created_date or datetime.now()}
+        if '_id' not in self.query:
+            set_on_insert['_id'] = new_id
+
+        return {'$set': set_fields, '$setOnInsert': set_on_insert}
+
+    def upsert_user(self, update: dict, upsert: bool) -> dict:
+        try:
+            return self.users_collection.find_one_and_update(
+                self.query, update, upsert=upsert,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # A concurrent upsert for the same phone/email inserted first
+            return self.users_collection.find_one_and_update(
+                self.query, update, return_document=ReturnDocument.AFTER
+            )
 
     def compute(self) -> Output:
-        user = self.input
-        user_data = dataclasses.asdict(user)
-        prev_user = self.validate_phone()
-        if not prev_user:
-            if not self.input.password or self.input.password.strip() == "":
-                return Output(msg="Password is required")
-
-        user_data = self.prep_data(user_data, prev_user)
-        if prev_user:
-            message = self.update_user(user_data, prev_user)
+        user_data = dataclasses.asdict(self.input)
+        new_id = ObjectId()
+        update = self.prep_update(user_data, new_id)
+
+        # Only a request carrying a password may create the user
+        has_password = bool(
+            self.input.password and self.input.password.strip())
+        upsert = has_password and '_id' not in self.query
+        user = self.upsert_user(update, upsert)
+        if not user:
+            return Output(msg="Password is required")
+
+        if user['_id'] == new_id:
+            message = 'Successfully created user'
         else:
-            message, user_data = self.insert_user(user_data)
+            message = 'Successfully updated user'
 
-        user_data = Common.jsonify(user_data)
-        access_token = create_access_token(identity=user_data['_id'])
-        refresh_token = create_refresh_token(identity=user_data['_id'])
+        access_token = create_access_token(identity=str(user['_id']))
+        refresh_token = create_refresh_token(identity=str(user['_id']))
 
-        user_data['tokens'] = {
+        user['tokens'] = {
             'access': access_token,
             'refresh': refresh_token
         }
 
         return Output(
             msg=message,
-            data=user_data
+            data=user
         )
@@ -1,6 +1,5 @@
 from typing import Union
-from passlib.hash import pbkdf2_sha256
-from shared.models.common import Common
+from helpers.passwords import verify_password
 from nutri.db.users import get_user_collection
 from shared.models.constants import OutputStatus
 from nutri.models.interfaces import LoginInput as Input, Output
@@ -25,6 +24,14 @@ class Compute:
         user = self.users_collection.find_one(self.query)
         return user if user else None
 
+    def rehash_password(self, user: dict, new_hash: str) -> None:
+        # Conditional on the old hash so a concurrent password change wins
+        self.users_collection.update_one(
+            {'_id': user['_id'], 'password': user['password']},
+            {'$set': {'password': new_hash}}
+        )
+        user['password'] = new_hash
+
     def compute(self) -> Output:
         user = self.validate_user()
         if not user:
@@ -33,22 +40,24 @@ class Compute:
                 status=OutputStatus.FAILURE
             )
 
-        if not pbkdf2_sha256.verify(self.input.password, user['password']):
+        valid, new_hash = verify_password(self.input.password, user['password'])
+        if not valid:
             return Output(
                 msg="Invalid credentials",
                 status=OutputStatus.FAILURE
             )
+        if new_hash:
+            self.rehash_password(user, new_hash)
 
-        user_data = Common.jsonify(user)
-        access_token = create_access_token(identity=user['_id'])
-        refresh_token = create_refresh_token(identity=user['_id'])
+        access_token = create_access_token(identity=str(user['_id']))
+        refresh_token = create_refresh_token(identity=str(user['_id']))
 
-        user_data['tokens'] = {
+        user['tokens'] = {
             'access': access_token,
             'refresh': refresh_token
         }
 
         return Output(
             msg="Login successful",
-            data=Common.jsonify(user_data)
+            data=user
         )
@@ -1,5 +1,4 @@
 import json
-import dataclasses
 from flask import request
 from flask_restful import Resource
 from nutri.models.user_login.main import UserLogin
@@ -13,8 +12,9 @@ class UserService(Resource):
         input = json.loads(request.get_data())
         input = User(**input)
         output = UpsertUser(input).process()
-        output = dataclasses.asdict(output)
-    
+        # Shallow on purpose; the Api's encoder handles ObjectId/datetime
+        output = vars(output)
+
         return output
 
 
@@ -24,6 +24,6 @@ class UserLoginService(Resource):
         input = json.loads(request.get_data())
         input = LoginInput(**input)
         output = UserLogin(input).process()
-        output = dataclasses.asdict(output)
+        output = vars(output)
 
         return output
@@ -2,11 +2,28 @@ import traceback
 from flask import request
 from models.auth import Output
 from flask_restful import Resource
-from shared.models.common import Common
-from shared.db.users import get_user_by_password, create_user, get_user_by_id
+from pymongo.errors import DuplicateKeyError
+from helpers.identity import current_user, user_claims
+from shared.db.users import get_user_by_password, create_user
+from db.users import (get_user_by_credential, set_credential_key, reserve_credential,
+                      release_credential, confirm_credential, CREDENTIAL_LEGACY_LOOKUP)
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token, create_refresh_token
 
 
+def find_user_by_password(password: str) -> dict:
+    user = get_user_by_credential(password)
+    if user or not CREDENTIAL_LEGACY_LOOKUP:
+        return user
+
+    user = get_user_by_password(password)
+    if user:
+        try:
+            set_credential_key(user['_id'], password)
+        except DuplicateKeyError:
+            pass
+    return user
+
+
 class AuthLoginService(Resource):
     def post(self):
         """User login endpoint."""
@@ -17,14 +34,16 @@ class AuthLoginService(Resource):
             if not password:
                 return {'success': False, 'error': 'Password is required'}, 400
 
-            user = get_user_by_password(password)
-            user = Common.jsonify(user)
+            user = find_user_by_password(password)
 
             if not user:
                 return {'success': False, 'error': 'Invalid credentials'}, 401
 
-            access_token = create_access_token(identity=user['_id'])
-            refresh_token = create_refresh_token(identity=user['_id'])
+            claims = user_claims(user)
+            access_token = create_access_token(
+                identity=str(user['_id']), additional_claims=claims)
+            refresh_token = create_refresh_token(
+                identity=str(user['_id']), additional_claims=claims)
 
             return Output(**{
                 'success': True,
@@ -57,13 +76,27 @@ class AuthSignupService(Resource):
             name = data.get('name')
             password = data.get('password')
 
-            if not name or not password or get_user_by_password(password):
+            if not name or not password or find_user_by_password(password):
                 return {'success': False, 'error': 'Name and password are required'}, 400
 
-            user = create_user(name, password)
-
-            access_token = create_access_token(identity=str(user['_id']))
-            refresh_token = create_refresh_token(identity=str(user['_id']))
+            # Reserved before the user exists, so a concurrent signup with the
+            # same password fails here instead of leaving a second user behind
+            try:
+                key = reserve_credential(password)
+            except DuplicateKeyError:
+                return {'success': False, 'error': 'Name and password are required'}, 400
+            try:
+                user = create_user(name, password)
+            except Exception:
+                release_credential(key)
+                raise
+            confirm_credential(key, user['_id'])
+
+            claims = user_claims(user)
+            access_token = create_access_token(
+                identity=str(user['_id']), additional_claims=claims)
+            refresh_token = create_refresh_token(
+                identity=str(user['_id']), additional_claims=claims)
 
             value = Output(**{
                 'data': {
@@ -91,13 +124,16 @@ class AuthRefreshService(Resource):
         """Refresh access token."""
         try:
             current_user_id = get_jwt_identity()
-            user = get_user_by_id(current_user_id)
+            # Refresh re-reads the profile (through the short-lived cache)
+            # so a new partner link reaches the claims within one access TTL
+            user = current_user(use_claims=False)
 
             if not user:
                 return {'success': False, 'error': 'User not found'}, 404
 
             # Create new access token
-            access_token = create_access_token(identity=current_user_id)
+            access_token = create_access_token(
+                identity=current_user_id, additional_claims=user_claims(user))
 
             return Output(**{
                 'success': True,
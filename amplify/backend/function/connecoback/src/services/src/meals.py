@@ -1,13 +1,14 @@
-from flask import request
-from pprint import pprint
-from bson import ObjectId
+import json
+from flask import request, Response, stream_with_context
 from models.auth import Output
 from flask_restful import Resource
-from shared.models.common import Common
-from datetime import datetime, timedelta
 import traceback
 from models.meal import Preferences
+from helpers.mealPlanner import MealPlanner, MAX_PLAN_SLICES
+from helpers.jsonStream import JSONItemStream
+from helpers.recipeParser import parse_recipes, to_recipe
 from helpers.recipesGenerator import Generator
+import helpers.metrics as metrics
 
 
 class Meals(Resource):
@@ -16,12 +17,34 @@ class Meals(Resource):
             data = request.get_json()
             prefs = Preferences(**data['preferences'])
             generator = Generator(prefs)
-            recipe = generator.generate_recipes()
-            pprint(recipe)
+            if request.args.get('plan') == '1':
+                planner = MealPlanner(prefs)
+                if planner.slice_count() > MAX_PLAN_SLICES:
+                    return Output(**{
+                        'success': False,
+                        'error': f'A plan is limited to {MAX_PLAN_SLICES} day and meal type combinations'
+                    }).to_dict(), 400
+                return Output(**{
+                    'success': True,
+                    'data': planner.plan()
+                }).to_dict(), 200
+            if request.args.get('stream') == '1':
+                return Response(
+                    stream_with_context(self.stream(generator)),
+                    mimetype='application/x-ndjson'
+                )
+
+            recipes, rejected = parse_recipes(generator.generate_recipes())
+            metrics.count('RecipesRejected', rejected)
+            if not recipes:
+                return Output(**{
+                    'success': False,
+                    'error': 'Could not generate recipes'
+                }).to_dict(), 502
 
             return Output(**{
                 'success': True,
-                'data': recipe
+                'data': [recipe.to_dict() for recipe in recipes]
             }).to_dict(), 200
 
         except Exception as e:
@@ -30,3 +53,19 @@ class Meals(Resource):
                 'success': False,
                 'error': str(e)
             }).to_dict(), 500
+
+    def stream(self, generator: Generator):
+        """One JSON line per recipe, flushed as soon as its object closes."""
+        parser = JSONItemStream()
+        try:
+            for chunk in generator.stream_recipes():
+                for item in parser.feed(chunk):
+                    recipe = to_recipe(item)
+                    if recipe is None:
+                        metrics.count('RecipesRejected')
+                        continue
+                    yield json.dumps({'success': True, 'data': recipe.to_dict()}) + '\n'
+        except Exception as e:
+            traceback.print_exc()
+            metrics.count('StreamErrors')
+            yield json.dumps({'success': False, 'error': str(e)}) + '\n'
@@ -3,9 +3,46 @@ from bson import ObjectId
 from models.auth import Output
 from flask_restful import Resource
 from shared.models.common import Common
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timedelta
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from shared.db.users import get_posts_collection, get_user_by_id
+from helpers.identity import current_user
+from db.images import attach_variants
+from helpers.fields import parse_fields, projection
+from helpers.conditional import make_etag, body_etag, is_fresh, not_modified, etag_headers
+from shared.db.users import get_posts_collection
+import helpers.feedCache as feed_cache
+from helpers.pagination import encode_cursor, decode_cursor, seek_query, seek_sort
+
+DEFAULT_PAGE_SIZE = 20
+MAX_BULK_POSTS = 100
+# What `fields=` may select on a feed page
+POST_FIELDS = {'_id', 'date', 'type', 'content', 'caption', 'image_url',
+               'image_variants', 'user_name', 'user_id', 'created_at', 'updated_at'}
+# What `sort=` and cursors may order a feed page by
+SORT_FIELDS = {'date', 'type', 'user_name', 'created_at', 'updated_at'}
+
+
+def build_post(data: dict, user: dict, current_user_id: str, now) -> tuple:
+    post_type = data.get('type')
+    ist_dt = datetime.strptime(data.get('date'), "%Y-%m-%d")
+    utc_dt = ist_dt - timedelta(hours=5, minutes=30)
+
+    if not post_type:
+        return None, 'Post type is required'
+
+    post_data = {
+        'date': utc_dt,
+        'type': post_type,
+        'content': data.get('content'),
+        'caption': data.get('caption'),
+        'image_url': data.get('image_url'),
+        'user_name': user['name'],
+        'user_id': ObjectId(current_user_id),
+        'created_at': now,
+        'updated_at': now
+    }
+    return post_data, None
 
 
 class PostCreateService(Resource):
@@ -14,48 +51,26 @@ class PostCreateService(Resource):
         """Create a new post."""
         try:
             current_user_id = get_jwt_identity()
-            user = get_user_by_id(current_user_id)
+            user = current_user()
 
             if not user:
                 return {'success': False, 'error': 'User not found'}, 404
 
             data = request.get_json()
-            post_type = data.get('type')
-            content = data.get('content')
-            caption = data.get('caption')
-            image_url = data.get('image_url')
-            date = data.get('date')
-            ist_dt = datetime.strptime(date, "%Y-%m-%d")
-            utc_dt = ist_dt - timedelta(hours=5, minutes=30)
-            date = utc_dt
-
-            if not post_type:
-                return {'success': False, 'error': 'Post type is required'}, 400
-
-            post_data = {
-                'date': date,
-                'type': post_type,
-                'content': content,
-                'caption': caption,
-                'image_url': image_url,
-                'user_name': user['name'],
-                'user_id': ObjectId(current_user_id),
-                'created_at': Common.get_current_utc_time(),
-                'updated_at': Common.get_current_utc_time()
-            }
-
-            # Insert post
-            posts_collection = get_posts_collection()
-            result = posts_collection.insert_one(post_data)
-            created_post = posts_collection.find_one(
-                {'_id': result.inserted_id})
+            post_data, error = build_post(
+                data, user, current_user_id, Common.get_current_utc_time())
+            if error:
+                return {'success': False, 'error': error}, 400
 
-            # Format response
-            post_response = Common.jsonify(created_post)
+            attach_variants([post_data])
+            # Insert post; insert_one sets _id on post_data, so no read-back
+            posts_collection = get_posts_collection()
+            posts_collection.insert_one(post_data)
+            feed_cache.invalidate(current_user_id, user.get('partner'))
 
             return Output(**{
                 'success': True,
-                'data': post_response
+                'data': post_data
             }).to_dict(), 201
 
         except Exception as e:
@@ -65,16 +80,83 @@ class PostCreateService(Resource):
             }).to_dict(), 500
 
 
+class PostBulkCreateService(Resource):
+    @jwt_required()
+    def post(self):
+        """Create several posts with a single write."""
+        try:
+            current_user_id = get_jwt_identity()
+            user = current_user()
+
+            if not user:
+                return {'success': False, 'error': 'User not found'}, 404
+
+            data = request.get_json()
+            items = data.get('posts') if isinstance(data, dict) else data
+            if not isinstance(items, list) or not items:
+                return {'success': False, 'error': 'A list of posts is required'}, 400
+            if len(items) > MAX_BULK_POSTS:
+                return {'success': False, 'error': f'At most {MAX_BULK_POSTS} posts per request'}, 400
+
+            now = Common.get_current_utc_time()
+            results = [None] * len(items)
+            docs, positions = [], []
+            for index, item in enumerate(items):
+                try:
+                    post_data, error = build_post(
+                        item, user, current_user_id, now)
+                except (TypeError, ValueError, AttributeError) as e:
+                    post_data, error = None, f'Invalid post: {e}'
+                if error:
+                    results[index] = {'index': index,
+                                      'success': False, 'error': error}
+                    continue
+                docs.append(post_data)
+                positions.append(index)
+
+            if docs:
+                failed = {}
+                attach_variants(docs)
+                try:
+                    get_posts_collection().insert_many(docs, ordered=False)
+                except BulkWriteError as e:
+                    failed = {err['index']: err['errmsg']
+                              for err in e.details['writeErrors']}
+                feed_cache.invalidate(current_user_id, user.get('partner'))
+
+                for doc_index, (index, post_data) in enumerate(zip(positions, docs)):
+                    if doc_index in failed:
+                        results[index] = {
+                            'index': index, 'success': False, 'error': failed[doc_index]}
+                    else:
+                        results[index] = {
+                            'index': index, 'success': True, 'data': post_data}
+
+            created = sum(1 for result in results if result['success'])
+            return Output(**{
+                'success': created == len(items),
+                'data': {
+                    'results': results,
+                    'created': created,
+                    'failed': len(items) - created
+                }
+            }).to_dict(), 201 if created == len(items) else 207
+
+        except Exception as e:
+            return Output(**{
+                'success': False,
+                'error': str(e)
+            }).to_dict(), 500
+
+
 class PostUserPostsService(Resource):
     @jwt_required()
     def get(self):
         """Get posts by user ID."""
         try:
             current_user_id = get_jwt_identity()
-            user = get_user_by_id(current_user_id)
-            partner_id = None
-            if 'partner' in user:
-                partner_id = user['partner']
+            user = current_user()
+            partner_id = user['partner']
 
             posts_collection = get_posts_collection()
             query = {'$or': [
@@ -82,26 +164,108 @@ class PostUserPostsService(Resource):
                 {'user_id': ObjectId(partner_id)}
             ]}
             sort_field = request.args.get('sort', 'date')
+            if sort_field not in SORT_FIELDS:
+                return {'success': False, 'error': f'Unknown sort field: {sort_field}'}, 400
             sort_order = request.args.get('order', 'desc')
             sort_order = -1 if sort_order == 'desc' else 1
-            posts_cursor = posts_collection.find(query)
-            posts_cursor = posts_cursor.sort(sort_field, sort_order)
-            page = int(request.args['page'])
-            limit = int(request.args['size'])    
-            posts_cursor = Common.paginate_cursor(posts_cursor, page, limit)
-            posts = Common.jsonify(list(posts_cursor))
-            total = posts_collection.count_documents(query)
+            limit = int(request.args.get('size', DEFAULT_PAGE_SIZE))
+            fields, error = parse_fields(
+                request.args.get('fields'), POST_FIELDS)
+            if error:
+                return {'success': False, 'error': error}, 400
+
+            page, seek = None, None
+            if 'page' in request.args:
+                # Offset pagination for older clients
+                page = int(request.args['page'])
+                with_total = request.args.get('total', '1') == '1'
+            else:
+                if request.args.get('cursor'):
+                    seek = decode_cursor(request.args['cursor'], SORT_FIELDS)
+                    if not seek:
+                        return {'success': False, 'error': 'Invalid cursor'}, 400
+                    sort_field, sort_order = seek['f'], seek['o']
+                with_total = request.args.get('total', '0') == '1'
+
+            # Only the first few pages of a feed are cached, and only they
+            # get a version validator: the count/$max aggregate scans the
+            # whole feed, which costs more than a cursor page itself
+            variant = f'{sort_field}:{sort_order}:{limit}:{page}:{int(with_total)}:{",".join(fields or [])}'
+            cache_key, cached, etag = None, None, None
+            if not seek and (page is None or page <= feed_cache.FEED_CACHE_PAGES):
+                cache_key = feed_cache.page_key(
+                    current_user_id, partner_id, variant)
+                cached = feed_cache.get_page(cache_key)
+
+                if request.if_none_match or not cached or 'etag' not in cached:
+                    # Read before the page, so a write racing this request can
+                    # only leave the ETag older than the data, never newer
+                    etag = make_etag(
+                        feed_cache.couple_key(current_user_id, partner_id),
+                        self.feed_version(posts_collection, query), variant)
+                else:
+                    etag = cached['etag']
+                if is_fresh(etag):
+                    return not_modified(etag)
+                if cached and cached.get('etag') == etag:
+                    return Output(data=cached['data']).to_dict(), 200, etag_headers(etag)
+
+            # The sort key stays in the projection; cursors are built from it
+            fields_projection = projection(fields, '_id', sort_field)
+            if page is not None:
+                data = self.offset_page(
+                    posts_collection, query, sort_field, sort_order, page, limit, fields_projection)
+            else:
+                data = self.seek_page(
+                    posts_collection, query, sort_field, sort_order, seek, limit, fields_projection)
+            if with_total:
+                data['total'] = posts_collection.count_documents(query)
+
+            if cache_key:
+                feed_cache.set_page(cache_key, {'etag': etag, 'data': data})
+            else:
+                # Cursor and deep pages: a 304 saves the transfer, not the read
+                etag = body_etag(data)
+                if is_fresh(etag):
+                    return not_modified(etag)
             return Output(**{
-                'data': {
-                    'posts': posts,
-                    'total': total,
-                    'page': page,
-                    'limit': limit
-                }
-            }).to_dict(), 200
+                'data': data
+            }).to_dict(), 200, etag_headers(etag)
 
         except Exception as e:
             return Output(**{
                 'success': False,
                 'error': str(e)
             }).to_dict(), 500
+
+    def feed_version(self, posts_collection, query: dict) -> list:
+        """Post count and newest `updated_at` for the feed, read from the
+        user_updated_at index without fetching any post."""
+        result = list(posts_collection.aggregate([
+            {'$match': query},
+            {'$group': {'_id': None, 'count': {'$sum': 1},
+                        'updated_at': {'$max': '$updated_at'}}}
+        ]))
+        if not result:
+            return [0, None]
+        return [result[0]['count'], result[0]['updated_at']]
+
+    def offset_page(self, posts_collection, query: dict, sort_field: str, sort_order: int, page: int, limit: int, fields: dict = None) -> dict:
+        posts_cursor = posts_collection.find(query, fields)
+        posts_cursor = posts_cursor.sort(seek_sort(sort_field, sort_order))
+        posts_cursor = Common.paginate_cursor(posts_cursor, page, limit)
+        posts = list(posts_cursor)
+        return {'posts': posts, 'page': page, 'limit': limit}
+
+    def seek_page(self, posts_collection, query: dict, sort_field: str, sort_order: int, seek: dict, limit: int, fields: dict = None) -> dict:
+        page_query = seek_query(query, seek) if seek else query
+        posts_cursor = posts_collection.find(page_query, fields)
+        posts_cursor = posts_cursor.sort(
+            seek_sort(sort_field, sort_order)).limit(limit + 1)
+        posts = list(posts_cursor)
+
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_cursor(posts[-1], sort_field, sort_order)
+        return {'posts': posts, 'limit': limit, 'next_cursor': next_cursor}
@@ -1,24 +1,41 @@
+import os
 import traceback
 from flask import request
 from models.auth import Output
 from flask_restful import Resource
-from shared.db.schools import SchoolDatabase
+from db.schools import school_pool
+from helpers.fields import parse_fields, select
+from helpers.schoolIndex import SchoolIndex
+from helpers.conditional import make_etag, body_etag, is_fresh, not_modified, etag_headers
+from helpers.schoolImport import SchoolImport, read_csv, read_ndjson, DEFAULT_BATCH_SIZE
 
+# Query args that the in-process name index can answer on its own
+INDEX_ARGS = {'search_name', 'limit', 'offset'}
+# Columns `fields=` may select; the table lives in the shared schools DB
+SCHOOL_FIELDS = set(os.getenv('SCHOOL_FIELDS', 'id,name,city,board').split(','))
+
+
+def load_schools() -> list[dict]:
+    with school_pool.borrow() as db:
+        return db.get_schools()
 
-class SchoolsService(Resource):
-    def __init__(self):
-        self.db = SchoolDatabase()
 
+school_index = SchoolIndex(load_schools)
+
+
+class SchoolsService(Resource):
     def post(self):
         try:
             data = request.get_json()
             school_id = data.get("id")
-            if school_id:
-                # Update existing school
-                self.db.update_school(school_id, **data)
-            else:
-                # Create new school
-                self.db.create_school(**data)
+            with school_pool.borrow() as db:
+                if school_id:
+                    # Update existing school
+                    db.update_school(school_id, **data)
+                else:
+                    # Create new school
+                    db.create_school(**data)
+            school_index.invalidate()
             return Output(data="School created/updated successfully").to_dict(), 200
         except Exception as e:
             traceback.print_exc()
@@ -33,13 +50,73 @@ class SchoolsService(Resource):
             limit = request.args.get("limit", type=int)
             offset = request.args.get("offset", type=int)
             search_name = request.args.get("search_name")
-            schools = self.db.get_schools(
-                filters=filters if filters else None,
-                limit=limit,
-                offset=offset,
-                search_name=search_name
-            )
-            return Output(data=schools).to_dict(), 200
+            fields, error = parse_fields(filters.pop('fields', None), SCHOOL_FIELDS)
+            if error:
+                return {'success': False, 'error': error}, 400
+
+            if search_name and set(filters) <= INDEX_ARGS:
+                # The index's content hash versions every search it can answer
+                school_index.ensure_loaded()
+                etag = make_etag(school_index.digest, search_name, limit, offset, fields)
+                if is_fresh(etag):
+                    return not_modified(etag)
+                # No limit returns every match, as the SQL path always has
+                schools = school_index.search(
+                    search_name,
+                    limit=limit,
+                    offset=offset or 0
+                )
+                return Output(data=select(schools, fields)).to_dict(), 200, etag_headers(etag)
+
+            with school_pool.borrow() as db:
+                schools = db.get_schools(
+                    filters=filters if filters else None,
+                    limit=limit,
+                    offset=offset,
+                    search_name=search_name
+                )
+            # get_schools has no column list, so unselected columns are
+            # dropped here and only their serialization is saved
+            schools = select(schools, fields)
+            # MySQL has no cheap version to key on; a 304 still saves the transfer
+            etag = body_etag(schools)
+            if is_fresh(etag):
+                return not_modified(etag)
+            return Output(data=schools).to_dict(), 200, etag_headers(etag)
+        except Exception as e:
+            traceback.print_exc()
+            return Output(**{
+                'success': False,
+                'error': str(e)
+            }).to_dict(), 500
+
+
+class SchoolImportService(Resource):
+    def post(self):
+        """Bulk upsert schools from a CSV or NDJSON body."""
+        try:
+            content_type = request.mimetype
+            fmt = request.args.get('format')
+            if fmt == 'csv' or content_type == 'text/csv':
+                rows = read_csv(request.stream)
+            elif fmt == 'ndjson' or content_type in ('application/x-ndjson', 'application/jsonl'):
+                rows = read_ndjson(request.stream)
+            else:
+                return Output(**{
+                    'success': False,
+                    'error': 'Send text/csv or application/x-ndjson'
+                }).to_dict(), 415
+
+            batch_size = request.args.get(
+                'batch_size', DEFAULT_BATCH_SIZE, type=int)
+            result = SchoolImport(school_pool, batch_size).run(rows)
+            if result['created'] or result['updated']:
+                school_index.invalidate()
+
+            return Output(**{
+                'success': result['failed'] == 0,
+                'data': result
+            }).to_dict(), 200
         except Exception as e:
             traceback.print_exc()
             return Output(**{
@@ -0,0 +1,171 @@
+"""Offline stand-ins shared by every test.
+
+mongomock replaces the container's Mongo client and the user/post functions
+of shared.db.users are pointed at it, so no test touches a real service.
+
+    pip install pytest mongomock moto
+    python -m pytest -q tests
+"""
+import os
+import sys
+import json
+import time
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC)
+
+# Set before any app module reads its config
+for key, value in {
+    'OSS_CLIENT': 'stub',
+    'STUB_LLM_LATENCY_MS': '0',
+    'RECIPE_CACHE_STORE': 'memory',
+    'METRICS_ENABLED': '0',
+    'EVENT_LOG_SAMPLE_RATE': '0',
+    'CREDENTIAL_LOOKUP_SECRET': 'test-lookup-secret',
+    'AWS_ACCESS_KEY_ID': 'test',
+    'AWS_SECRET_ACCESS_KEY': 'test',
+    'AWS_DEFAULT_REGION': 'us-east-1'
+}.items():
+    os.environ.setdefault(key, value)
+
+
+def _install_shared_standins() -> None:
+    """Before any app module binds these names with `from ... import`."""
+    from bson import ObjectId
+    import db.client as client
+    import shared.db.users as shared_users
+
+    def get_user_collection():
+        return client.get_collection('conneco', 'users')
+
+    def get_user_by_id(user_id):
+        return get_user_collection().find_one({'_id': ObjectId(user_id)})
+
+    def get_user_by_password(password):
+        return get_user_collection().find_one({'password': password})
+
+    def create_user(name, password):
+        user = {'name': name, 'password': password, 'created_at': time.time()}
+        get_user_collection().insert_one(user)
+        return user
+
+    shared_users.get_user_collection = get_user_collection
+    shared_users.get_posts_collection = lambda: client.get_collection('conneco', 'posts')
+    shared_users.get_user_by_id = get_user_by_id
+    shared_users.get_user_by_password = get_user_by_password
+    shared_users.create_user = create_user
+
+
+_install_shared_standins()
+
+
+class FakeSchoolDatabase:
+    """In-memory stand-in for the MySQL-backed SchoolDatabase."""
+    rows: dict[int, dict] = {}
+    opened = 0
+
+    def __init__(self) -> None:
+        FakeSchoolDatabase.opened += 1
+
+    def get_schools(self, filters=None, limit=None, offset=None, search_name=None):
+        schools = list(self.rows.values())
+        if search_name:
+            schools = [s for s in schools if search_name.lower() in s['name'].lower()]
+        for key, value in (filters or {}).items():
+            if key not in ('limit', 'offset', 'search_name'):
+                schools = [s for s in schools if str(s.get(key)) == value]
+        start = offset or 0
+        return schools[start:start + limit] if limit else schools[start:]
+
+    def create_school(self, **data):
+        school_id = len(self.rows) + 1
+        self.rows[school_id] = {**data, 'id': school_id}
+
+    def update_school(self, school_id, **data):
+        self.rows.setdefault(int(school_id), {}).update(data)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def mongo(monkeypatch):
+    """A fresh mongomock client per test, installed as the container client."""
+    import mongomock
+    import db.client as client
+    import helpers.feedCache as feed_cache
+    mock = mongomock.MongoClient()
+    monkeypatch.setattr(client, '_client', mock)
+    monkeypatch.setattr(client, '_collections', {})
+    # Rebuilt on first use, over this test's client
+    monkeypatch.setattr(feed_cache, '_cache', None)
+    return mock
+
+
+@pytest.fixture
+def app():
+    from index import app
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def http(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def invoke():
+    """Runs one API Gateway (REST, v1) event through the Lambda handler."""
+    from index import handler
+
+    def run(method: str, path: str, body=None, query: dict = None, headers: dict = None) -> dict:
+        event = {
+            'httpMethod': method,
+            'path': path,
+            'headers': {'Host': 'localhost', 'Content-Type': 'application/json', **(headers or {})},
+            'queryStringParameters': query,
+            'body': json.dumps(body) if body is not None else None,
+            'isBase64Encoded': False,
+            'requestContext': {'requestId': 'test'}
+        }
+        response = handler(event, None)
+        response['statusCode'] = int(response['statusCode'])
+        return response
+    return run
+
+
+@pytest.fixture
+def couple(app):
+    """Two linked users and the auth headers of the first."""
+    from shared.db.users import create_user, get_user_collection
+    from helpers.identity import user_claims
+    from flask_jwt_extended import create_access_token
+
+    user, partner = create_user('alex', 'a-password'), create_user('sam', 's-password')
+    get_user_collection().update_one({'_id': user['_id']}, {'$set': {'partner': partner['_id']}})
+    get_user_collection().update_one({'_id': partner['_id']}, {'$set': {'partner': user['_id']}})
+    user['partner'], partner['partner'] = partner['_id'], user['_id']
+
+    def headers(who: dict) -> dict:
+        with app.app_context():
+            token = create_access_token(identity=str(who['_id']),
+                                        additional_claims=user_claims(who))
+        return {'Authorization': f'Bearer {token}'}
+    return {'user': user, 'partner': partner,
+            'headers': headers(user), 'partner_headers': headers(partner)}
+
+
+@pytest.fixture
+def schools(monkeypatch):
+    """Routes the school pool and name index to an empty FakeSchoolDatabase."""
+    from db.schools import school_pool
+    from services.src.schools import school_index
+    monkeypatch.setattr(FakeSchoolDatabase, 'rows', {})
+    monkeypatch.setattr(FakeSchoolDatabase, 'opened', 0)
+    monkeypatch.setattr(school_pool, 'factory', FakeSchoolDatabase)
+    monkeypatch.setattr(school_pool, '_idle', [])
+    school_index.invalidate()
+    yield FakeSchoolDatabase
+    school_index.invalidate()
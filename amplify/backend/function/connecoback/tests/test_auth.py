@@ -0,0 +1,73 @@
+import threading
+import pytest
+import shared.db.users as shared_users
+import services.src.auth as auth
+from db.users import get_credential_collection, password_lookup_key
+
+
+def test_signup_then_login_resolves_through_digest(http, monkeypatch):
+    response = http.post('/con/signup', json={'name': 'alex', 'password': 'p-1'})
+    assert response.status_code == 201
+
+    # The legacy password query must not be needed once the digest exists
+    monkeypatch.setattr(auth, 'get_user_by_password', pytest.fail)
+    response = http.post('/con/login', json={'password': 'p-1'})
+    assert response.status_code == 200
+    assert response.get_json()['data']['user']['name'] == 'alex'
+
+
+def test_legacy_user_is_stamped_on_first_login(http):
+    user = shared_users.create_user('sam', 'old-password')
+    assert http.post('/con/login', json={'password': 'old-password'}).status_code == 200
+
+    entry = get_credential_collection().find_one({'_id': password_lookup_key('old-password')})
+    assert entry['user_id'] == user['_id']
+
+
+def test_duplicate_password_signup_is_rejected(http):
+    assert http.post('/con/signup', json={'name': 'a', 'password': 'same'}).status_code == 201
+    assert http.post('/con/signup', json={'name': 'b', 'password': 'same'}).status_code == 400
+    assert shared_users.get_user_collection().count_documents({}) == 1
+
+
+def test_concurrent_signups_create_one_user(app, monkeypatch):
+    # Both requests pass the existence check before either creates its user
+    barrier = threading.Barrier(2)
+    real = auth.find_user_by_password
+
+    def find_then_wait(password):
+        user = real(password)
+        barrier.wait(timeout=5)
+        return user
+    monkeypatch.setattr(auth, 'find_user_by_password', find_then_wait)
+
+    codes = []
+
+    def signup(name):
+        codes.append(app.test_client().post(
+            '/con/signup', json={'name': name, 'password': 'raced'}).status_code)
+    threads = [threading.Thread(target=signup, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(codes) == [201, 400]
+    assert shared_users.get_user_collection().count_documents({}) == 1
+    entry = get_credential_collection().find_one({'_id': password_lookup_key('raced')})
+    assert 'expires_at' not in entry
+
+
+def test_failed_user_creation_releases_the_reservation(http, monkeypatch):
+    def broken(name, password):
+        raise RuntimeError('db down')
+    monkeypatch.setattr(auth, 'create_user', broken)
+
+    assert http.post('/con/signup', json={'name': 'a', 'password': 'p'}).status_code == 500
+    assert get_credential_collection().count_documents({}) == 0
+
+
+def test_lookup_secret_is_required(monkeypatch):
+    monkeypatch.setattr('db.users.CREDENTIAL_LOOKUP_SECRET', None)
+    with pytest.raises(RuntimeError):
+        password_lookup_key('p')
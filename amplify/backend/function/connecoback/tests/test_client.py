@@ -0,0 +1,73 @@
+import os
+import pytest
+import mongomock
+import db.client as client
+
+
+def test_one_client_across_1000_invocations(invoke, monkeypatch):
+    created = []
+
+    def create_client():
+        created.append(mongomock.MongoClient())
+        return created[-1]
+    monkeypatch.setattr(client, '_client', None)
+    monkeypatch.setattr(client, '_create_client', create_client)
+
+    handles = set()
+    for n in range(1000):
+        response = invoke('POST', '/con/nlogin', {'phone': f'{n:010d}', 'password': 'x'})
+        assert response['statusCode'] < 500
+        handles.add(id(client.get_collection('nutridb', 'users')))
+
+    assert len(created) == 1
+    assert len(handles) == 1
+
+
+@pytest.mark.skipif(not os.getenv('MONGODB_URI'), reason='needs a local mongod')
+def test_pool_connections_are_reused_against_mongod(invoke, monkeypatch):
+    monkeypatch.setattr(client, '_client', None)
+    before = client.get_pool_stats()
+    for n in range(1000):
+        invoke('POST', '/con/nlogin', {'phone': f'{n:010d}', 'password': 'x'})
+    after = client.get_pool_stats()
+
+    assert after['checkouts'] - before['checkouts'] >= 1000
+    assert after['created'] - before['created'] <= client.MONGO_MAX_POOL_SIZE
+
+
+class SharedDatabase:
+    """Stands in for shared.db.base.Database with its own untuned client."""
+    client = None
+
+
+def test_shared_client_is_rebuilt_with_the_pool_settings(monkeypatch):
+    from pymongo import MongoClient
+    shared = MongoClient('mongodb://user:pw@db.example:27017/conneco', connect=False,
+                         maxPoolSize=100, minPoolSize=0)
+    monkeypatch.setattr(SharedDatabase, 'client', shared)
+    monkeypatch.setattr(client, 'Database', SharedDatabase)
+    monkeypatch.setattr(client, 'MONGODB_URI', None)
+
+    built = client._create_client()
+    try:
+        pool = built.options.pool_options
+        assert built is not shared
+        assert (pool.max_pool_size, pool.min_pool_size) == (
+            client.MONGO_MAX_POOL_SIZE, client.MONGO_MIN_POOL_SIZE)
+        assert pool.max_idle_time_seconds * 1000 == client.MONGO_MAX_IDLE_TIME_MS
+        assert built._seeds == shared._seeds
+        assert client.CLIENT_SOURCE == 'shared'
+    finally:
+        built.close()
+        shared.close()
+
+
+def test_untunable_shared_client_is_reported(monkeypatch, capsys):
+    shared = mongomock.MongoClient()
+    monkeypatch.setattr(SharedDatabase, 'client', shared)
+    monkeypatch.setattr(client, 'Database', SharedDatabase)
+    monkeypatch.setattr(client, 'MONGODB_URI', None)
+
+    assert client._create_client() is shared
+    assert 'NOT applied' in capsys.readouterr().out
+    assert client.get_pool_stats()['source'] == 'shared-untuned'
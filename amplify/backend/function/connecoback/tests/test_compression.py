@@ -0,0 +1,56 @@
+import gzip
+import json
+import importlib
+import pytest
+import helpers.compression as compression
+
+
+@pytest.fixture
+def compressed(monkeypatch):
+    monkeypatch.setattr(compression, 'COMPRESSION_ENABLED', True)
+
+
+def large_body() -> dict:
+    return {'items': [{'name': f'item {i}', 'note': 'same words again'} for i in range(200)]}
+
+
+def test_large_json_is_gzipped(app, compressed):
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = compression.compress_response(app.response_class(
+            json.dumps(large_body()), mimetype='application/json'))
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert json.loads(gzip.decompress(response.get_data())) == large_body()
+
+
+@pytest.mark.parametrize('body, mimetype, accept', [
+    (json.dumps({'ok': True}), 'application/json', 'gzip'),
+    (json.dumps(large_body()), 'application/json', 'identity'),
+    (b'\xff' * 4096, 'image/jpeg', 'gzip')
+])
+def test_small_unaccepted_and_binary_bodies_are_left_alone(app, compressed, body, mimetype, accept):
+    with app.test_request_context(headers={'Accept-Encoding': accept}):
+        response = compression.compress_response(app.response_class(body, mimetype=mimetype))
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_strong_etag_is_weakened_when_encoded(app, compressed):
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = app.response_class(json.dumps(large_body()), mimetype='application/json')
+        response.set_etag('abc')
+        response = compression.compress_response(response)
+    assert response.get_etag() == ('abc', True)
+
+
+def test_disabled_by_default(app, monkeypatch):
+    # The REST API has no binary media types to decode a compressed body
+    monkeypatch.delenv('COMPRESSION_ENABLED', raising=False)
+    module = importlib.reload(compression)
+    try:
+        with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+            response = module.compress_response(app.response_class(
+                json.dumps(large_body()), mimetype='application/json'))
+        assert 'Content-Encoding' not in response.headers
+    finally:
+        importlib.reload(compression)
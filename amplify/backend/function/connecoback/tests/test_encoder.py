@@ -0,0 +1,50 @@
+import json
+import importlib
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import pytest
+from bson import ObjectId, Decimal128
+import helpers.encoder as encoder
+
+DOCUMENT = {
+    '_id': ObjectId('64b7f0c2a1b2c3d4e5f60718'),
+    'date': datetime(2024, 3, 1, 9, 30, 15, 250000),
+    'aware': datetime(2024, 3, 1, 9, 30, tzinfo=timezone.utc),
+    'day': date(2024, 3, 1),
+    'price': Decimal128('9.99'),
+    'ratio': Decimal('0.5'),
+    'tags': {'a'},
+    3: 'int key'
+}
+
+EXPECTED = {
+    '_id': '64b7f0c2a1b2c3d4e5f60718',
+    'date': '2024-03-01 09:30:15.250000',
+    'aware': '2024-03-01 09:30:00+00:00',
+    'day': '2024-03-01',
+    'price': '9.99',
+    'ratio': '0.5',
+    'tags': ['a'],
+    '3': 'int key'
+}
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def dumps(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+        yield encoder.dumps
+        return
+    monkeypatch.setitem(__import__('sys').modules, 'orjson', None)
+    yield importlib.reload(encoder).dumps
+    monkeypatch.undo()
+    importlib.reload(encoder)
+
+
+def test_documents_encode_like_the_old_jsonify(dumps):
+    assert json.loads(dumps(DOCUMENT)) == EXPECTED
+
+
+def test_datetimes_keep_str_format(dumps):
+    now = datetime.now()
+    assert json.loads(dumps({'at': now}))['at'] == str(now)
@@ -0,0 +1,63 @@
+import pytest
+import helpers.feedCache as feed_cache
+from helpers.cache import Cache, LRUCache, MongoCache
+
+
+def post(http, headers: dict, content: str):
+    response = http.post('/con/create', headers=headers,
+                         json={'type': 'note', 'date': '2025-01-01', 'content': content})
+    assert response.status_code == 201
+
+
+def contents(response) -> list:
+    return [p['content'] for p in response.get_json()['data']['posts']]
+
+
+def test_cache_base_is_abstract():
+    with pytest.raises(TypeError):
+        Cache()
+
+
+def test_defaults_to_the_shared_backend():
+    assert isinstance(feed_cache.get_cache(), MongoCache)
+
+
+def test_first_page_is_served_from_cache_until_a_write(http, couple):
+    post(http, couple['headers'], 'first')
+    before = feed_cache.stats()
+
+    assert contents(http.get('/con/posts', headers=couple['headers'])) == ['first']
+    assert contents(http.get('/con/posts', headers=couple['headers'])) == ['first']
+    after = feed_cache.stats()
+    assert after['hits'] - before['hits'] == 1
+    assert after['misses'] - before['misses'] == 1
+
+    # The partner's post invalidates the couple's feed, not just their own
+    post(http, couple['partner_headers'], 'second')
+    assert sorted(contents(http.get('/con/posts', headers=couple['headers']))) == ['first', 'second']
+
+
+def test_write_in_one_container_invalidates_another(http, couple, mongo):
+    # Two containers: separate backend objects over the same shared collection
+    collection = mongo['nutribot']['feed_cache']
+    reader, writer = MongoCache(collection, ttl=300), MongoCache(collection, ttl=300)
+
+    feed_cache.set_cache(reader)
+    post(http, couple['headers'], 'first')
+    assert contents(http.get('/con/posts', headers=couple['headers'])) == ['first']
+
+    feed_cache.set_cache(writer)
+    post(http, couple['partner_headers'], 'second')
+
+    feed_cache.set_cache(reader)
+    assert len(contents(http.get('/con/posts', headers=couple['headers']))) == 2
+
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1
+    assert cache.stats()['evictions'] == 1
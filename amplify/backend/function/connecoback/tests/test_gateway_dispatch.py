@@ -0,0 +1,63 @@
+import pytest
+from flask import Flask
+from flask_cors import CORS
+from flask_restful import Api, Resource
+from flask_jwt_extended import JWTManager, jwt_required, create_access_token
+from helpers.gatewayDispatch import dispatch
+
+awsgi = pytest.importorskip('awsgi')
+
+
+class Echo(Resource):
+    @jwt_required()
+    def post(self):
+        return {'success': True, 'data': {'items': list(range(50))}}, 200
+
+
+@pytest.fixture(scope='module')
+def echo_app():
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'x' * 32
+    JWTManager(app)
+    CORS(app, supports_credentials=True)
+    Api(app).add_resource(Echo, '/con/echo')
+    return app
+
+
+@pytest.fixture(scope='module')
+def headers(echo_app):
+    with echo_app.app_context():
+        token = create_access_token(identity='test')
+    return {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json',
+            'Origin': 'https://example.com', 'Host': 'localhost'}
+
+
+def v1_event(headers: dict) -> dict:
+    return {'httpMethod': 'POST', 'path': '/con/echo', 'headers': headers,
+            'queryStringParameters': None, 'body': '{"a": 1}', 'isBase64Encoded': False}
+
+
+def test_v1_matches_awsgi(echo_app, headers):
+    event = v1_event(headers)
+    expected, actual = awsgi.response(echo_app, event, None), dispatch(echo_app, event, None)
+
+    assert int(expected['statusCode']) == actual['statusCode'] == 200
+    assert expected['body'] == actual['body']
+    assert actual['headers'].get('Access-Control-Allow-Origin') == 'https://example.com'
+
+
+def test_v2_events_are_dispatched(echo_app, headers):
+    event = {'version': '2.0', 'rawPath': '/con/echo', 'rawQueryString': '', 'headers': headers,
+             'requestContext': {'http': {'method': 'POST'}}, 'body': '{"a": 1}',
+             'isBase64Encoded': False}
+    expected = awsgi.response(echo_app, v1_event(headers), None)
+
+    actual = dispatch(echo_app, event, None)
+    assert actual['statusCode'] == 200
+    assert actual['body'] == expected['body']
+
+
+def test_missing_token_is_rejected_as_under_awsgi(echo_app):
+    event = v1_event({'Host': 'localhost'})
+    expected = int(awsgi.response(echo_app, event, None)['statusCode'])
+    assert dispatch(echo_app, event, None)['statusCode'] == expected != 200
@@ -0,0 +1,117 @@
+import io
+import pytest
+from PIL import Image
+import helpers.imageVariants as image_variants
+from helpers.imageVariants import (VARIANTS, IMAGE_FORMATS, handle_s3_event, s3_event,
+                                   variant_key)
+
+moto = pytest.importorskip('moto')
+
+
+def image_bytes(size: tuple, mode: str = 'RGB', fmt: str = 'JPEG') -> bytes:
+    out = io.BytesIO()
+    Image.linear_gradient('L').resize(size).convert(mode).save(out, fmt)
+    return out.getvalue()
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    with moto.mock_aws():
+        monkeypatch.setattr(image_variants, '_s3', None)
+        monkeypatch.setattr(image_variants, 'VARIANT_BUCKET', 'conneco-variants')
+        client = image_variants.get_s3()
+        client.create_bucket(Bucket='conneco')
+        client.create_bucket(Bucket='conneco-variants')
+        yield client
+
+
+@pytest.mark.parametrize('name, size, mode, fmt', [
+    ('photo.jpg', (6000, 4000), 'RGB', 'JPEG'),
+    ('logo.png', (1200, 800), 'RGBA', 'PNG'),
+    ('small.jpg', (200, 150), 'RGB', 'JPEG')
+])
+def test_every_variant_is_written_within_its_bounds(s3, name, size, mode, fmt):
+    s3.put_object(Bucket='conneco', Key=name, Body=image_bytes(size, mode, fmt))
+    recorded = []
+    counts = handle_s3_event(s3_event('conneco', name),
+                             record=lambda *args: recorded.append(args) or 0)
+
+    assert counts['processed'] == 1
+    (_, key, _, variants), = recorded
+    for variant_name, edge in VARIANTS:
+        variant = variants[variant_name]
+        assert max(variant['width'], variant['height']) <= min(edge, max(size))
+        for image_format in IMAGE_FORMATS:
+            body = s3.get_object(Bucket='conneco-variants',
+                                 Key=variant_key(key, variant_name, image_format))
+            with Image.open(io.BytesIO(body['Body'].read())) as image:
+                assert image.size == (variant['width'], variant['height'])
+
+
+def test_variant_outputs_and_non_images_are_skipped(s3):
+    s3.put_object(Bucket='conneco', Key='notes.txt', Body=b'not an image')
+    record = pytest.fail
+
+    assert handle_s3_event(s3_event('conneco', 'notes.txt'), record=record)['skipped'] == 1
+    own_output = variant_key('photo.jpg', 'feed', 'webp')
+    assert handle_s3_event(s3_event('conneco-variants', own_output), record=record)['skipped'] == 1
+
+
+def test_variants_never_land_in_the_upload_bucket(s3):
+    # The upload bucket notifies on every created key, so anything written
+    # there would come straight back as another invocation
+    s3.put_object(Bucket='conneco', Key='photo.jpg', Body=image_bytes((1200, 800)))
+    recorded = []
+    handle_s3_event(s3_event('conneco', 'photo.jpg'),
+                    record=lambda *args: recorded.append(args) or 0)
+
+    keys = [o['Key'] for o in s3.list_objects_v2(Bucket='conneco')['Contents']]
+    assert keys == ['photo.jpg']
+    assert s3.list_objects_v2(Bucket='conneco-variants')['KeyCount'] == len(VARIANTS) * len(IMAGE_FORMATS)
+    (*_, variants), = recorded
+    assert variants['feed']['webp'].startswith('https://conneco-variants.s3.amazonaws.com/')
+
+
+def test_large_jpegs_are_decoded_at_draft_scale():
+    with image_variants.open_image(io.BytesIO(image_bytes((6000, 4000)))) as image:
+        assert max(image.size) < 6000
+        assert max(image.size) >= VARIANTS[0][1]
+
+
+def test_upload_event_updates_posts_and_their_cached_feed(s3, http, couple):
+    from index import handler
+    import shared.db.users as shared_users
+    url = 'https://conneco.s3.amazonaws.com/photo.jpg'
+    create = http.post('/con/create', headers=couple['headers'], json={
+        'type': 'photo', 'date': '2025-01-01', 'image_url': url})
+    assert 'image_variants' not in create.get_json()['data']
+    feed = http.get('/con/posts', headers=couple['partner_headers'])
+    assert 'image_variants' not in feed.get_json()['data']['posts'][0]
+
+    s3.put_object(Bucket='conneco', Key='photo.jpg', Body=image_bytes((3000, 2000)))
+    counts = handler(s3_event('conneco', 'photo.jpg'), None)
+    assert (counts['processed'], counts['posts_updated']) == (1, 1)
+
+    stored = shared_users.get_posts_collection().find_one({'image_url': url})
+    assert set(stored['image_variants']) == {name for name, _ in VARIANTS}
+    # The partner's cached first page is dropped, not served for FEED_CACHE_TTL
+    feed = http.get('/con/posts', headers=couple['partner_headers'])
+    assert feed.get_json()['data']['posts'][0]['image_variants'] == stored['image_variants']
+
+
+def test_posts_created_after_processing_get_variants_in_their_insert(s3, http, couple, monkeypatch):
+    import mongomock
+    from index import handler
+    s3.put_object(Bucket='conneco', Key='later.jpg', Body=image_bytes((800, 600)))
+    handler(s3_event('conneco', 'later.jpg'), None)
+
+    # Variants go into the insert itself, with no follow-up write per post
+    monkeypatch.setattr(mongomock.collection.Collection, 'update_one', pytest.fail)
+    response = http.post('/con/bulkposts', headers=couple['headers'], json={'posts': [
+        {'type': 'photo', 'date': '2025-01-02',
+         'image_url': 'https://conneco.s3.us-east-1.amazonaws.com/later.jpg'},
+        {'type': 'note', 'date': '2025-01-02', 'content': 'no image'}
+    ]})
+    results = response.get_json()['data']['results']
+    assert set(results[0]['data']['image_variants']) == {name for name, _ in VARIANTS}
+    assert 'image_variants' not in results[1]['data']
@@ -0,0 +1,56 @@
+import os
+import pytest
+from db.indexes import UnindexedQuery, assert_indexed, check_hot_queries, ensure_indexes, plan_stages
+
+IXSCAN = {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN', 'indexName': 'user_date_id'}}
+COLLSCAN = {'stage': 'COLLSCAN'}
+MEMORY_SORT = {'stage': 'SORT', 'inputStage': {'stage': 'FETCH', 'inputStage': {
+    'stage': 'IXSCAN', 'indexName': 'user_updated_at'}}}
+OR_PLAN = {'stage': 'SUBPLAN', 'inputStage': {'stage': 'FETCH', 'inputStage': {
+    'stage': 'SORT_MERGE', 'inputStages': [{'stage': 'IXSCAN'}, {'stage': 'IXSCAN'}]}}}
+
+
+class ExplainedCollection:
+    """Answers find(...).sort(...).limit(...).explain() with a canned plan."""
+    full_name = 'test.posts'
+
+    def __init__(self, plan: dict) -> None:
+        self.plan = plan
+
+    def find(self, query):
+        return self
+
+    def sort(self, sort):
+        return self
+
+    def limit(self, limit):
+        return self
+
+    def explain(self):
+        return {'queryPlanner': {'winningPlan': self.plan}}
+
+
+def test_plan_stages_walks_nested_and_branched_plans():
+    assert plan_stages(OR_PLAN) == ['SUBPLAN', 'FETCH', 'SORT_MERGE', 'IXSCAN', 'IXSCAN']
+    # 5.0+ slot-based plans nest the classic tree under queryPlan
+    assert plan_stages({'queryPlan': IXSCAN}) == ['FETCH', 'IXSCAN']
+
+
+@pytest.mark.parametrize('plan', [IXSCAN, OR_PLAN])
+def test_index_backed_plans_pass(plan):
+    assert 'IXSCAN' in assert_indexed(ExplainedCollection(plan), {}, [('date', -1)])
+
+
+@pytest.mark.parametrize('plan, stage', [(COLLSCAN, 'COLLSCAN'), (MEMORY_SORT, 'SORT')])
+def test_scans_and_in_memory_sorts_raise(plan, stage):
+    with pytest.raises(UnindexedQuery, match=stage):
+        assert_indexed(ExplainedCollection(plan), {}, [('date', -1)])
+
+
+@pytest.mark.skipif(not os.getenv('MONGODB_URI'), reason='needs a local mongod')
+def test_hot_queries_are_index_backed_against_mongod(monkeypatch):
+    import db.client as client
+    monkeypatch.setattr(client, '_client', None)
+    monkeypatch.setattr(client, '_collections', {})
+    ensure_indexes()
+    assert check_hot_queries() == {}
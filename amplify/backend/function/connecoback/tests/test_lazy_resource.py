@@ -0,0 +1,19 @@
+import pytest
+import helpers.metrics as metrics
+import helpers.lazyResource as lazy
+
+
+def test_first_import_is_recorded_as_a_metric_not_printed(monkeypatch, capsys):
+    monkeypatch.setattr(lazy, 'IMPORT_TIMES', {})
+    monkeypatch.setattr(lazy, '_resources', {})
+
+    request = metrics.begin()
+    try:
+        lazy.load_resource('helpers.fields:parse_fields')
+        lazy.load_resource('helpers.fields:projection')
+    finally:
+        metrics.end()
+
+    assert list(lazy.IMPORT_TIMES) == ['helpers.fields']
+    assert request.values['ImportTime'] == pytest.approx(lazy.IMPORT_TIMES['helpers.fields'], abs=0.01)
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,200 @@
+import json
+import time
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from helpers.stubClient import SAMPLE_RECIPE
+import helpers.recipesGenerator as recipes_generator
+
+TOKEN_CHARS = 80
+TOKEN_INTERVAL = 0.02
+
+
+def preferences(goal: str) -> dict:
+    # A distinct goal per test keeps the recipe cache from answering
+    return {'cookingTime': '30 minutes', 'dietaryRestrictions': [], 'duration': 1,
+            'goal': goal, 'groceries': [], 'mealTypes': ['dinner'], 'servings': 2,
+            'skillLevel': 'beginner'}
+
+
+class FakeCompletions(BaseHTTPRequestHandler):
+    """Chat-completions endpoint that streams its content on a timer."""
+    content = ''
+    finished_at = None
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if not body.get('stream'):
+            self.reply('application/json', json.dumps({
+                'id': 'c', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': self.content}}]
+            }).encode())
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for start in range(0, len(self.content), TOKEN_CHARS):
+            chunk = {'id': 'c', 'object': 'chat.completion.chunk', 'created': 0,
+                     'model': body['model'], 'choices': [{
+                         'index': 0, 'finish_reason': None,
+                         'delta': {'content': self.content[start:start + TOKEN_CHARS]}}]}
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+            self.wfile.flush()
+            time.sleep(TOKEN_INTERVAL)
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+        type(self).finished_at = time.monotonic()
+
+    def reply(self, content_type: str, data: bytes):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    openai = pytest.importorskip('openai')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = openai.OpenAI(base_url=f'http://127.0.0.1:{server.server_port}/v1',
+                           api_key='test', max_retries=0)
+
+    class LiveClient:
+        def __init__(self):
+            self.client = client
+    monkeypatch.setattr(recipes_generator, 'OSS_CLIENT', 'live')
+    monkeypatch.setattr(recipes_generator, 'OSS_Client', LiveClient)
+    FakeCompletions.content = json.dumps(
+        [{**SAMPLE_RECIPE, 'title': f'Recipe {i}'} for i in range(3)], indent=2)
+    FakeCompletions.finished_at = None
+    yield FakeCompletions
+    server.shutdown()
+
+
+def test_stream_flushes_each_recipe_as_it_closes(http, completions):
+    response = http.post('/con/nmeals?stream=1', json={'preferences': preferences('stream')},
+                         buffered=False)
+    assert response.mimetype == 'application/x-ndjson'
+
+    arrivals, titles = [], []
+    for line in response.response:
+        for part in line.decode().splitlines():
+            arrivals.append(time.monotonic())
+            titles.append(json.loads(part)['data']['title'])
+    response.close()
+
+    assert titles == ['Recipe 0', 'Recipe 1', 'Recipe 2']
+    # The first recipe went out while the model was still producing the rest
+    per_recipe = len(completions.content) / 3 / TOKEN_CHARS * TOKEN_INTERVAL
+    assert completions.finished_at - arrivals[0] > per_recipe
+    assert arrivals[1] - arrivals[0] > per_recipe / 2
+
+
+def test_buffered_response_returns_parsed_recipes(http, completions):
+    response = http.post('/con/nmeals', json={'preferences': preferences('buffered')})
+    assert response.status_code == 200
+    assert [r['title'] for r in response.get_json()['data']] == ['Recipe 0', 'Recipe 1', 'Recipe 2']
+
+
+def test_unparseable_completion_is_not_cached(http, completions, monkeypatch):
+    calls = []
+    complete = recipes_generator.Generator.complete
+
+    def counted(self):
+        calls.append(self.prefs.goal)
+        return complete(self)
+    monkeypatch.setattr(recipes_generator.Generator, 'complete', counted)
+    good = completions.content
+    completions.content = '[{"title": "cut off'
+
+    body = {'preferences': preferences('unparseable')}
+    assert http.post('/con/nmeals', json=body).status_code == 502
+    completions.content = good
+    response = http.post('/con/nmeals', json=body)
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 3
+    assert len(calls) == 2
+
+
+def test_unparseable_stream_is_not_cached():
+    import helpers.recipeCache as recipe_cache
+    from models.meal import Preferences
+    prefs = Preferences(**preferences('unparseable stream'))
+    recipe_cache.put(prefs, 'v', '[{"title": "cut off')
+    assert recipe_cache.peek(prefs, 'v') is None
+    recipe_cache.put(prefs, 'v', json.dumps([SAMPLE_RECIPE]))
+    assert recipe_cache.peek(prefs, 'v') is not None
+
+
+def test_plan_over_the_slice_cap_is_rejected(http, monkeypatch):
+    import helpers.mealPlanner as meal_planner
+
+    def never(*args):
+        pytest.fail('no model call may start for a rejected plan')
+    monkeypatch.setattr(meal_planner.MealPlanner, 'generate_slice', never)
+    prefs = {**preferences('cap'), 'duration': 30, 'mealTypes': ['breakfast', 'lunch', 'dinner']}
+    response = http.post('/con/nmeals?plan=1', json={'preferences': prefs})
+    assert response.status_code == 400
+
+
+def test_plan_within_the_cap_is_generated(http):
+    prefs = {**preferences('plan'), 'duration': 2, 'mealTypes': ['lunch', 'dinner']}
+    response = http.post('/con/nmeals?plan=1', json={'preferences': prefs})
+    assert response.status_code == 200
+    assert len(response.get_json()['data']['days']) == 2
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_plan_slice_retry_reaches_the_model(monkeypatch, cached):
+    import helpers.recipeCache as recipe_cache
+    from helpers.mealPlanner import MealPlanner
+    from models.meal import Preferences
+    answers = ['[{"title": "cut off', json.dumps([SAMPLE_RECIPE])]
+    monkeypatch.setattr(recipes_generator.Generator, 'complete', lambda self: answers.pop(0))
+    prefs = Preferences(**{**preferences(f'retry {cached}'), 'duration': 1})
+    planner = MealPlanner(prefs, retries=1)
+    if cached:
+        # An unparseable entry written before completions were validated
+        generator = recipes_generator.Generator(
+            Preferences(**{**prefs.__dict__, 'mealTypes': ['dinner']}),
+            focus='Only dinner recipes for day 1 of a 1 day plan.')
+        recipe_cache._save(recipe_cache.cache_key(generator.prefs, generator.version()),
+                           answers.pop(0))
+
+    result = planner.run_slice((1, 'dinner'))
+    assert 'error' not in result
+    assert [r['title'] for r in result['recipes']] == [SAMPLE_RECIPE['title']]
+    assert answers == []
+
+
+def test_cache_version_depends_on_the_client_kind(monkeypatch):
+    from models.meal import Preferences
+    generator = recipes_generator.Generator(Preferences(**preferences('version')))
+    stub_version = generator.version()
+    monkeypatch.setattr(recipes_generator, 'OSS_CLIENT', 'live')
+    assert generator.version() != stub_version
+
+
+def test_stream_metrics_are_emitted_after_the_body(http, monkeypatch, capsys):
+    import helpers.metrics as metrics
+    monkeypatch.setattr(metrics, 'METRICS_ENABLED', True)
+    response = http.post('/con/nmeals?stream=1', json={'preferences': preferences('metrics')},
+                         buffered=False)
+    # Nothing is emitted while the body is still to be generated
+    assert capsys.readouterr().out == ''
+    lines = b''.join(response.response).decode().splitlines()
+    response.close()
+
+    record = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert record['Route'] == '/con/nmeals'
+    assert record['LLMCalls'] == 1 and record['LLMBytes'] > 0
+    assert record['StreamErrors'] == 0
+    assert len(lines) > 0
+    assert metrics.current() is None
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import subprocess
+from types import SimpleNamespace
+from flask import Flask, make_response
+import helpers.metrics as metrics
+
+EVENT = {
+    'httpMethod': 'GET',
+    'path': '/con/posts',
+    'queryStringParameters': {'size': '20'},
+    'headers': {'Authorization': 'Bearer secret', 'Host': 'localhost'},
+    'requestContext': {'requestId': 'fake-request'}
+}
+
+
+def test_record_covers_route_cold_start_llm_and_size(monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_ENABLED', True)
+    monkeypatch.setattr(metrics, '_cold_start', True)
+    app = Flask(__name__)
+
+    @app.route('/con/posts')
+    def posts():
+        with metrics.llm_call() as sizes:
+            sizes.append(42)
+        return make_response(b'{"success": true}', 200)
+
+    @app.after_request
+    def after(response):
+        metrics.record_response(response)
+        return response
+
+    for expected_cold in [1, 0]:
+        request = metrics.begin(invoked=True)
+        with app.test_client() as client:
+            client.get(EVENT['path'], query_string=EVENT['queryStringParameters'])
+        record = metrics.emit(request)
+        metrics.end()
+        assert record['Route'] == '/con/posts'
+        assert record['StatusCode'] == 200
+        assert record['ColdStart'] == expected_cold
+        assert record['LLMCalls'] == 1 and record['LLMBytes'] == 42
+        assert record['ResponseBytes'] == len(b'{"success": true}')
+
+
+def test_emit_writes_one_emf_line(monkeypatch, capsys):
+    monkeypatch.setattr(metrics, 'METRICS_ENABLED', True)
+    request = metrics.begin()
+    metrics.count('RecipesRejected', 2)
+    metrics.emit(request)
+    metrics.end()
+
+    line, = capsys.readouterr().out.splitlines()
+    record = json.loads(line)
+    assert record['RecipesRejected'] == 2
+    names = {m['Name'] for m in record['_aws']['CloudWatchMetrics'][0]['Metrics']}
+    assert names == {name for name, _ in metrics.METRICS}
+
+
+def test_event_summary_redacts_credentials():
+    summary = metrics.summarize_event(EVENT)
+    assert summary['headers']['Authorization'] == '[redacted]'
+    assert summary['headers']['Host'] == 'localhost'
+    assert summary['query'] == ['size']
+
+
+def test_mongo_commands_are_attributed_to_the_current_request():
+    from db.client import CommandMetrics
+    listener = CommandMetrics()
+    event = SimpleNamespace(duration_micros=1500)
+    listener.succeeded(event)  # no request in progress: ignored
+
+    request = metrics.begin()
+    listener.succeeded(event)
+    listener.failed(event)
+    metrics.end()
+    assert request.values['MongoCommands'] == 2
+    assert request.values['MongoTime'] == 3
+
+
+def test_metrics_and_encoder_do_not_import_pymongo():
+    # Both load on every cold start; pymongo and bson come with db.client
+    code = ('import sys, helpers.metrics, helpers.encoder\n'
+            'print(",".join(m for m in ("pymongo", "bson") if m in sys.modules))')
+    src = os.path.dirname(metrics.__file__).rsplit(os.sep, 1)[0]
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True, cwd=src)
+    assert output.stdout.strip() == ''
@@ -0,0 +1,49 @@
+import threading
+from pymongo import ASCENDING
+from nutri.db.users import get_user_collection
+
+PARALLEL = 16
+
+
+def test_parallel_upserts_of_one_phone_create_one_user(app):
+    # The unique index from db.indexes, without the partial filter mongomock ignores
+    get_user_collection().create_index([('phone', ASCENDING)], unique=True)
+    barrier = threading.Barrier(PARALLEL)
+    results = []
+
+    def upsert(n: int):
+        client = app.test_client()
+        barrier.wait(timeout=5)
+        response = client.post('/con/nuser', json={
+            'phone': '9876543210', 'password': 'secret-pw', 'name': f'user {n}'})
+        results.append(response.get_json())
+    threads = [threading.Thread(target=upsert, args=(n,)) for n in range(PARALLEL)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == PARALLEL
+    assert all(result['data'] and result['data']['tokens'] for result in results), results
+    assert len({result['data']['_id'] for result in results}) == 1
+    assert get_user_collection().count_documents({'phone': '9876543210'}) == 1
+    messages = sorted(result['msg'] for result in results)
+    assert messages.count('Successfully created user') == 1
+
+
+def test_update_keeps_created_date_and_password(http):
+    created = http.post('/con/nuser', json={'phone': '9876543210', 'password': 'secret-pw',
+                                         'name': 'A'}).get_json()
+    updated = http.post('/con/nuser', json={'phone': '9876543210', 'name': 'Alex'}).get_json()
+
+    assert updated['msg'] == 'Successfully updated user'
+    assert updated['data']['_id'] == created['data']['_id']
+    assert updated['data']['createdDate'] == created['data']['createdDate']
+    assert updated['data']['password'] == created['data']['password']
+    assert updated['data']['name'] == 'Alex'
+
+
+def test_update_without_password_never_creates(http):
+    response = http.post('/con/nuser', json={'phone': '9876543210', 'name': 'Alex'}).get_json()
+    assert response['msg'] == 'Password is required'
+    assert get_user_collection().count_documents({}) == 0
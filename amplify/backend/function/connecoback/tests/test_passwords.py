@@ -0,0 +1,21 @@
+from helpers.passwords import build_context, calibrate, hash_password, verify_password
+
+
+def test_current_hashes_verify_without_rehash():
+    stored = hash_password('secret')
+    assert verify_password('secret', stored) == (True, None)
+    assert verify_password('wrong', stored) == (False, None)
+
+
+def test_hashes_from_another_policy_are_replaced():
+    stored = build_context('pbkdf2_sha512', 1000).hash('secret')
+    ok, replacement = verify_password('secret', stored)
+
+    assert ok and replacement
+    assert verify_password('secret', replacement) == (True, None)
+
+
+def test_calibrate_stays_within_the_scheme_limits():
+    handler = build_context('pbkdf2_sha256').handler('pbkdf2_sha256')
+    rounds = calibrate('pbkdf2_sha256', 1, probe_rounds=1000)
+    assert handler.min_rounds <= rounds <= handler.max_rounds
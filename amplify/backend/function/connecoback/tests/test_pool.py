@@ -0,0 +1,132 @@
+import threading
+import pytest
+from db.pool import ObjectPool, PoolTimeout
+
+
+def test_school_requests_reuse_one_pooled_instance(http, schools):
+    schools.rows = {1: {'id': 1, 'name': 'Oak High', 'city': 'Pune'}}
+    for _ in range(50):
+        response = http.get('/con/schools', query_string={'city': 'Pune'})
+        assert response.status_code == 200
+
+    assert schools.opened == 1
+
+
+def test_slow_factory_does_not_block_other_borrowers():
+    entered, proceed = threading.Event(), threading.Event()
+    made = iter(range(100))
+
+    def factory():
+        n = next(made)
+        if n == 1:
+            entered.set()
+            proceed.wait(timeout=5)
+        return n
+
+    pool = ObjectPool(factory, max_size=2, wait_timeout=1)
+    first = pool.acquire()
+    pool.release(first)
+    first = pool.acquire()
+
+    creating = threading.Thread(target=pool.acquire)
+    creating.start()
+    assert entered.wait(timeout=5)
+    # The second slot is mid-connect: releasing and re-borrowing must not wait on it
+    reborrowed = []
+    other = threading.Thread(target=lambda: (pool.release(first), reborrowed.append(pool.acquire())))
+    other.start()
+    other.join(timeout=1)
+    finished = not other.is_alive()
+    proceed.set()
+    other.join()
+    assert finished and reborrowed == [first]
+    creating.join()
+    assert pool.stats()['created'] == 2 and pool.stats()['in_use'] == 2
+
+
+def test_unhealthy_idle_entries_are_replaced():
+    made = iter(range(100))
+    pool = ObjectPool(lambda: next(made), health_check=lambda item: item != 0)
+    pool.release(pool.acquire())
+
+    assert pool.acquire() == 1
+    stats = pool.stats()
+    assert stats['health_failures'] == 1 and stats['in_use'] == 1
+
+
+def test_failed_factory_frees_its_slot():
+    def factory():
+        raise ConnectionError('refused')
+    pool = ObjectPool(factory, max_size=1, wait_timeout=0.1)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            pool.acquire()
+    assert pool.stats()['in_use'] == 0
+
+
+def test_connection_errors_discard_the_entry():
+    closed = []
+    made = iter(range(100))
+    pool = ObjectPool(lambda: next(made), max_size=1, wait_timeout=0.1,
+                      close=closed.append, discard_on=(ConnectionError,))
+    with pytest.raises(ConnectionError):
+        with pool.borrow():
+            raise ConnectionError('reset')
+
+    assert closed == [0]
+    with pool.borrow() as item:
+        assert item == 1
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+
+
+def test_recently_released_entries_skip_the_health_check():
+    checked = []
+    pool = ObjectPool(lambda: 0, health_check=lambda item: checked.append(item) or True,
+                      check_after=60)
+    pool.release(pool.acquire())
+    pool.release(pool.acquire())
+    assert checked == []
+
+    pool.check_after = 0
+    pool.acquire()
+    assert checked == [0]
+
+
+def test_dropped_school_connection_is_pinged_out_and_closed(monkeypatch, schools):
+    import pymysql
+    from db.schools import school_pool
+
+    class Instance:
+        def __init__(self):
+            # Never connected, so it answers a ping like a dropped connection
+            self.connection = pymysql.connections.Connection(defer_connect=True)
+    monkeypatch.setattr(school_pool, 'factory', Instance)
+    monkeypatch.setattr(school_pool, 'check_after', 0)
+    closed = []
+    monkeypatch.setattr(school_pool, 'close', closed.append)
+    stale = school_pool.acquire()
+    school_pool.release(stale)
+    failures = school_pool.stats()['health_failures']
+
+    fresh = school_pool.acquire()
+    school_pool.release(fresh)
+    assert fresh is not stale and closed == [stale]
+    assert school_pool.stats()['health_failures'] == failures + 1
+
+
+def test_school_close_releases_the_connection():
+    import pymysql
+    from db.schools import close
+
+    class Connection(pymysql.connections.Connection):
+        open = True
+
+        def close(self):
+            calls.append('closed')
+
+    class Instance:
+        connection = Connection(defer_connect=True)
+    calls = []
+    close(Instance())
+    assert calls == ['closed']
@@ -0,0 +1,87 @@
+import pytest
+
+
+def test_bulk_create_is_reachable_on_a_single_segment_path(http, couple):
+    response = http.post('/con/bulkposts', headers=couple['headers'], json={'posts': [
+        {'type': 'note', 'date': '2025-01-01', 'content': 'a'},
+        {'date': '2025-01-01', 'content': 'missing type'}
+    ]})
+    assert response.status_code == 207
+    data = response.get_json()['data']
+    assert (data['created'], data['failed']) == (1, 1)
+
+
+@pytest.fixture
+def feed(http, couple, monkeypatch):
+    """25 posts, and a counter of feed_version aggregates."""
+    import services.src.posts as posts
+    http.post('/con/bulkposts', headers=couple['headers'], json={'posts': [
+        {'type': 'note', 'date': f'2025-01-{day:02d}', 'content': str(day)}
+        for day in range(1, 26)]})
+    versions = []
+    real = posts.PostUserPostsService.feed_version
+
+    def counted(self, *args):
+        versions.append(args)
+        return real(self, *args)
+    monkeypatch.setattr(posts.PostUserPostsService, 'feed_version', counted)
+    return versions
+
+
+def test_first_page_validator_is_computed_once_and_cached(http, couple, feed):
+    first = http.get('/con/posts', headers=couple['headers'])
+    again = http.get('/con/posts', headers=couple['headers'])
+    assert len(feed) == 1
+    assert first.headers['ETag'] == again.headers['ETag']
+
+    response = http.get('/con/posts', headers={
+        **couple['headers'], 'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 304
+
+
+def test_cursor_pages_skip_the_feed_aggregate(http, couple, feed):
+    cursor = http.get('/con/posts', headers=couple['headers']).get_json()['data']['next_cursor']
+    feed.clear()
+
+    response = http.get('/con/posts', headers=couple['headers'], query_string={'cursor': cursor})
+    assert response.status_code == 200
+    assert len(response.get_json()['data']['posts']) == 5
+
+    response = http.get('/con/posts', query_string={'cursor': cursor}, headers={
+        **couple['headers'], 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert feed == []
+
+
+
+def tamper(cursor: str, change: dict) -> str:
+    import base64
+    from bson import json_util
+    payload = json_util.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    return base64.urlsafe_b64encode(json_util.dumps({**payload, **change}).encode()).decode()
+
+
+@pytest.mark.parametrize('change', [
+    {'o': 2},
+    {'o': True},
+    {'f': 'content'},
+    {'f': '$where'},
+    {'v': {'$ne': None}},
+    {'v': ['2025-01-01']},
+    {'id': {'$gt': ''}},
+    {'id': 'not-an-id'},
+    {'extra': 1}
+])
+def test_tampered_cursors_are_rejected(http, couple, feed, change):
+    cursor = http.get('/con/posts', headers=couple['headers']).get_json()['data']['next_cursor']
+    assert http.get('/con/posts', headers=couple['headers'],
+                    query_string={'cursor': cursor}).status_code == 200
+
+    response = http.get('/con/posts', headers=couple['headers'],
+                        query_string={'cursor': tamper(cursor, change)})
+    assert response.status_code == 400
+
+
+def test_unknown_sort_field_is_rejected(http, couple):
+    response = http.get('/con/posts', headers=couple['headers'], query_string={'sort': 'content'})
+    assert response.status_code == 400
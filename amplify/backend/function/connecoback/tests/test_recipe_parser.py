@@ -0,0 +1,46 @@
+import json
+from helpers.jsonStream import JSONItemStream
+from helpers.recipeParser import parse_recipes
+from helpers.stubClient import SAMPLE_RECIPE
+
+
+def recipe(title: str) -> str:
+    return json.dumps({**SAMPLE_RECIPE, 'title': title})
+
+
+def test_malformed_item_is_rejected_and_the_rest_salvaged():
+    text = f'[{recipe("a")}, {{"title": "b" "x": 1}}, {recipe("c")}]'
+    recipes, rejected = parse_recipes(text)
+    assert [r.title for r in recipes] == ['a', 'c']
+    assert rejected == 1
+
+
+def test_truncated_output_keeps_the_closed_recipes():
+    text = f'[{recipe("a")}, {recipe("b")}, {recipe("c")[:40]}'
+    recipes, rejected = parse_recipes(text)
+    assert [r.title for r in recipes] == ['a', 'b']
+    assert rejected == 0
+
+
+def test_repairs_fences_and_trailing_commas():
+    text = f'Here you go:\n```json\n[{recipe("a")},]\n```'
+    recipes, rejected = parse_recipes(text)
+    assert [r.title for r in recipes] == ['a']
+
+
+def test_stream_yields_none_for_a_malformed_item_and_continues():
+    parser = JSONItemStream()
+    text = f'[{recipe("a")}, {{"title": "b" "x": 1}}, {recipe("c")}]'
+    items = [item for start in range(0, len(text), 7) for item in parser.feed(text[start:start + 7])]
+    assert [item and item['title'] for item in items] == ['a', None, 'c']
+
+
+def test_malformed_item_does_not_abort_the_stream(http, monkeypatch):
+    from helpers.recipesGenerator import Generator
+    text = f'[{recipe("a")}, {{"title": "b" "x": 1}}, {recipe("c")}]'
+    monkeypatch.setattr(Generator, 'stream_recipes', lambda self: iter([text[:200], text[200:]]))
+    prefs = {'cookingTime': '30 minutes', 'dietaryRestrictions': [], 'duration': 1, 'goal': 'g',
+             'groceries': [], 'mealTypes': ['dinner'], 'servings': 2, 'skillLevel': 'beginner'}
+    response = http.post('/con/nmeals?stream=1', json={'preferences': prefs})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['data']['title'] for line in lines] == ['a', 'c']
@@ -0,0 +1,61 @@
+def test_import_is_reachable_on_a_single_segment_path(http, schools):
+    body = 'name,city\nOak High,Pune\nRiver School,Delhi\n'
+    response = http.post('/con/schoolimport', data=body, content_type='text/csv')
+    assert response.status_code == 200
+    assert response.get_json()['data']['created'] == 2
+    assert sorted(s['name'] for s in schools.rows.values()) == ['Oak High', 'River School']
+
+
+def test_search_without_limit_returns_every_match(http, schools):
+    schools.rows = {i: {'id': i, 'name': f'River School {i}'} for i in range(1, 26)}
+    response = http.get('/con/schools', query_string={'search_name': 'river'})
+    assert len(response.get_json()['data']) == 25
+
+    response = http.get('/con/schools', query_string={'search_name': 'river', 'limit': 5})
+    assert len(response.get_json()['data']) == 5
+
+
+def test_search_during_rebuilds_never_mixes_snapshots():
+    import sys
+    import threading
+    from helpers.schoolIndex import SchoolIndex
+
+    # Alternating loads with different sizes and names: a search that paired
+    # one load's keys with the other's rows would fail one of the checks below
+    loads = [[{'id': i, 'name': f'Oak {i}'} for i in range(500)],
+             [{'id': i, 'name': f'Pine {i}'} for i in range(50)]]
+    calls = iter(range(10 ** 9))
+    index = SchoolIndex(lambda: loads[next(calls) % 2], ttl=3600)
+    index.ensure_loaded()
+    stop, errors = threading.Event(), []
+
+    def rebuild():
+        while not stop.is_set():
+            index.invalidate()
+            index.ensure_loaded()
+
+    def search():
+        try:
+            for _ in range(1000):
+                for prefix in ('oak', 'pine'):
+                    for school in index.search(prefix):
+                        assert school['name'].lower().startswith(prefix), (prefix, school)
+        except Exception as e:
+            errors.append(e)
+
+    # Switch threads as often as possible to land inside a rebuild
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        writer = threading.Thread(target=rebuild)
+        writer.start()
+        readers = [threading.Thread(target=search) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        stop.set()
+        writer.join()
+    finally:
+        sys.setswitchinterval(previous)
+    assert errors == []